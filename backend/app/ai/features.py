@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+from app.engine.indicator_context import IndicatorContext
+from app.engine.zones import ZoneEngine
+
 class FeatureEngineer:
     @staticmethod
     def calculate_features(df: pd.DataFrame):
@@ -16,41 +19,23 @@ class FeatureEngineer:
         vol_ratio = round(curr_vol / avg_vol, 2) if avg_vol > 0 else 1.0
 
         # 2. ATR Expansion (Current Range / 14-period ATR)
-        df['tr'] = np.maximum(
-            df['high'] - df['low'],
-            np.maximum(
-                abs(df['high'] - df['close'].shift(1)),
-                abs(df['low'] - df['close'].shift(1))
-            )
-        )
-        atr = df['tr'].rolling(window=14).mean().iloc[-1]
+        ctx = IndicatorContext.of(df)
+        tr_smooth = ZoneEngine.calculate_atr(df, 14)
+        atr = tr_smooth.iloc[-1]
         curr_range = df['high'].iloc[-1] - df['low'].iloc[-1]
         atr_expansion = round(curr_range / atr, 2) if atr > 0 else 1.0
         
         # 3. EMA Slope (Price relative to EMA-50)
-        ema_50 = df['close'].ewm(span=50, adjust=False).mean().iloc[-1]
+        ema_50 = ctx.ema(50).iloc[-1]
         close = df['close'].iloc[-1]
         dist_from_ema = round((close - ema_50) / ema_50 * 100, 2)
 
         # 4. RSI (Relative Strength Index) - 14 period
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        rsi = ctx.get(("rsi_sma", 14), lambda: FeatureEngineer._simple_rsi(df, 14))
         curr_rsi = round(rsi.iloc[-1], 2) if not np.isnan(rsi.iloc[-1]) else 50.0
 
         # 5. ADX (Average Directional Index) - 14 period
-        # Simplified ADX implementation
-        plus_dm = (df['high'] - df['high'].shift(1)).where(lambda x: (x > 0) & (x > (df['low'].shift(1) - df['low'])), 0)
-        minus_dm = (df['low'].shift(1) - df['low']).where(lambda x: (x > 0) & (x > (df['high'] - df['high'].shift(1))), 0)
-        
-        tr_smooth = df['tr'].rolling(window=14).mean()
-        plus_di = 100 * (plus_dm.rolling(window=14).mean() / tr_smooth)
-        minus_di = 100 * (minus_dm.rolling(window=14).mean() / tr_smooth)
-        
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=14).mean()
+        adx = ctx.get(("feature_adx", 14), lambda: FeatureEngineer._simple_adx(df, tr_smooth, 14))
         curr_adx = round(adx.iloc[-1], 2) if not np.isnan(adx.iloc[-1]) else 20.0
 
         return {
@@ -61,3 +46,24 @@ class FeatureEngineer:
             "adx": curr_adx,
             "close": close
         }
+
+    @staticmethod
+    def _simple_rsi(df: pd.DataFrame, period: int) -> pd.Series:
+        # RSI on plain rolling means of gains and losses (not Wilder-smoothed)
+        delta = df['close'].diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+    @staticmethod
+    def _simple_adx(df: pd.DataFrame, tr_smooth: pd.Series, period: int) -> pd.Series:
+        # Simplified ADX implementation
+        plus_dm = (df['high'] - df['high'].shift(1)).where(lambda x: (x > 0) & (x > (df['low'].shift(1) - df['low'])), 0)
+        minus_dm = (df['low'].shift(1) - df['low']).where(lambda x: (x > 0) & (x > (df['high'] - df['high'].shift(1))), 0)
+        
+        plus_di = 100 * (plus_dm.rolling(window=period).mean() / tr_smooth)
+        minus_di = 100 * (minus_dm.rolling(window=period).mean() / tr_smooth)
+        
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        return dx.rolling(window=period).mean()
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
+from app.engine.batch import BatchIndicatorEngine
+
 class ATREngine:
     @staticmethod
     def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -12,20 +14,8 @@ class ATREngine:
         if df is None or df.empty or len(df) < period:
             return pd.Series(dtype=float)
             
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        # Calculate True Range (TR)
-        tr1 = high - low
-        tr2 = (high - close.shift(1)).abs()
-        tr3 = (low - close.shift(1)).abs()
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # Calculate ATR using Wilder's EMA smoothing method
-        atr = tr.ewm(alpha=1.0/period, adjust=False).mean()
-        return atr.round(2)
+        prices, _, _ = BatchIndicatorEngine.stack([df])
+        return pd.Series(BatchIndicatorEngine.atr(prices, period)[0], index=df.index)
 
     @staticmethod
     def evaluate_volatility(df: pd.DataFrame, atr_series: pd.Series) -> Dict[str, Any]:
@@ -0,0 +1,443 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class BatchIndicatorEngine:
+    """
+    Indicators for many symbols in one vectorized pass.
+
+    Prices are a ``(symbols, bars, fields)`` float tensor with the fields in ``FIELDS`` order.
+    Rows are bottom-aligned: every symbol's last bar sits in the final column and shorter
+    histories are padded with leading NaNs; ``lengths`` gives each row's real bar count.
+    Outputs stay NaN over the padding. The single-DataFrame engines (RSI, ATR, VWAP, volume,
+    smart money, CPR) are thin wrappers over these methods with a one-row tensor.
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+    OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+    @staticmethod
+    def session_keys(index) -> Optional[np.ndarray]:
+        """Per-bar trading-day keys (local midnight, as int64) for a DatetimeIndex, else None."""
+        if not isinstance(index, pd.DatetimeIndex):
+            return None
+        return index.normalize().asi8
+
+    @staticmethod
+    def stack(frames: Sequence[pd.DataFrame], with_sessions: bool = False
+              ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Builds the price tensor from OHLCV frames. Returns ``(prices, lengths, sessions)``;
+        ``sessions`` holds ``session_keys`` per bar (one session per bar for frames without a
+        DatetimeIndex) when ``with_sessions`` is set, else None.
+        """
+        T = max((len(df) for df in frames), default=0)
+        prices = np.full((len(frames), T, len(BatchIndicatorEngine.FIELDS)), np.nan)
+        lengths = np.zeros(len(frames), dtype=np.int64)
+        sessions = np.zeros((len(frames), T), dtype=np.int64) if with_sessions else None
+        for i, df in enumerate(frames):
+            n = len(df)
+            lengths[i] = n
+            if not n:
+                continue
+            for j, field in enumerate(BatchIndicatorEngine.FIELDS):
+                prices[i, T - n:, j] = df[field].to_numpy(dtype=float)
+            if with_sessions:
+                keys = BatchIndicatorEngine.session_keys(df.index)
+                sessions[i, T - n:] = keys if keys is not None else np.arange(n)
+        return prices, lengths, sessions
+
+    @staticmethod
+    def _lengths(prices: np.ndarray, lengths) -> np.ndarray:
+        if lengths is None:
+            return np.full(prices.shape[0], prices.shape[1], dtype=np.int64)
+        return np.asarray(lengths, dtype=np.int64)
+
+    @staticmethod
+    def _valid(prices: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        T = prices.shape[1]
+        return np.arange(T)[None, :] >= (T - lengths)[:, None]
+
+    @staticmethod
+    def _fill_gaps(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """Row-wise ``ffill().bfill()`` over each row's valid region."""
+        T = values.shape[1]
+        cols = np.arange(T)
+        has = ~np.isnan(values)
+        last = np.maximum.accumulate(np.where(has, cols, -1), axis=1)
+        rows = np.arange(values.shape[0])[:, None]
+        out = np.where(last >= 0, values[rows, np.maximum(last, 0)], np.nan)
+        nxt = np.minimum.accumulate(np.where(has, cols, T)[:, ::-1], axis=1)[:, ::-1]
+        out = np.where(np.isnan(out) & (nxt < T), values[rows, np.minimum(nxt, T - 1)], out)
+        return np.where(valid, out, np.nan)
+
+    @staticmethod
+    def ema(values: np.ndarray, alpha: float) -> np.ndarray:
+        """Row-wise ``ewm(alpha=alpha, adjust=False).mean()``, following pandas' recursion step for step."""
+        values = np.asarray(values, dtype=float)
+        out = np.empty_like(values)
+        if not values.shape[1]:
+            return out
+        weighted = values[:, 0].copy()
+        old_wt = np.ones(values.shape[0])
+        out[:, 0] = weighted
+        for t in range(1, values.shape[1]):
+            cur = values[:, t]
+            observed = cur == cur
+            started = weighted == weighted
+            old_wt = np.where(started, old_wt * (1.0 - alpha), old_wt)
+            blend = started & observed & (weighted != cur)
+            with np.errstate(invalid='ignore'):
+                mixed = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            weighted = np.where(blend, mixed, weighted)
+            old_wt = np.where(started & observed, 1.0, old_wt)
+            weighted = np.where(~started & observed, cur, weighted)
+            out[:, t] = weighted
+        return out
+
+    @staticmethod
+    def _window_sums(values: np.ndarray, windows: np.ndarray) -> np.ndarray:
+        """Trailing sums over a per-row window; NaN until the window fills or while it holds a NaN."""
+        S, T = values.shape
+        missing = np.isnan(values)
+        sums = np.concatenate((np.zeros((S, 1)), np.cumsum(np.where(missing, 0.0, values), axis=1)), axis=1)
+        gaps = np.concatenate((np.zeros((S, 1), dtype=np.int64), np.cumsum(missing, axis=1)), axis=1)
+        ends = np.arange(1, T + 1)[None, :]
+        starts = ends - windows[:, None]
+        ok = starts >= 0
+        starts = np.maximum(starts, 0)
+        rows = np.arange(S)[:, None]
+        total = sums[rows, ends] - sums[rows, starts]
+        full = ok & (gaps[rows, ends] == gaps[rows, starts])
+        return np.where(full, total, np.nan)
+
+    @staticmethod
+    def rsi(prices: np.ndarray, period: int = 14, lengths=None) -> np.ndarray:
+        """
+        Wilder RSI per bar, as ``RSIEngine.calculate_rsi``: the first average is the mean of the
+        first ``period`` moves (the first bar counts as none), undefined values read 50, rounded
+        to 2 places. Rows shorter than ``period`` are all NaN.
+        """
+        lengths = BatchIndicatorEngine._lengths(prices, lengths)
+        close = prices[:, :, BatchIndicatorEngine.CLOSE]
+        S, T = close.shape
+        valid = BatchIndicatorEngine._valid(prices, lengths)
+        delta = np.diff(close, axis=1, prepend=np.nan)
+        with np.errstate(invalid='ignore'):
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+
+        ready = lengths >= period
+        seed_at = T - lengths + period - 1
+        avg_gain = np.full((S, T), np.nan)
+        avg_loss = np.full((S, T), np.nan)
+        rows = np.flatnonzero(ready)
+        if len(rows):
+            sum_gain = np.zeros(len(rows))
+            sum_loss = np.zeros(len(rows))
+            first = T - lengths[rows]
+            for k in range(period):
+                sum_gain = sum_gain + gain[rows, first + k]
+                sum_loss = sum_loss + loss[rows, first + k]
+            avg_gain[rows, seed_at[rows]] = sum_gain / period
+            avg_loss[rows, seed_at[rows]] = sum_loss / period
+            for t in range(1, T):
+                smooth = ready & (t > seed_at)
+                if smooth.any():
+                    avg_gain[:, t] = np.where(smooth, (avg_gain[:, t - 1] * (period - 1) + gain[:, t]) / period, avg_gain[:, t])
+                    avg_loss[:, t] = np.where(smooth, (avg_loss[:, t - 1] * (period - 1) + loss[:, t]) / period, avg_loss[:, t])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+            rsi = 100 - (100 / (1 + rs))
+        rsi = np.where(np.isnan(rsi), 50.0, rsi)
+        return np.round(np.where(valid & ready[:, None], rsi, np.nan), 2)
+
+    @staticmethod
+    def atr(prices: np.ndarray, period: int = 14, lengths=None) -> np.ndarray:
+        """Wilder-smoothed average true range per bar, rounded to 2 places (``ATREngine.calculate_atr``)."""
+        lengths = BatchIndicatorEngine._lengths(prices, lengths)
+        high = prices[:, :, BatchIndicatorEngine.HIGH]
+        low = prices[:, :, BatchIndicatorEngine.LOW]
+        close = prices[:, :, BatchIndicatorEngine.CLOSE]
+        prev_close = np.concatenate((np.full((close.shape[0], 1), np.nan), close[:, :-1]), axis=1)
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = np.round(BatchIndicatorEngine.ema(true_range, 1.0 / period), 2)
+        keep = BatchIndicatorEngine._valid(prices, lengths) & (lengths >= period)[:, None]
+        return np.where(keep, atr, np.nan)
+
+    @staticmethod
+    def vwap(prices: np.ndarray, sessions: Optional[np.ndarray] = None, lengths=None, window: int = 20) -> np.ndarray:
+        """
+        VWAP per bar, rounded to 2 places. With ``sessions`` it resets at each new session
+        (intraday); without, it is a rolling ``min(window, length)``-bar VWAP that falls back to
+        the cumulative VWAP until the window fills. Gaps are forward- then back-filled.
+        """
+        lengths = BatchIndicatorEngine._lengths(prices, lengths)
+        S, T = prices.shape[:2]
+        valid = BatchIndicatorEngine._valid(prices, lengths)
+        typical = (prices[:, :, BatchIndicatorEngine.HIGH] + prices[:, :, BatchIndicatorEngine.LOW]
+                   + prices[:, :, BatchIndicatorEngine.CLOSE]) / 3.0
+        volume = prices[:, :, BatchIndicatorEngine.VOLUME]
+        pv = typical * volume
+
+        def running(values, resets):
+            # Sequential cumulative sums that restart where ``resets`` is set; NaNs are skipped
+            # but stay NaN in the output, like a (grouped) pandas cumsum
+            out = np.empty((S, T))
+            acc = np.zeros(S)
+            for t in range(T):
+                x = values[:, t]
+                acc = np.where(resets[:, t], 0.0, acc) + np.where(np.isnan(x), 0.0, x)
+                out[:, t] = np.where(np.isnan(x), np.nan, acc)
+            return out
+
+        first_bar = np.zeros((S, T), dtype=bool)
+        first_bar[np.arange(S)[lengths > 0], (T - lengths)[lengths > 0]] = True
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if sessions is not None:
+                changed = np.concatenate((np.ones((S, 1), dtype=bool), sessions[:, 1:] != sessions[:, :-1]), axis=1)
+                resets = first_bar | (valid & changed)
+                cum_vol = running(volume, resets)
+                vwap = running(pv, resets) / np.where(cum_vol == 0, np.nan, cum_vol)
+            else:
+                windows = np.minimum(window, lengths)
+                rolling_vol = BatchIndicatorEngine._window_sums(volume, windows)
+                vwap = BatchIndicatorEngine._window_sums(pv, windows) / np.where(rolling_vol == 0, np.nan, rolling_vol)
+                cum_vol = running(volume, first_bar)
+                fallback = running(pv, first_bar) / np.where(cum_vol == 0, np.nan, cum_vol)
+                vwap = np.where(np.isnan(vwap), fallback, vwap)
+        return np.round(BatchIndicatorEngine._fill_gaps(vwap, valid), 2)
+
+    @staticmethod
+    def _last_window_mean(values: np.ndarray, window: int, lengths: np.ndarray) -> np.ndarray:
+        """Mean of each row's last ``window`` values; NaN for short rows or windows holding a NaN."""
+        if values.shape[1] < window:
+            return np.full(values.shape[0], np.nan)
+        mean = values[:, -window:].mean(axis=1)
+        return np.where(lengths >= window, mean, np.nan)
+
+    @staticmethod
+    def volume_metrics(prices: np.ndarray, lengths=None, window: int = 20) -> Dict[str, np.ndarray]:
+        """
+        Last-bar volume profile per symbol (``VolumeEngine.calculate_volume_metrics``, unrounded):
+        relative volume against the ``window``-bar average, and buying/selling pressure from where
+        the bar closed within its range.
+        """
+        lengths = BatchIndicatorEngine._lengths(prices, lengths)
+        last = prices[:, -1, :]
+        o, h, l, c, volume = (last[:, j] for j in range(5))
+        avg_volume = BatchIndicatorEngine._last_window_mean(prices[:, :, BatchIndicatorEngine.VOLUME], window, lengths)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rvol = np.where(avg_volume > 0, volume / avg_volume, 1.0)
+            candle_range = h - l
+            flat = candle_range == 0
+            buying = np.where(flat, volume * 0.5, volume * ((c - l) / candle_range))
+            selling = np.where(flat, volume * 0.5, volume * ((h - c) / candle_range))
+            total = buying + selling
+            pressured = total > 0
+            buying_pct = np.where(pressured, (buying / total) * 100.0, 50.0)
+            selling_pct = np.where(pressured, (selling / total) * 100.0, 50.0)
+
+        return {
+            "current_volume": volume,
+            "avg_volume": avg_volume,
+            "rvol": rvol,
+            "buying_pressure_pct": buying_pct,
+            "selling_pressure_pct": selling_pct,
+            "delta_volume": buying - selling,
+        }
+
+    @staticmethod
+    def smart_money(prices: np.ndarray, lengths=None) -> Dict[str, np.ndarray]:
+        """
+        Last-bar smart-money classification per symbol (``SmartMoneyEngine``): the ``state`` label,
+        relative volume, volatility squeeze flag and whether the bar closed up. Rows with fewer
+        than 20 bars are flagged ``sufficient=False`` and read NEUTRAL.
+        """
+        lengths = BatchIndicatorEngine._lengths(prices, lengths)
+        S, T = prices.shape[:2]
+        sufficient = lengths >= 20
+        if T < 20:
+            empty = np.full(S, np.nan)
+            return {"state": np.full(S, "NEUTRAL", dtype=object), "rvol": empty, "volatility_squeeze": np.zeros(S, dtype=bool),
+                    "bullish_bar": np.zeros(S, dtype=bool), "sufficient": sufficient}
+
+        last = prices[:, -1, :]
+        o, h, l, c, volume = (last[:, j] for j in range(5))
+        spread_all = prices[:, :, BatchIndicatorEngine.HIGH] - prices[:, :, BatchIndicatorEngine.LOW]
+        body = np.abs(c - o)
+        spread = h - l
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rvol = volume / BatchIndicatorEngine._last_window_mean(prices[:, :, BatchIndicatorEngine.VOLUME], 20, lengths)
+            min_prev_low = prices[:, -10:-1, BatchIndicatorEngine.LOW].min(axis=1)
+            max_prev_high = prices[:, -10:-1, BatchIndicatorEngine.HIGH].max(axis=1)
+            scale = np.where(spread > 0, spread, 1)
+            range_pct = (c - l) / scale
+            body_pct = body / scale
+
+            # 14-bar mean range for the last six bars: the latest against the average of the five before
+            ranges = sliding_window_view(spread_all[:, -19:], 14, axis=1).mean(axis=2)
+            latest_atr = ranges[:, -1]
+            prior = ranges[:, :-1]
+            counted = (~np.isnan(prior)).sum(axis=1)
+            prev_atr_avg = np.where(np.isnan(prior), 0.0, prior).sum(axis=1) / counted
+            squeeze = latest_atr < (prev_atr_avg * 0.85)
+
+        high_volume = rvol > 1.5
+        ultra_high_volume = rvol > 2.2
+        bullish_bar = c > o
+        bearish_bar = c < o
+        state = np.select([
+            (l < min_prev_low) & (range_pct >= 0.7) & (body_pct < 0.4) & high_volume,
+            (h > max_prev_high) & (range_pct <= 0.3) & (body_pct < 0.4) & high_volume,
+            high_volume & (range_pct >= 0.65) & bullish_bar,
+            high_volume & (range_pct <= 0.35) & bearish_bar,
+            ultra_high_volume & (body_pct < 0.25) & (spread < latest_atr),
+            squeeze & (rvol > 1.1),
+        ], ["BULLISH_MANIPULATION", "BEARISH_MANIPULATION", "ACCUMULATION", "DISTRIBUTION", "ABSORPTION",
+            "BREAKOUT_LOADING"], default="NEUTRAL").astype(object)
+        state[~sufficient] = "NEUTRAL"
+
+        return {"state": state, "rvol": rvol, "volatility_squeeze": squeeze & sufficient,
+                "bullish_bar": bullish_bar, "sufficient": sufficient}
+
+    @staticmethod
+    def daily_bars(prices: np.ndarray, sessions: np.ndarray, lengths=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aggregates bars into one bar per session (first/max/min/last skipping NaNs, summed
+        volume) and drops incomplete days. Returns a bottom-aligned ``(symbols, days, fields)``
+        tensor, the day counts, and for each day the row position of its last bar (-1 on padding).
+        """
+        lengths = BatchIndicatorEngine._lengths(prices, lengths)
+        S, T, F = prices.shape
+        valid = BatchIndicatorEngine._valid(prices, lengths)
+        changed = np.concatenate((np.ones((S, 1), dtype=bool), sessions[:, 1:] != sessions[:, :-1]), axis=1)
+        first_bar = np.zeros((S, T), dtype=bool)
+        first_bar[np.arange(S)[lengths > 0], (T - lengths)[lengths > 0]] = True
+
+        bars = prices[valid]
+        N = len(bars)
+        if not N:
+            return np.full((S, 0, F), np.nan), np.zeros(S, dtype=np.int64), np.full((S, 0), -1, dtype=np.int64)
+        row_of = np.broadcast_to(np.arange(S)[:, None], (S, T))[valid]
+        position = (np.arange(T)[None, :] - (T - lengths)[:, None])[valid]
+        starts = np.flatnonzero((first_bar | changed)[valid])
+        ends = np.append(starts[1:], N)
+        seq = np.arange(N)
+
+        days = np.empty((len(starts), F))
+        first = np.minimum.reduceat(np.where(np.isnan(bars[:, 0]), N, seq), starts)
+        days[:, 0] = np.where(first < ends, bars[np.minimum(first, N - 1), 0], np.nan)
+        days[:, 1] = np.fmax.reduceat(bars[:, 1], starts)
+        days[:, 2] = np.fmin.reduceat(bars[:, 2], starts)
+        last = np.maximum.reduceat(np.where(np.isnan(bars[:, 3]), -1, seq), starts)
+        days[:, 3] = np.where(last >= starts, bars[np.maximum(last, 0), 3], np.nan)
+        days[:, 4] = np.add.reduceat(np.where(np.isnan(bars[:, 4]), 0.0, bars[:, 4]), starts)
+
+        keep = ~np.isnan(days).any(axis=1)
+        days, day_rows, day_pos = days[keep], row_of[starts][keep], position[ends - 1][keep]
+        counts = np.bincount(day_rows, minlength=S)
+        D = int(counts.max()) if len(counts) else 0
+        rank = np.arange(len(day_rows)) - (np.cumsum(counts) - counts)[day_rows]
+        cols = D - counts[day_rows] + rank
+        daily = np.full((S, D, F), np.nan)
+        daily[day_rows, cols] = days
+        positions = np.full((S, D), -1, dtype=np.int64)
+        positions[day_rows, cols] = day_pos
+        return daily, counts, positions
+
+    @staticmethod
+    def cpr(prices: np.ndarray, sessions: Optional[np.ndarray] = None, lengths=None) -> Dict[str, np.ndarray]:
+        """
+        Central Pivot Range from the previous trading day, per symbol (``CPREngine``, unrounded).
+        With ``sessions`` bars are first aggregated to days; without, each bar is a day. Symbols
+        with fewer than two days fall back to a flat day spanning the whole history.
+
+        Besides the pivot ladder, returns the CPR width relative to the average of up to 21
+        prior days, and for the 14 days before the previous one (``virgin_*``, newest first)
+        their CPR and whether that day's range never touched it; ``virgin_position`` is the row
+        position of the day's last bar.
+        """
+        E = BatchIndicatorEngine
+        lengths = E._lengths(prices, lengths)
+        S, T, F = prices.shape
+        if sessions is not None:
+            daily, day_lengths, positions = E.daily_bars(prices, sessions, lengths)
+        else:
+            daily, day_lengths = prices, lengths.copy()
+            positions = np.arange(T)[None, :] - (T - lengths)[:, None]
+
+        short = day_lengths < 2
+        if short.any():
+            D = max(daily.shape[1], 2)
+            if daily.shape[1] < 2:
+                pad = D - daily.shape[1]
+                daily = np.concatenate((np.full((S, pad, F), np.nan), daily), axis=1)
+                positions = np.concatenate((np.full((S, pad), -1, dtype=np.int64), positions), axis=1)
+            else:
+                daily = daily.copy()
+            flat_high = np.fmax.reduce(prices[:, :, E.HIGH], axis=1)
+            flat_low = np.fmin.reduce(prices[:, :, E.LOW], axis=1)
+            flat = np.stack([prices[:, -1, E.CLOSE], flat_high, flat_low, prices[:, -1, E.CLOSE], np.zeros(S)], axis=1)
+            daily[short, -2:] = flat[short][:, None, :]
+            day_lengths = np.where(short, 2, day_lengths)
+
+        D = daily.shape[1]
+        H, L, C = (daily[:, -2, j] for j in (E.HIGH, E.LOW, E.CLOSE))
+        PP = (H + L + C) / 3.0
+        BC = (H + L) / 2.0
+        TC = (PP - BC) + PP
+        tc = np.maximum(TC, BC)
+        bc = np.minimum(TC, BC)
+        span = H - L
+        R1, S1 = 2 * PP - L, 2 * PP - H
+        R2, S2 = PP + span, PP - span
+        R3, S3 = R1 + span, S1 - span
+        R4, S4 = R3 + span, S3 - span
+
+        def day_cpr(k):
+            # CPR built from the day k places back from the last one (k=1 is yesterday)
+            idx = max(D - 1 - k, 0)
+            h, l, c = (daily[:, idx, j] for j in (E.HIGH, E.LOW, E.CLOSE))
+            pp = (h + l + c) / 3.0
+            bc_ = (h + l) / 2.0
+            return pp, bc_, 2 * pp - bc_
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            width_days = np.minimum(21, day_lengths - 1)
+            width_sum = np.zeros(S)
+            for k in range(21):
+                pp, bc_, tc_ = day_cpr(k + 1)
+                width_sum = width_sum + np.where(k < width_days, np.abs(tc_ - bc_) / pp * 100, 0.0)
+            current_width = np.abs(tc - bc) / PP * 100
+            avg_width = np.where(width_days > 0, width_sum / np.maximum(width_days, 1), current_width)
+            relative_width = np.where(avg_width > 0, current_width / avg_width, 1.0)
+
+            virgin_days = np.minimum(15, day_lengths - 1) - 1
+            shape = (S, 14)
+            virgin, v_pp, v_tc, v_bc = np.zeros(shape, dtype=bool), np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+            v_position = np.full(shape, -1, dtype=np.int64)
+            for k in range(14):
+                day = max(D - 2 - k, 0)
+                pp, bc_, tc_ = day_cpr(k + 2)
+                v_pp[:, k] = pp
+                v_tc[:, k] = np.maximum(tc_, bc_)
+                v_bc[:, k] = np.minimum(tc_, bc_)
+                untouched = (daily[:, day, E.LOW] > v_tc[:, k]) | (daily[:, day, E.HIGH] < v_bc[:, k])
+                virgin[:, k] = (k < virgin_days) & untouched
+                v_position[:, k] = positions[:, day]
+
+        width_class = np.select([relative_width < 0.75, relative_width > 1.25], ["NARROW", "WIDE"], default="AVERAGE").astype(object)
+        return {
+            "pp": PP, "tc": tc, "bc": bc,
+            "r1": R1, "r2": R2, "r3": R3, "r4": R4, "s1": S1, "s2": S2, "s3": S3, "s4": S4,
+            "width_pct": current_width, "relative_width": relative_width, "width_classification": width_class,
+            "prev_high": H, "prev_low": L, "prev_close": C, "cmp": prices[:, -1, E.CLOSE],
+            "virgin": virgin, "virgin_pp": v_pp, "virgin_tc": v_tc, "virgin_bc": v_bc, "virgin_position": v_position,
+        }
@@ -17,28 +17,47 @@ class BreakoutEngine:
             return {"status": "AVOID", "reason": "Stock is not in an active focus sector"}
 
         # Standardize columns to capitalized
-        df_daily = df_daily.copy()
+        df_daily = df_daily.copy(deep=False)
         df_daily.columns = [c.capitalize() for c in df_daily.columns]
 
         last_row = df_daily.iloc[-1]
         prev_row = df_daily.iloc[-2]
-        
-        close = float(last_row['Close'])
-        high = float(last_row['High'])
-        low = float(last_row['Low'])
-        volume = float(last_row['Volume'])
-        
+
+        return BreakoutEngine.classify_day1(
+            n_bars=len(df_daily),
+            close=float(last_row['Close']),
+            high=float(last_row['High']),
+            low=float(last_row['Low']),
+            volume=float(last_row['Volume']),
+            avg_vol_20d=avg_vol_20d,
+            dma_20=df_daily['Close'].rolling(20).mean().iloc[-1],
+            dma_50=df_daily['Close'].rolling(50).mean().iloc[-1],
+            dma_200=df_daily['Close'].rolling(200).mean().iloc[-1],
+            resistance=df_daily['High'].iloc[-60:-1].max(),
+            prev_low=prev_row['Low'],
+            active_sector=active_sector
+        )
+
+    @staticmethod
+    def classify_day1(n_bars: int, close: float, high: float, low: float, volume: float, avg_vol_20d: float,
+                      dma_20: float, dma_50: float, dma_200: float, resistance: float, prev_low: float,
+                      active_sector: bool) -> Dict[str, Any]:
+        """
+        Day 1 rules on precomputed inputs, so live tick updates can re-evaluate them without a DataFrame.
+        DMAs are NaN when there are fewer bars than the window (that condition then does not fail).
+        """
+        if n_bars < 60:
+            return {"status": "WATCHLIST", "reason": "Insufficient historical data (< 60 bars)"}
+
+        if not active_sector:
+            return {"status": "AVOID", "reason": "Stock is not in an active focus sector"}
+
         # 1. Price above key DMAs
-        dma_20 = df_daily['Close'].rolling(20).mean().iloc[-1]
-        dma_50 = df_daily['Close'].rolling(50).mean().iloc[-1]
-        dma_200 = df_daily['Close'].rolling(200).mean().iloc[-1]
-        
         if close <= dma_20 or close <= dma_50 or close <= dma_200:
             return {"status": "AVOID", "reason": "Price is below key moving averages (20, 50, 200 DMA)"}
             
         # 2. Breaking multi-week resistance (60-day high check)
-        lookback_resistance = df_daily['High'].iloc[-60:-1].max()
-        if close <= lookback_resistance:
+        if close <= resistance:
             return {"status": "WATCHLIST", "reason": "Price is still consolidating below 60-day resistance"}
 
         # 3. Volume > 2x average on breakout day
@@ -55,7 +74,7 @@ class BreakoutEngine:
 
         # All filters passed -> Day 1 Buy Triggered
         # Stop loss is set 1.5% below the previous day's low or key support
-        stop_loss = float(prev_row['Low'] * 0.985)
+        stop_loss = float(prev_low * 0.985)
         return {
             "status": "FRESH BREAKOUT",
             "trigger_price": close,
@@ -71,13 +90,13 @@ class BreakoutEngine:
         if len(df_daily) < 2:
             return {"status": "WATCHLIST", "action": "HOLD", "stop_loss": day1_sl}
 
-        # Standardize columns to capitalized
-        df_daily = df_daily.copy()
-        df_daily.columns = [c.capitalize() for c in df_daily.columns]
+        last = df_daily.iloc[-1]
+        close_day2 = float(last['Close' if 'Close' in df_daily.columns else 'close'])
+        return BreakoutEngine.classify_day2(close_day2, breakout_zone, day1_sl)
 
-        last_row = df_daily.iloc[-1]
-        close_day2 = float(last_row['Close'])
-        
+    @staticmethod
+    def classify_day2(close_day2: float, breakout_zone: float, day1_sl: float) -> Dict[str, Any]:
+        """Day 2 confirmation rule on the latest close."""
         if close_day2 >= breakout_zone:
             # Confirmed Day 2 Breakout
             return {
@@ -2,7 +2,15 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Any
 
+from app.engine.batch import BatchIndicatorEngine
+
 class CPREngine:
+    WIDTH_DESCRIPTIONS = {
+        "NARROW": "Highly compressed CPR range. Signals potential for an explosive trend or breakout today!",
+        "WIDE": "Highly expanded CPR range. Signals a highly probable range-bound, sideways, or mean-reverting session today.",
+        "AVERAGE": "Average CPR range width. Standard trend-following and pivot boundary rules apply.",
+    }
+
     @staticmethod
     def calculate_cpr_levels(df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -22,126 +30,46 @@ class CPREngine:
                 pass
 
         # Aggregate to daily bars to get previous day's High, Low, Close
-        if isinstance(df.index, pd.DatetimeIndex):
-            df_daily = df.groupby(df.index.date).agg({
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna()
-        else:
-            df_daily = df.copy()
-
-        if len(df_daily) < 2:
-            # Fallback if there is not enough daily data (e.g. only 1 candle or new symbol)
-            # Use current candle as approximation
-            cmp = float(df['close'].iloc[-1])
-            H = float(df['high'].max())
-            L = float(df['low'].min())
-            C = float(df['close'].iloc[-1])
-            df_daily = pd.DataFrame([{
-                'open': cmp, 'high': H, 'low': L, 'close': C, 'volume': 0
-            }, {
-                'open': cmp, 'high': H, 'low': L, 'close': C, 'volume': 0
-            }])
-
-        # Today's CPR is calculated from YESTERDAY's High, Low, Close (index -2 of daily df)
-        prev_day = df_daily.iloc[-2]
-        H = float(prev_day['high'])
-        L = float(prev_day['low'])
-        C = float(prev_day['close'])
-
-        PP = (H + L + C) / 3.0
-        BC = (H + L) / 2.0
-        TC = (PP - BC) + PP
-
-        # Standard plotted values (ensure TC is physically above BC)
-        tc_plotted = max(TC, BC)
-        bc_plotted = min(TC, BC)
-
-        # Standard Pivot Levels associated with CPR
-        R1 = 2 * PP - L
-        S1 = 2 * PP - H
-        R2 = PP + (H - L)
-        S2 = PP - (H - L)
-        R3 = R1 + (H - L)
-        S3 = S1 - (H - L)
-        R4 = R3 + (H - L)
-        S4 = S3 - (H - L)
-
-        # Calculate width percentage and compare to historical widths (20-day average)
-        widths = []
-        for i in range(1, min(22, len(df_daily))):
-            if i + 1 > len(df_daily):
-                break
-            hist_prev = df_daily.iloc[-i - 1]
-            h_h = float(hist_prev['high'])
-            h_l = float(hist_prev['low'])
-            h_c = float(hist_prev['close'])
-            h_pp = (h_h + h_l + h_c) / 3.0
-            h_bc = (h_h + h_l) / 2.0
-            h_tc = 2 * h_pp - h_bc
-            widths.append(abs(h_tc - h_bc) / h_pp * 100)
-
-        current_width = abs(tc_plotted - bc_plotted) / PP * 100
-        avg_width = sum(widths) / len(widths) if widths else current_width
-        relative_width = current_width / avg_width if avg_width > 0 else 1.0
-
-        if relative_width < 0.75:
-            width_type = "NARROW"
-            width_desc = "Highly compressed CPR range. Signals potential for an explosive trend or breakout today!"
-        elif relative_width > 1.25:
-            width_type = "WIDE"
-            width_desc = "Highly expanded CPR range. Signals a highly probable range-bound, sideways, or mean-reverting session today."
-        else:
-            width_type = "AVERAGE"
-            width_desc = "Average CPR range width. Standard trend-following and pivot boundary rules apply."
+        prices, _, sessions = BatchIndicatorEngine.stack([df], with_sessions=isinstance(df.index, pd.DatetimeIndex))
+        return CPREngine.describe_levels(BatchIndicatorEngine.cpr(prices, sessions), 0, df.index)
+
+    @staticmethod
+    def describe_levels(levels: Dict[str, Any], i: int, index) -> Dict[str, Any]:
+        """
+        Formats row ``i`` of ``BatchIndicatorEngine.cpr`` into CPR levels plus the chart's
+        support/resistance lists. ``index`` is that symbol's bar index, used to date Virgin CPRs.
+        """
+        H, L, C = (float(levels[k][i]) for k in ("prev_high", "prev_low", "prev_close"))
+        PP, tc_plotted, bc_plotted = (float(levels[k][i]) for k in ("pp", "tc", "bc"))
+        R1, R2, R3, R4, S1, S2, S3, S4 = (float(levels[k][i]) for k in ("r1", "r2", "r3", "r4", "s1", "s2", "s3", "s4"))
+        width_type = levels["width_classification"][i]
 
         # Find recent "Virgin CPRs" in the last 15 days (where daily High/Low never touched/crossed the CPR range)
         virgin_cprs = []
-        max_lookback = min(15, len(df_daily) - 1)
-        for i in range(1, max_lookback):
-            if i + 2 > len(df_daily):
-                break
-            hist_day = df_daily.iloc[-i - 1]
-            hist_prev_day = df_daily.iloc[-i - 2]
-
-            hd_high = float(hist_day['high'])
-            hd_low = float(hist_day['low'])
-
-            h_h = float(hist_prev_day['high'])
-            h_l = float(hist_prev_day['low'])
-            h_c = float(hist_prev_day['close'])
-
-            h_pp = (h_h + h_l + h_c) / 3.0
-            h_bc = (h_h + h_l) / 2.0
-            h_tc = 2 * h_pp - h_bc
-
-            h_tc_p = max(h_tc, h_bc)
-            h_bc_p = min(h_tc, h_bc)
-
-            # A day where the entire price range is completely above or completely below the CPR
-            if hd_low > h_tc_p or hd_high < h_bc_p:
-                virgin_cprs.append({
-                    "date": hist_day.name.isoformat() if hasattr(hist_day.name, "isoformat") else str(hist_day.name),
-                    "pp": round(h_pp, 2),
-                    "tc": round(h_tc_p, 2),
-                    "bc": round(h_bc_p, 2),
-                    "type": "VIRGIN_CPR",
-                    "level_range": f"{round(h_bc_p, 2)} - {round(h_tc_p, 2)}"
-                })
+        for k in np.flatnonzero(levels["virgin"][i]):
+            label = index[levels["virgin_position"][i, k]]
+            if isinstance(index, pd.DatetimeIndex):
+                label = label.date()
+            h_pp, h_tc_p, h_bc_p = (float(levels[name][i, k]) for name in ("virgin_pp", "virgin_tc", "virgin_bc"))
+            virgin_cprs.append({
+                "date": label.isoformat() if hasattr(label, "isoformat") else str(label),
+                "pp": round(h_pp, 2),
+                "tc": round(h_tc_p, 2),
+                "bc": round(h_bc_p, 2),
+                "type": "VIRGIN_CPR",
+                "level_range": f"{round(h_bc_p, 2)} - {round(h_tc_p, 2)}"
+            })
 
-        cmp = float(df['close'].iloc[-1])
+        cmp = float(levels["cmp"][i])
 
         cpr_levels = {
             "tc": round(tc_plotted, 2),
             "pp": round(PP, 2),
             "bc": round(bc_plotted, 2),
-            "width_pct": round(current_width, 3),
-            "relative_width": round(relative_width, 2),
+            "width_pct": round(float(levels["width_pct"][i]), 3),
+            "relative_width": round(float(levels["relative_width"][i]), 2),
             "width_classification": width_type,
-            "width_description": width_desc,
+            "width_description": CPREngine.WIDTH_DESCRIPTIONS[width_type],
         }
 
         # Build support/resistance list for chart rendering
@@ -345,7 +273,11 @@ class CPREngine:
         Bridge method for backward compatibility with SignalEngine.
         Flattens and returns a dict with tc, pp, bc, and width_status.
         """
-        res = CPREngine.calculate_cpr_levels(df)
+        return CPREngine.flatten(CPREngine.calculate_cpr_levels(df))
+
+    @staticmethod
+    def flatten(res: Dict[str, Any]) -> Dict[str, Any]:
+        """Flattens a ``calculate_cpr_levels`` / ``describe_levels`` result for SignalEngine."""
         cpr_dict = res.get("cpr", {})
         flat = {
             "tc": cpr_dict.get("tc"),
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class IndicatorContext:
+    """
+    Lazily computed, memoized indicators for one OHLCV frame.
+
+    ``IndicatorContext.of(df)`` returns the context attached to that frame object, so every
+    engine that reads the same frame during a request (SR strategy, insights, regime, AI
+    features, the V5 context builder) shares one bag of results keyed by
+    ``(indicator, *params)``; each is computed on first use. A context lives as long as its
+    frame. Frames whose length or last bar changed in place get a fresh one. Memoized series
+    are shared between callers and must be treated as read-only.
+    """
+
+    FINGERPRINT_COLUMNS = ("open", "high", "low", "close", "volume")
+
+    _contexts: Dict[int, "IndicatorContext"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, df: pd.DataFrame):
+        self._frame = weakref.ref(df)
+        self._fingerprint = self._fingerprint_of(df)
+        self._values: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def _fingerprint_of(cls, df: pd.DataFrame) -> Tuple:
+        if df.empty:
+            return (0, None, np.empty(0))
+        last = np.array([df[c].iat[-1] if c in df.columns else np.nan for c in cls.FINGERPRINT_COLUMNS], dtype=float)
+        return (len(df), df.index[-1], last)
+
+    def _matches(self, df: pd.DataFrame) -> bool:
+        length, last_label, last = self._fingerprint_of(df)
+        return (length == self._fingerprint[0] and last_label == self._fingerprint[1]
+                and np.array_equal(last, self._fingerprint[2], equal_nan=True))
+
+    @classmethod
+    def _forget(cls, key: int, ctx: "IndicatorContext") -> None:
+        with cls._lock:
+            if cls._contexts.get(key) is ctx:
+                del cls._contexts[key]
+
+    @classmethod
+    def of(cls, df: pd.DataFrame) -> "IndicatorContext":
+        key = id(df)
+        with cls._lock:
+            ctx = cls._contexts.get(key)
+            if ctx is not None and ctx._frame() is df and ctx._matches(df):
+                return ctx
+            ctx = cls(df)
+            cls._contexts[key] = ctx
+        weakref.finalize(df, cls._forget, key, ctx)
+        return ctx
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the memoized value for ``key``, computing it with ``compute()`` on first use."""
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        return self._values.setdefault(key, compute())
+
+    def ema(self, span: int) -> pd.Series:
+        """``close.ewm(span=span, adjust=False).mean()``."""
+        df = self._frame()
+        return self.get(("ema", span), lambda: df['close'].ewm(span=span, adjust=False).mean())
@@ -1,13 +1,16 @@
 import pandas as pd
 import numpy as np
 
+from app.engine.indicator_context import IndicatorContext
+from app.engine.pivots import pivot_mask
+
 class InsightEngine:
     @staticmethod
     def get_ema_bias(df: pd.DataFrame, period: int = 50):
         if len(df) < period:
             return "Neutral"
         
-        ema = df['close'].ewm(span=period, adjust=False).mean()
+        ema = IndicatorContext.of(df).ema(period)
         curr_price = df['close'].iloc[-1]
         curr_ema = ema.iloc[-1]
         
@@ -97,7 +100,10 @@ class InsightEngine:
         """
         if len(df) < period * 2:
             return 0.0
-            
+        return IndicatorContext.of(df).get(("adx", period), lambda: InsightEngine._adx(df, period))
+
+    @staticmethod
+    def _adx(df: pd.DataFrame, period: int) -> float:
         high = df['high']
         low = df['low']
         close = df['close']
@@ -140,14 +146,8 @@ class InsightEngine:
         lows = df['low'].values
         
         # Last 3 "peaks" and "troughs" in a simple rolling window
-        peaks = []
-        troughs = []
-        
-        for i in range(2, len(df) - 2):
-            if highs[i] > highs[i-1] and highs[i] > highs[i-2] and highs[i] > highs[i+1] and highs[i] > highs[i+2]:
-                peaks.append(highs[i])
-            if lows[i] < lows[i-1] and lows[i] < lows[i-2] and lows[i] < lows[i+1] and lows[i] < lows[i+2]:
-                troughs.append(lows[i])
+        peaks = highs[pivot_mask(highs, 2, high=True)]
+        troughs = lows[pivot_mask(lows, 2, high=False)]
         
         if len(peaks) >= 2 and len(troughs) >= 2:
             last_p = peaks[-1]
@@ -175,7 +175,9 @@ class InsightEngine:
         while idx > -len(df) and df['volume'].iloc[idx] == 0:
             idx -= 1
             
-        avg_vol = df['volume'].rolling(window=period, min_periods=5).mean().iloc[idx]
+        avg_vol = IndicatorContext.of(df).get(
+            ("volume_mean", period, 5), lambda: df['volume'].rolling(window=period, min_periods=5).mean()
+        ).iloc[idx]
         curr_vol = df['volume'].iloc[idx]
         
         if avg_vol > 0:
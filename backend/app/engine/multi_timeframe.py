@@ -22,7 +22,11 @@ class MultiTimeframeEngine:
         # Calculate Exponential Moving Averages
         ema20 = df['Close'].ewm(span=20, adjust=False).mean().iloc[-1]
         ema50 = df['Close'].ewm(span=50, adjust=False).mean().iloc[-1]
-        
+        return MultiTimeframeEngine.trend_bias_from_emas(close, ema20, ema50)
+
+    @staticmethod
+    def trend_bias_from_emas(close: float, ema20: float, ema50: float) -> int:
+        """Trend bias from precomputed EMAs (see ``get_trend_bias``)."""
         if close > ema20 > ema50:
             return 1
         elif close < ema20 < ema50:
@@ -45,7 +49,11 @@ class MultiTimeframeEngine:
         d_bias = MultiTimeframeEngine.get_trend_bias(df_daily)
         w_bias = MultiTimeframeEngine.get_trend_bias(df_weekly)
         m_bias = MultiTimeframeEngine.get_trend_bias(df_monthly)
-        
+        return MultiTimeframeEngine.classify_alignment(d_bias, w_bias, m_bias)
+
+    @staticmethod
+    def classify_alignment(d_bias: int, w_bias: int, m_bias: int) -> Dict[str, Any]:
+        """Golden Rule 16 classification from per-timeframe trend biases."""
         # Calculate positive alignment
         bullish_count = sum([1 for b in [d_bias, w_bias, m_bias] if b == 1])
         
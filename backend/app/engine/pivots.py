@@ -0,0 +1,58 @@
+from typing import List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def pivot_mask(values, window: int, high: bool = True, skip_nan: bool = False) -> np.ndarray:
+    """
+    Flags bars that are strict pivots: above (``high``) or below every one of the ``window``
+    bars on each side. The first and last ``window`` bars are never pivots.
+
+    By default a NaN anywhere in the neighbourhood rules the bar out, like chained ``>``
+    comparisons. With ``skip_nan`` a bar is only ruled out by a neighbour it fails to beat, like
+    an early-exit ``<=`` loop, so NaN neighbours (or a NaN bar) do not disqualify it.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    if window < 1:
+        mask[:] = True
+        return mask
+    if n < 2 * window + 1:
+        return mask
+
+    windows = sliding_window_view(values, window)
+    if high:
+        reduce = np.fmax if skip_nan else np.maximum
+    else:
+        reduce = np.fmin if skip_nan else np.minimum
+    extreme = reduce.reduce(windows, axis=1)
+    # extreme[k] covers values[k:k + window]: left side of bar i is k = i - window, right side is i + 1
+    centers = values[window:n - window]
+    left, right = extreme[:n - 2 * window], extreme[window + 1:]
+
+    if skip_nan:
+        beaten = (centers <= left) | (centers <= right) if high else (centers >= left) | (centers >= right)
+        mask[window:n - window] = ~beaten
+    else:
+        mask[window:n - window] = (centers > left) & (centers > right) if high else (centers < left) & (centers < right)
+    return mask
+
+
+def consolidate_levels(prices, pct: float) -> List[Tuple[float, int]]:
+    """
+    Sorts ``prices`` and chains each into the previous group while its gap to the preceding
+    price is under ``pct``; returns ``(average price, count)`` per group, ascending.
+    """
+    prices = np.sort(np.asarray(prices, dtype=float), kind="stable")
+    if not len(prices):
+        return []
+    gaps = np.diff(prices) / prices[:-1]
+    bounds = np.concatenate(([0], np.flatnonzero(~(gaps < pct)) + 1, [len(prices)]))
+    groups = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        # Sequential float sum, in ascending order, as the level lists were summed before
+        group = prices[start:end].tolist()
+        groups.append((sum(group) / len(group), len(group)))
+    return groups
@@ -11,15 +11,20 @@ class MarketRegimeEngine:
         Uses ADX for trend strength and EMA20/50 crossover for direction.
         """
         try:
-            # Handle casing anomalies gracefully
-            df = df.copy()
-            df.columns = [c.lower() for c in df.columns]
+            # Handle casing anomalies gracefully (shallow copy: only the column labels change).
+            # Already-lowercase frames are used as-is so they keep their shared indicator context.
+            lowered = [c.lower() for c in df.columns]
+            if lowered != list(df.columns):
+                df = df.copy(deep=False)
+                df.columns = lowered
             
+            from app.engine.indicator_context import IndicatorContext
             from app.engine.insights import InsightEngine
             
+            ctx = IndicatorContext.of(df)
             adx = InsightEngine.get_adx(df)
-            ema20 = df['close'].ewm(span=20, adjust=False).mean().iloc[-1]
-            ema50 = df['close'].ewm(span=50, adjust=False).mean().iloc[-1]
+            ema20 = ctx.ema(20).iloc[-1]
+            ema50 = ctx.ema(50).iloc[-1]
             cmp = float(df['close'].iloc[-1])
 
             if adx >= 25:
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
+from app.engine.batch import BatchIndicatorEngine
+
 class RSIEngine:
     @staticmethod
     def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -12,37 +14,8 @@ class RSIEngine:
         if df is None or df.empty or len(df) < period:
             return pd.Series(np.nan, index=df.index if df is not None else [])
             
-        close = df['close']
-        delta = close.diff()
-        
-        gain = (delta.where(delta > 0, 0)).copy()
-        loss = (-delta.where(delta < 0, 0)).copy()
-        
-        # Wilder's smoothing (SMA of gain/loss initially, then exponential-like smoothing)
-        avg_gain = gain.rolling(window=period, min_periods=period).mean()
-        avg_loss = loss.rolling(window=period, min_periods=period).mean()
-        
-        # We need to apply Wilder's smoothing logic to remaining bars
-        # Wilders EMA formula: Wilder_EMA_today = (Wilder_EMA_yesterday * (n-1) + today_val) / n
-        avg_gain_vals = avg_gain.values.copy()
-        avg_loss_vals = avg_loss.values.copy()
-        gain_vals = gain.values
-        loss_vals = loss.values
-        
-        for i in range(period, len(df)):
-            avg_gain_vals[i] = (avg_gain_vals[i - 1] * (period - 1) + gain_vals[i]) / period
-            avg_loss_vals[i] = (avg_loss_vals[i - 1] * (period - 1) + loss_vals[i]) / period
-            
-        avg_gain = pd.Series(avg_gain_vals, index=df.index)
-        avg_loss = pd.Series(avg_loss_vals, index=df.index)
-        
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        
-        # Fill any NaNs with 50.0 (neutral) to prevent issues
-        rsi = rsi.fillna(50.0)
-        
-        return rsi.round(2)
+        prices, _, _ = BatchIndicatorEngine.stack([df])
+        return pd.Series(BatchIndicatorEngine.rsi(prices, period)[0], index=df.index)
 
     @staticmethod
     def evaluate_rsi_state(rsi_series: pd.Series) -> Dict[str, Any]:
@@ -1,3 +1,8 @@
+import numpy as np
+
+from app.engine.pivots import consolidate_levels, pivot_mask
+
+
 class SREngine:
     @staticmethod
     def classify_levels(zones: list, cmp: float):
@@ -21,42 +26,17 @@ class SREngine:
         Limit to last 120 candles.
         """
         # Limit to last 120 candles
-        df_slice = df.tail(120).copy()
+        df_slice = df.tail(120)
         highs = df_slice['high'].values
         lows = df_slice['low'].values
-        levels = []
-
-        # Simple pivot detection
-        for i in range(window, len(df_slice) - window):
-            # Pivot High
-            if all(highs[i] > highs[i-j] for j in range(1, window+1)) and \
-               all(highs[i] > highs[i+j] for j in range(1, window+1)):
-                levels.append({'price': float(highs[i]), 'type': 'RESISTANCE', 'strength': 1})
-            
-            # Pivot Low
-            if all(lows[i] < lows[i-j] for j in range(1, window+1)) and \
-               all(lows[i] < lows[i+j] for j in range(1, window+1)):
-                levels.append({'price': float(lows[i]), 'type': 'SUPPORT', 'strength': 1})
-
-        # Consolidate nearby levels (within 0.5% range)
-        consolidated = []
-        if not levels: return [], []
-
-        levels.sort(key=lambda x: x['price'])
-        current_group = [levels[0]]
-
-        for i in range(1, len(levels)):
-            if (levels[i]['price'] - current_group[-1]['price']) / current_group[-1]['price'] < 0.005:
-                current_group.append(levels[i])
-            else:
-                avg_price = sum(l['price'] for l in current_group) / len(current_group)
-                consolidated.append({'price': avg_price, 'strength': len(current_group)})
-                current_group = [levels[i]]
-        
-        # Add last group
-        if current_group:
-            avg_price = sum(l['price'] for l in current_group) / len(current_group)
-            consolidated.append({'price': avg_price, 'strength': len(current_group)})
+
+        # Pivot highs/lows, then consolidate nearby levels (within 0.5% range)
+        levels = np.concatenate((
+            highs[pivot_mask(highs, window, high=True)],
+            lows[pivot_mask(lows, window, high=False)],
+        ))
+        if not len(levels): return [], []
+        consolidated = [{'price': price, 'strength': count} for price, count in consolidate_levels(levels, 0.005)]
 
         # Classify relative to CMP
         cmp = df['close'].iloc[-1]
@@ -0,0 +1,313 @@
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+NAN = float("nan")
+
+
+def _div(a: float, b: float) -> float:
+    # Zero denominators only arise here as 0/0 (flat bars), which pandas turns into NaN
+    return a / b if b else NAN
+
+
+class StreamingIndicator:
+    """
+    Base for O(1) incremental indicators.
+
+    Each indicator is seeded once from history, then advanced one completed bar at a time
+    with ``update``. ``peek`` returns the value the indicator would have if the in-progress
+    bar closed at the given price, without changing state, so tick-level evaluation never
+    touches the history. ``snapshot``/``restore`` save and rewind the full state (e.g. to
+    evaluate a hypothetical bar sequence, or to rebuild after a replayed feed).
+    """
+
+    __slots__ = ()
+
+    def snapshot(self) -> Tuple:
+        state = []
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, StreamingIndicator):
+                value = value.snapshot()
+            elif isinstance(value, np.ndarray):
+                value = value.copy()
+            state.append(value)
+        return tuple(state)
+
+    def restore(self, state: Tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            current = getattr(self, name)
+            if isinstance(current, StreamingIndicator):
+                current.restore(value)
+            elif isinstance(value, np.ndarray):
+                setattr(self, name, value.copy())
+            else:
+                setattr(self, name, value)
+
+
+class RollingMean(StreamingIndicator):
+    """
+    Trailing mean over ``window`` values, matching ``Series.rolling(window).mean()``: NaN until
+    the window is full, and NaN while it holds a NaN.
+    """
+
+    __slots__ = ("window", "_ring", "_pos", "_count", "_sum", "_nans", "_since_resync")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ring = np.zeros(self.window)
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+        self._nans = 0
+        self._since_resync = 0
+
+    def seed(self, values: Iterable[float]) -> "RollingMean":
+        values = np.asarray(values, dtype=float)[-self.window:]
+        self._reset()
+        n = len(values)
+        self._ring[:n] = values
+        self._count = n
+        self._pos = n % self.window
+        self._nans = int(np.isnan(values).sum())
+        self._sum = float(np.nansum(values))
+        return self
+
+    @property
+    def value(self) -> float:
+        if self._count < self.window or self._nans:
+            return NAN
+        return self._sum / self.window
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if self._count == self.window:
+            old = self._ring[self._pos]
+            if old != old:
+                self._nans -= 1
+            else:
+                self._sum -= old
+        else:
+            self._count += 1
+        self._ring[self._pos] = x
+        if x != x:
+            self._nans += 1
+        else:
+            self._sum += x
+        self._pos = (self._pos + 1) % self.window
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            # Re-add the window once per cycle so the running sum cannot drift (amortised O(1))
+            filled = self._ring if self._count == self.window else self._ring[:self._count]
+            self._sum = float(np.nansum(filled))
+            self._since_resync = 0
+        return self.value
+
+    def peek(self, x: float) -> float:
+        x = float(x)
+        full = self._count == self.window
+        if not full and self._count + 1 < self.window:
+            return NAN
+        nans, total = self._nans, self._sum
+        if full:
+            old = self._ring[self._pos]
+            if old != old:
+                nans -= 1
+            else:
+                total -= old
+        if x != x or nans:
+            return NAN
+        return (total + x) / self.window
+
+
+class EMA(StreamingIndicator):
+    """``Series.ewm(span=..., adjust=False).mean()`` (or ``alpha=...``), with the same float op order."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        if (span is None) == (alpha is None):
+            raise ValueError("EMA needs exactly one of span or alpha")
+        self.alpha = float(alpha) if alpha is not None else 2.0 / (float(span) + 1.0)
+        self.value = NAN
+
+    def seed(self, values: Iterable[float]) -> "EMA":
+        self.value = NAN
+        for x in np.asarray(values, dtype=float):
+            self.value = self.peek(x)
+        return self
+
+    def update(self, x: float) -> float:
+        self.value = self.peek(x)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        x = float(x)
+        prev = self.value
+        if prev != prev:
+            return x
+        if x != x or prev == x:
+            return prev
+        a = self.alpha
+        return ((1.0 - a) * prev + a * x) / ((1.0 - a) + a)
+
+
+class WilderRSI(StreamingIndicator):
+    """
+    RSI with Wilder smoothing, matching ``RSIEngine.calculate_rsi`` before its rounding: the first
+    average is the simple mean of the first ``period`` bars (the first bar counts as no move),
+    then ``avg = (avg * (period - 1) + move) / period``. NaN until seeded, and NaN when the
+    average loss is zero (RSIEngine reports those as 50).
+    """
+
+    __slots__ = ("period", "_count", "_prev_close", "_avg_gain", "_avg_loss")
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._count = 0
+        self._prev_close = NAN
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def seed(self, closes: Iterable[float]) -> "WilderRSI":
+        self.__init__(self.period)
+        for close in np.asarray(closes, dtype=float):
+            self.update(close)
+        return self
+
+    def _step(self, close: float) -> Tuple[float, float]:
+        delta = close - self._prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        p = self.period
+        if self._count < p:
+            # Accumulate sums while seeding; they become means on the period-th bar
+            avg_gain, avg_loss = self._avg_gain + gain, self._avg_loss + loss
+            if self._count + 1 == p:
+                avg_gain, avg_loss = avg_gain / p, avg_loss / p
+            return avg_gain, avg_loss
+        return (self._avg_gain * (p - 1) + gain) / p, (self._avg_loss * (p - 1) + loss) / p
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        if not avg_loss:
+            return NAN
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    @property
+    def value(self) -> float:
+        return self._rsi(self._avg_gain, self._avg_loss) if self._count >= self.period else NAN
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        self._avg_gain, self._avg_loss = self._step(close)
+        self._prev_close = close
+        self._count += 1
+        return self.value
+
+    def peek(self, close: float) -> float:
+        if self._count + 1 < self.period:
+            return NAN
+        return self._rsi(*self._step(float(close)))
+
+
+class ATR(StreamingIndicator):
+    """
+    Average true range. ``wilder=True`` smooths with Wilder's EMA (``ATREngine.calculate_atr``,
+    before rounding); ``wilder=False`` uses a simple rolling mean (``ZoneEngine.calculate_atr``).
+    """
+
+    __slots__ = ("_avg", "_prev_close")
+
+    def __init__(self, period: int = 14, wilder: bool = True):
+        self._avg = EMA(alpha=1.0 / period) if wilder else RollingMean(period)
+        self._prev_close = NAN
+
+    def seed(self, high: Iterable[float], low: Iterable[float], close: Iterable[float]) -> "ATR":
+        high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+        prev = np.concatenate(([NAN], close[:-1]))
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+        self._avg.seed(tr)
+        self._prev_close = float(close[-1]) if len(close) else NAN
+        return self
+
+    def true_range(self, high: float, low: float) -> float:
+        tr = high - low
+        pc = self._prev_close
+        if pc == pc:
+            tr = max(tr, abs(high - pc), abs(low - pc))
+        return tr
+
+    @property
+    def value(self) -> float:
+        return self._avg.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        value = self._avg.update(self.true_range(float(high), float(low)))
+        self._prev_close = float(close)
+        return value
+
+    def peek(self, high: float, low: float, close: float = NAN) -> float:
+        return self._avg.peek(self.true_range(float(high), float(low)))
+
+
+class ADX(StreamingIndicator):
+    """
+    Average directional index as computed by ``InsightEngine.get_adx``: rolling-mean smoothing of
+    true range and directional movement, and a rolling mean of DX. NaN until ``2 * period - 1``
+    bars have been seen.
+    """
+
+    __slots__ = ("_tr", "_plus", "_minus", "_dx", "_prev_high", "_prev_low", "_prev_close")
+
+    def __init__(self, period: int = 14):
+        self._tr = RollingMean(period)
+        self._plus = RollingMean(period)
+        self._minus = RollingMean(period)
+        self._dx = RollingMean(period)
+        self._prev_high = self._prev_low = self._prev_close = NAN
+
+    def seed(self, high: Iterable[float], low: Iterable[float], close: Iterable[float]) -> "ADX":
+        self.__init__(self._tr.window)
+        for h, l, c in zip(*(np.asarray(a, dtype=float) for a in (high, low, close))):
+            self.update(h, l, c)
+        return self
+
+    def _moves(self, high: float, low: float) -> Tuple[float, float, float]:
+        plus = high - self._prev_high
+        minus = low - self._prev_low
+        if plus < 0 or plus < abs(minus):
+            plus = 0.0
+        minus = abs(minus)
+        if minus < plus:
+            minus = 0.0
+        tr = high - low
+        pc = self._prev_close
+        if pc == pc:
+            tr = max(tr, abs(high - pc), abs(low - pc))
+        return tr, plus, minus
+
+    @staticmethod
+    def _dx_of(tr_mean: float, plus_mean: float, minus_mean: float) -> float:
+        plus_di = 100 * _div(plus_mean, tr_mean)
+        minus_di = 100 * _div(minus_mean, tr_mean)
+        return 100 * _div(abs(plus_di - minus_di), plus_di + minus_di)
+
+    @property
+    def value(self) -> float:
+        return self._dx.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low = float(high), float(low)
+        tr, plus, minus = self._moves(high, low)
+        dx = self._dx_of(self._tr.update(tr), self._plus.update(plus), self._minus.update(minus))
+        self._prev_high, self._prev_low, self._prev_close = high, low, float(close)
+        return self._dx.update(dx)
+
+    def peek(self, high: float, low: float, close: float = NAN) -> float:
+        tr, plus, minus = self._moves(float(high), float(low))
+        dx = self._dx_of(self._tr.peek(tr), self._plus.peek(plus), self._minus.peek(minus))
+        return self._dx.peek(dx)
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from app.engine.pivots import consolidate_levels, pivot_mask
+
 class SwingEngine:
     @staticmethod
     def get_swings(df: pd.DataFrame, window: int = 2):
@@ -10,39 +12,20 @@ class SwingEngine:
         """
         highs = df['high'].values
         lows = df['low'].values
-        
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(df) - window):
-            # Check for Swing High
-            is_high = True
-            for j in range(1, window + 1):
-                if highs[i] <= highs[i-j] or highs[i] <= highs[i+j]:
-                    is_high = False
-                    break
-            if (is_high):
-                swing_highs.append({
-                    'index': int(i), 
-                    'price': float(highs[i]), 
-                    'time': str(df.index[i]),
-                    'volume': int(df['volume'].iloc[i])
-                })
-                
-            # Check for Swing Low
-            is_low = True
-            for j in range(1, window + 1):
-                if lows[i] >= lows[i-j] or lows[i] >= lows[i+j]:
-                    is_low = False
-                    break
-            if is_low:
-                swing_lows.append({
-                    'index': int(i), 
-                    'price': float(lows[i]), 
-                    'time': str(df.index[i]),
-                    'volume': int(df['volume'].iloc[i])
-                })
-                
+
+        def _swings(values, mask):
+            idx = np.flatnonzero(mask)
+            if not len(idx):
+                return []
+            times = df.index[idx]
+            volumes = df['volume'].values[idx]
+            return [
+                {'index': int(i), 'price': float(values[i]), 'time': str(t), 'volume': int(v)}
+                for i, t, v in zip(idx, times, volumes)
+            ]
+
+        swing_highs = _swings(highs, pivot_mask(highs, window, high=True, skip_nan=True))
+        swing_lows = _swings(lows, pivot_mask(lows, window, high=False, skip_nan=True))
         return swing_highs, swing_lows
 
     @staticmethod
@@ -60,7 +43,7 @@ class SwingEngine:
         window = window_map.get(tf, 5)
 
         # Limit to last 200 candles for structure
-        df_slice = df.tail(200).copy()
+        df_slice = df.tail(200)
 
         # Need at least 2*window+1 candles to detect any pivot
         if len(df_slice) < (2 * window + 1):
@@ -68,33 +51,12 @@ class SwingEngine:
 
         sh, sl = SwingEngine.get_swings(df_slice, window=window)
 
-        all_pivots = sh + sl
-        levels = []
-
-        for p in all_pivots:
-            levels.append({'price': p['price'], 'type': 'SWING_PIVOT'})
-
+        levels = [p['price'] for p in sh + sl]
         if not levels: return [], []
 
-        levels.sort(key=lambda x: x['price'])
-        consolidated = []
-        current_group = [levels[0]]
-
         # Use wider consolidation for higher TFs (2% for weekly/monthly, 1% for intraday)
         consolidation_pct = 0.02 if tf in ('1W', '1M') else 0.015 if tf in ('1D', '4H', '3H', '2H', '1H') else 0.01
-
-        for i in range(1, len(levels)):
-            gap = (levels[i]['price'] - current_group[-1]['price']) / current_group[-1]['price']
-            if gap < consolidation_pct:
-                current_group.append(levels[i])
-            else:
-                avg_price = sum(l['price'] for l in current_group) / len(current_group)
-                consolidated.append({'price': avg_price})
-                current_group = [levels[i]]
-
-        if current_group:
-            avg_price = sum(l['price'] for l in current_group) / len(current_group)
-            consolidated.append({'price': avg_price})
+        consolidated = [{'price': price} for price, _ in consolidate_levels(levels, consolidation_pct)]
 
         cmp = df['close'].iloc[-1]
         supports = [{'price': l['price'], 'visits': 1, 'timeframe': tf} for l in consolidated if l['price'] < cmp]
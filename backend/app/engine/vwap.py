@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
+from app.engine.batch import BatchIndicatorEngine
+
 class VWAPEngine:
     @staticmethod
     def calculate_vwap(df: pd.DataFrame, timeframe: str = "15m") -> pd.Series:
@@ -13,39 +15,25 @@ class VWAPEngine:
         if df is None or df.empty:
             return pd.Series(dtype=float)
             
-        df = df.copy()
-        
-        # Calculate Typical Price
-        df['typical_price'] = (df['high'] + df['low'] + df['close']) / 3.0
-        df['pv'] = df['typical_price'] * df['volume']
-        
-        is_intraday = timeframe in ["5m", "15m", "1H"] or ("m" in str(timeframe) or "h" in str(timeframe).lower())
-        
-        # Ensure DatetimeIndex for groupings
-        if not isinstance(df.index, pd.DatetimeIndex):
+        index = df.index
+        # Ensure DatetimeIndex for session grouping
+        if not isinstance(index, pd.DatetimeIndex):
             try:
-                df.index = pd.to_datetime(df.index)
+                index = pd.to_datetime(index)
             except Exception:
                 pass
-                
-        if is_intraday and isinstance(df.index, pd.DatetimeIndex):
-            # Session-resetting VWAP (group by date)
-            df['date'] = df.index.date
-            cum_pv = df.groupby('date')['pv'].cumsum()
-            cum_vol = df.groupby('date')['volume'].cumsum()
-            vwap = cum_pv / cum_vol.replace(0, np.nan)
-            vwap = vwap.ffill().bfill()
-        else:
-            # Daily/Weekly rolling VWAP (e.g., 20-day rolling window)
-            window = min(20, len(df))
-            rolling_pv = df['pv'].rolling(window=window).sum()
-            rolling_vol = df['volume'].rolling(window=window).sum()
-            vwap = rolling_pv / rolling_vol.replace(0, np.nan)
-            # Fallback for initial bars
-            fallback = df['pv'].cumsum() / df['volume'].cumsum().replace(0, np.nan)
-            vwap = vwap.fillna(fallback).ffill().bfill()
-            
-        return vwap.round(2)
+
+        prices, _, _ = BatchIndicatorEngine.stack([df])
+        # Intraday VWAP resets each session; daily/weekly bars use a rolling 20-period VWAP
+        sessions = None
+        if VWAPEngine.is_intraday(timeframe):
+            keys = BatchIndicatorEngine.session_keys(index)
+            sessions = keys[None, :] if keys is not None else None
+        return pd.Series(BatchIndicatorEngine.vwap(prices, sessions)[0], index=index)
+
+    @staticmethod
+    def is_intraday(timeframe: str) -> bool:
+        return timeframe in ["5m", "15m", "1H"] or ("m" in str(timeframe) or "h" in str(timeframe).lower())
 
     @staticmethod
     def evaluate_vwap_state(df: pd.DataFrame, vwap_series: pd.Series) -> Dict[str, Any]:
@@ -1,16 +1,42 @@
 import numpy as np
 import pandas as pd
 
+from app.engine.indicator_context import IndicatorContext
+
 class ZoneEngine:
     @staticmethod
     def calculate_atr(df: pd.DataFrame, period: int = 14):
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        return true_range.rolling(window=period).mean()
+        return IndicatorContext.of(df).get(("atr", period), lambda: ZoneEngine._atr(df, period))
+
+    @staticmethod
+    def _atr(df: pd.DataFrame, period: int):
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        prev_close = np.concatenate(([np.nan], df['close'].to_numpy(dtype=float)[:-1]))
+
+        # fmax skips the missing previous close on the first bar, like a row-wise max
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return pd.Series(true_range, index=df.index).rolling(window=period).mean()
+
+    @staticmethod
+    def _trailing_mean(values, window: int):
+        """
+        ``series.iloc[max(0, i - window):i].mean()`` for every bar i (NaNs skipped), summed the same
+        way pandas does so thresholds compare identically.
+        """
+        values = np.asarray(values)
+        n = len(values)
+        out = np.full(n, np.nan)
+        missing = np.isnan(values) if values.dtype.kind == 'f' else np.zeros(n, dtype=bool)
+        filled = np.where(missing, 0, values).astype(np.float64)
+        counts = np.concatenate(([0], np.cumsum(~missing)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for i in range(1, min(window, n - 1) + 1):
+                out[i] = filled[:i].sum() / counts[i]
+            if n > window:
+                sums = np.lib.stride_tricks.sliding_window_view(filled[:-1], window).sum(axis=1)
+                out[window:] = sums / (counts[window:n] - counts[:n - window])
+        return out
 
     @staticmethod
     def cluster_swings(swings: list, atr: float, factor: float = 0.5):
@@ -70,91 +96,59 @@ class ZoneEngine:
         Impulse: Body > 1.5 ATR, Break, Close near extreme
         Merge overlapping zones (>50%)
         """
-        df_slice = df.tail(200).copy()
+        df_slice = df.tail(200)
         if df_slice.empty: return []
 
-        atr_series = ZoneEngine.calculate_atr(df_slice)
+        atr = ZoneEngine.calculate_atr(df_slice).to_numpy()
         zones = []
         
         closes = df_slice['close'].values
         opens = df_slice['open'].values
         highs = df_slice['high'].values
         lows = df_slice['low'].values
-        
-        # Iterate to find Impulse (Leg-Out)
+        volumes = df_slice['volume'].values
+        n = len(df_slice)
+
+        def lag(values, k):
+            return np.concatenate((np.full(k, np.nan), values[:-k]))[:n]
+
+        # 1. Impulse (Leg-Out) masks over every bar
+        body = np.abs(closes - opens)
+        range_len = highs - lows
+        is_bullish = closes > opens
+        with np.errstate(invalid='ignore'):
+            # Impulse body > 0.75 ATR; volume > 0.8x avg of the (up to) 20 prior bars
+            is_impulse = body > 0.75 * atr
+            vol_valid = volumes > 0.8 * ZoneEngine._trailing_mean(volumes, 20)
+            # Strong close (within 40% of the extreme) that breaks the previous candle
+            strong_close = np.where(is_bullish, (highs - closes) <= 0.4 * range_len, (closes - lows) <= 0.4 * range_len)
+            break_prev = np.where(is_bullish, closes > lag(highs, 1), closes < lag(lows, 1))
+
+            # 2. Base: the two candles before the impulse under 1.2x the prior bar's ATR (optionally a third)
+            base_limit = 1.2 * lag(atr, 1)
+            valid_base = (lag(body, 1) < base_limit) & (lag(body, 2) < base_limit)
+            three_bar_base = lag(body, 3) < base_limit
+
+        candidates = is_impulse & vol_valid & (range_len != 0) & strong_close & break_prev & valid_base
         # Check from index 3 to ensure space for Base (min 2 candles)
-        for i in range(3, len(df_slice)):
-            current_atr = atr_series.iloc[i]
-            body_size = abs(closes[i] - opens[i])
-            
-            # 1. Impulse Check (Further Relaxed to 0.75)
-            is_impulse = body_size > 0.75 * current_atr
-            
-            # Volume Confirmation: > 0.8x Avg Volume (Relaxed from 1.0)
-            avg_vol = df_slice['volume'].iloc[i-20:i].mean() if i > 20 else df_slice['volume'].iloc[:i].mean()
-            vol_valid = df_slice['volume'].iloc[i] > 0.8 * avg_vol
-            
-            if not is_impulse or not vol_valid: continue
-
-            is_bullish = closes[i] > opens[i]
-            
-            # Check for strong close
-            range_len = highs[i] - lows[i]
-            if range_len == 0: continue
+        candidates[:3] = False
+
+        # 3. Construct Zone
+        # Demand: Proximal = Highest Body in Base, Distal = Lowest Low in Base
+        # Supply: Proximal = Lowest Body in Base, Distal = Highest High in Base
+        for i in np.flatnonzero(candidates).tolist():
+            base_start = i - 3 if three_bar_base[i] else i - 2
+            base_highs = highs[base_start:i]
+            base_lows = lows[base_start:i]
+            base_closes = closes[base_start:i]
+            base_opens = opens[base_start:i]
             
-            strong_close = False
-            if is_bullish:
-                # Relaxed close from 0.3 -> 0.4
-                strong_close = (highs[i] - closes[i]) <= (0.4 * range_len)
-                break_prev = closes[i] > highs[i-1]
-            else:
-                strong_close = (closes[i] - lows[i]) <= (0.4 * range_len)
-                break_prev = closes[i] < lows[i-1]
-                
-            if not (strong_close and break_prev): continue
-
-            # 2. Base Check
-            # Relaxed base max candle size to 1.2 ATR
-            base_candles = []
-            valid_base = False
-            
-            c1_body = abs(closes[i-1] - opens[i-1])
-            c2_body = abs(closes[i-2] - opens[i-2])
-            atr_prev = atr_series.iloc[i-1]
-            
-            if c1_body < 1.2 * atr_prev and c2_body < 1.2 * atr_prev:
-                base_start = i-2
-                base_end = i-1
-                valid_base = True
-                
-                c3_body = abs(closes[i-3] - opens[i-3])
-                if c3_body < 1.2 * atr_prev:
-                    base_start = i-3
-            
-            if not valid_base: continue
-
-            # 3. Construct Zone
-            # Demand: Base Low to Base High (or highest body of base)
-            # Supply: Base Low to Base High
-            # Actually, standard is:
-            # Demand: Proximal = Highest Body in Base, Distal = Lowest Low in Base
-            # Supply: Proximal = Lowest Body in Base, Distal = Highest High in Base
-            
-            base_highs = highs[base_start:base_end+1]
-            base_lows = lows[base_start:base_end+1]
-            base_closes = closes[base_start:base_end+1]
-            base_opens = opens[base_start:base_end+1]
-            
-            if is_bullish:
-                # Demand
+            if is_bullish[i]:
                 distal = min(base_lows)
-                # Proximal is highest body top (max(open, close))
                 proximal = max([max(o, c) for o, c in zip(base_opens, base_closes)])
                 z_type = 'DEMAND'
             else:
-                # Supply
                 distal = max(base_highs)
-                # Proximal is lowest body bottom (min(open, close))
                 proximal = min([min(o, c) for o, c in zip(base_opens, base_closes)])
                 z_type = 'SUPPLY'
                 
@@ -220,55 +214,37 @@ class ZoneEngine:
         final_zones = merged_demands + merged_supplies
         
         # 5. Process Invalidation & Freshness (Scan Forward)
-        # We need to map zones back to the full timeframe or scan from creation index
-        # For simplicity in this slice, we scan from creation_idx to end
+        # Every zone is checked against the bars after its creation index in one pass.
+        # Note: merged zones keep the creation index of the first zone in the group
+        c_idx = np.array([z.get('creation_idx', 0) for z in final_zones])
+        z_high = np.array([z['price_high'] for z in final_zones], dtype=float)
+        z_low = np.array([z['price_low'] for z in final_zones], dtype=float)
+        is_demand = np.array([z['type'] == 'DEMAND' for z in final_zones])
+
+        # Violation: any later close beyond the distal - min/max of closes from each bar onwards
+        later_min = np.fmin.accumulate(closes[::-1])[::-1]
+        later_max = np.fmax.accumulate(closes[::-1])[::-1]
+        first_after = np.minimum(c_idx + 1, n - 1)
+        has_after = c_idx + 1 < n
+        violated = has_after & np.where(is_demand, later_min[first_after] < z_low, later_max[first_after] > z_high)
+
+        # Touches: only new entries into the zone count; bars up to creation count as inside
+        after = np.arange(n) > c_idx[:, None]
+        inside = np.where(is_demand[:, None], lows <= z_high[:, None], highs >= z_low[:, None])
+        inside = np.where(after, inside, True)
+        touches = (inside[:, 1:] & ~inside[:, :-1]).sum(axis=1)
+
         active_zones = []
-        
-        for z in final_zones:
-            # Creation index in the slice
-            # Note: merged zones might have multiple creation indices, we take the latest or approx
-            c_idx = z.get('creation_idx', 0)
-            
-            # Scan price action after creation
-            is_valid = True
-            touches = 0
-            in_zone = True # Starts in zone after impulse/base usually
-            
-            for i in range(c_idx + 1, len(df_slice)):
-                row = df_slice.iloc[i]
-                
-                if z['type'] == 'DEMAND':
-                    # Violation: Close below distal (low)
-                    if row['close'] < z['price_low']:
-                        is_valid = False
-                        break
-                    
-                    # Touch logic: Only count new entries into the zone
-                    currently_in = row['low'] <= z['price_high']
-                    if currently_in and not in_zone:
-                        touches += 1
-                    in_zone = currently_in
-                        
-                elif z['type'] == 'SUPPLY':
-                    # Violation: Close above distal (high)
-                    if row['close'] > z['price_high']:
-                        is_valid = False
-                        break
-                    
-                    # Touch logic: Only count new entries into the zone
-                    currently_in = row['high'] >= z['price_low']
-                    if currently_in and not in_zone:
-                        touches += 1
-                    in_zone = currently_in
-            
-            z['touches'] = touches
-            z['last_touched'] = str(df_slice.index[-1])
+        last_bar = str(df_slice.index[-1])
+        for k, z in enumerate(final_zones):
+            z['touches'] = int(touches[k])
+            z['last_touched'] = last_bar
             
             # Filter: Exclude if invalid or too many touches
-            if is_valid and touches < 3:
+            if not violated[k] and touches[k] < 3:
                 # 6. Time Decay
                 # If older than 150 candles, reduce strength
-                age = len(df_slice) - c_idx
+                age = n - int(c_idx[k])
                 if age > 150:
                      z['strength'] *= 0.5
                 
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class Topics:
+    """Event topics shared by producers and consumers."""
+    TICKS = "sfmos.ticks"
+    SIGNALS = "sfmos.signals"
+    ALERTS = "sfmos.alerts"
+    SCANNER = "sfmos.scanner"
+    BREAKOUTS = "sfmos.breakouts"
+
+
+class Subscription:
+    """
+    Bounded event buffer for one subscriber of one topic.
+
+    Overflow policies:
+      - ``DROP_OLDEST``: evict the oldest buffered event to make room (default).
+      - ``DROP_NEWEST``: discard the incoming event.
+      - ``COALESCE``: keep only the latest event per ``key(event)``, in first-arrival order,
+        so a slow consumer sees the newest state of each key instead of a backlog.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+    POLICIES = (DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+    def __init__(self, topic: str, maxsize: int = 1000, policy: str = DROP_OLDEST,
+                 key: Optional[Callable[[Any], Hashable]] = None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if policy == self.COALESCE and key is None:
+            raise ValueError("COALESCE subscriptions need a key function")
+        self.topic = topic
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self._buffer: Any = OrderedDict() if policy == self.COALESCE else deque()
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def put(self, event: Any) -> None:
+        """Buffers ``event`` without blocking, applying the overflow policy."""
+        if self.policy == self.COALESCE:
+            k = self.key(event)
+            if k in self._buffer:
+                self._buffer[k] = event
+                self.coalesced += 1
+                return
+            if len(self._buffer) >= self.maxsize:
+                self._buffer.popitem(last=False)
+                self.dropped += 1
+            self._buffer[k] = event
+        else:
+            if len(self._buffer) >= self.maxsize:
+                if self.policy == self.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(event)
+        self._ready.set()
+
+    def drain(self, max_items: int) -> List[Any]:
+        """Removes and returns up to ``max_items`` buffered events, oldest first."""
+        batch = []
+        buffer = self._buffer
+        while buffer and len(batch) < max_items:
+            batch.append(buffer.popitem(last=False)[1] if self.policy == self.COALESCE else buffer.popleft())
+        if not buffer:
+            self._ready.clear()
+        self.delivered += len(batch)
+        return batch
+
+    async def get_batch(self, max_items: int = 100, linger: float = 0.0) -> List[Any]:
+        """
+        Waits for at least one event, then returns up to ``max_items``. With ``linger`` it waits
+        that long after the first event so a burst is delivered as one batch.
+        """
+        while not self._buffer:
+            await self._ready.wait()
+        if linger and len(self._buffer) < max_items:
+            await asyncio.sleep(linger)
+        return self.drain(max_items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"topic": self.topic, "policy": self.policy, "buffered": len(self._buffer),
+                "delivered": self.delivered, "dropped": self.dropped, "coalesced": self.coalesced}
+
+
+class EventBus(ABC):
+    """
+    Topic-based async pub/sub.
+
+    Subscribers get their own bounded ``Subscription`` buffer, so a slow consumer only ever
+    drops or coalesces its own events and never blocks producers or other consumers.
+    Backends differ only in how ``publish`` reaches subscribers: the in-process bus hands
+    events straight to ``_deliver``; a networked backend (e.g. Redis pub/sub) would send them
+    to the broker and call ``_deliver`` from its listener, reusing the buffering here.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self.published = 0
+
+    @abstractmethod
+    async def publish(self, topic: str, event: Any) -> None:
+        """Sends ``event`` to every subscriber of ``topic``."""
+
+    def _deliver(self, topic: str, event: Any) -> None:
+        self.published += 1
+        for sub in self._subscriptions.get(topic, ()):
+            sub.put(event)
+
+    def subscribe(self, topic: str, maxsize: int = 1000, policy: str = Subscription.DROP_OLDEST,
+                  key: Optional[Callable[[Any], Hashable]] = None) -> Subscription:
+        sub = Subscription(topic, maxsize=maxsize, policy=policy, key=key)
+        self._subscriptions.setdefault(topic, []).append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subscriptions.get(sub.topic, [])
+        if sub in subs:
+            subs.remove(sub)
+
+    def consume(self, topic: str, handler: Callable[[List[Any]], Awaitable[None]], batch_size: int = 100,
+                linger: float = 0.0, **subscribe_kwargs) -> "asyncio.Task":
+        """
+        Subscribes to ``topic`` and starts a task that calls ``await handler(batch)`` for each
+        batch of up to ``batch_size`` events. Handler errors are logged and consumption goes on;
+        cancelling the task unsubscribes.
+        """
+        sub = self.subscribe(topic, **subscribe_kwargs)
+
+        async def _run():
+            try:
+                while True:
+                    batch = await sub.get_batch(batch_size, linger)
+                    try:
+                        await handler(batch)
+                    except Exception as e:
+                        print(f"[EventBus] Consumer of {topic} failed on a batch of {len(batch)}: {e}", flush=True)
+            finally:
+                self.unsubscribe(sub)
+
+        return asyncio.create_task(_run(), name=f"consume:{topic}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "published": self.published,
+            "subscriptions": [sub.stats() for subs in self._subscriptions.values() for sub in subs],
+        }
+
+
+class InProcessEventBus(EventBus):
+    """Single-process backend: publishing buffers the event for local subscribers immediately."""
+
+    async def publish(self, topic: str, event: Any) -> None:
+        self._deliver(topic, event)
+
+
+_event_bus: EventBus = InProcessEventBus()
+
+
+def get_event_bus() -> EventBus:
+    return _event_bus
+
+
+def set_event_bus(bus: EventBus) -> None:
+    """Swaps the process-wide bus (e.g. for a Redis-backed one); call before consumers start."""
+    global _event_bus
+    _event_bus = bus
@@ -5,20 +5,68 @@ import logging
 from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 
 from app.services.candle_builder import CandleBuilder
 from app.services.market_data import MarketDataService
 from app.services.database_service import DatabaseService
 from app.engine.breakout import BreakoutEngine
-from app.engine.regime import MarketRegimeEngine
-from app.engine.sector_rotation import SectorRotationEngine
-from app.cache.redis_manager import RedisManager
+from app.engine.streaming import ADX, ATR, RollingMean, WilderRSI
+from app.services.market_context_service import MarketContextService, MarketContextSnapshot
+from app.events.bus import EventBus, Topics, get_event_bus
 
 # Setup structured logger
 logger = logging.getLogger("SFMOS.BreakoutScanner")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 
+class GateIndicators:
+    """
+    Streaming daily indicators behind the breakout gates for one symbol.
+
+    The kernels hold the completed 1D candles of the symbol's candle ring; gates ``peek`` them
+    with the in-progress candle, so a tick costs O(1) instead of re-reading 200-bar windows.
+    ``sync`` keeps them in step with the ring: a newly completed candle is folded in with
+    ``update``, anything else (first use, re-seed, several candles at once) reseeds them.
+    """
+
+    def __init__(self):
+        self.dma_20 = RollingMean(20)
+        self.dma_50 = RollingMean(50)
+        self.dma_200 = RollingMean(200)
+        self.volume_20 = RollingMean(20)
+        self.rsi = WilderRSI(14)
+        self.atr = ATR(14)
+        self.adx = ADX(14)
+        self.last_time: Optional[int] = None  # epoch ns of the last completed candle folded in
+
+    def sync(self, times: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+             volumes: np.ndarray) -> None:
+        """Brings the kernels up to the completed candles given (all rows but the live one)."""
+        n = len(times)
+        if not n:
+            self.__init__()
+            return
+        last = int(times[-1])
+        if last == self.last_time:
+            return
+        if n > 1 and int(times[-2]) == self.last_time:
+            high, low, close, volume = float(highs[-1]), float(lows[-1]), float(closes[-1]), float(volumes[-1])
+            for ma in (self.dma_20, self.dma_50, self.dma_200):
+                ma.update(close)
+            self.volume_20.update(volume)
+            self.rsi.update(close)
+            self.atr.update(high, low, close)
+            self.adx.update(high, low, close)
+        else:
+            for ma in (self.dma_20, self.dma_50, self.dma_200):
+                ma.seed(closes)
+            self.volume_20.seed(volumes)
+            self.rsi.seed(closes)
+            self.atr.seed(highs, lows, closes)
+            self.adx.seed(highs, lows, closes)
+        self.last_time = last
+
+
 class BreakoutScanner:
     """
     SFM-OS Event-Driven Real-Time Scanning & Breakout Service.
@@ -26,12 +74,15 @@ class BreakoutScanner:
     Applies strict multi-gate validation rules on incremental rolling tick streams.
     """
     
-    def __init__(self, redis_manager: RedisManager):
-        self.redis_manager = redis_manager
+    def __init__(self, event_bus: Optional[EventBus] = None):
+        self.event_bus = event_bus or get_event_bus()
         self.candle_builder = CandleBuilder(max_history_len=200)
         self.is_seeding_complete = False
         self._lock = asyncio.Lock()
         
+        # Streaming gate indicators per symbol, kept in step with the 1D candle ring
+        self._indicators: Dict[str, GateIndicators] = {}
+
         # Track previously triggered breakout signals to prevent duplicate spam
         # { symbol: { signal_type: timestamp } }
         self._triggered_signals: Dict[str, Dict[str, datetime]] = {}
@@ -101,54 +152,84 @@ class BreakoutScanner:
         """
         Consumes a live broker tick. Updates candle intervals and triggers incremental breakout validations.
         """
+        signals = await self.on_ticks([symbol], [price], [volume], [CandleBuilder.epoch_ns(timestamp)])
+        return signals[0] if signals else None
+
+    async def on_ticks(self, symbols: Sequence[str], prices: Sequence[float], volumes: Sequence[float],
+                       epoch_ns: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Consumes a batch of live broker ticks as parallel arrays in arrival order.
+        Candles are updated in bulk, then the gates run once per symbol on its latest state.
+        Returns the breakout payloads generated by the batch.
+        """
         if not self.is_seeding_complete:
             await self.initialize_and_seed()
-            
-        clean_symbol = symbol.replace(".NS", "").replace(".BO", "")
-        
-        # 1. Update rolling candles (Process Tick incrementally)
-        completed_candles = await self.candle_builder.process_tick(clean_symbol, price, volume, timestamp)
-        
-        # Evaluate scans whenever a tick updates the current rolling daily candle
-        # In a production environment, we scan continuously on tick to trigger real-time breakouts
-        df_daily = self.candle_builder.get_history_df(clean_symbol, "1D")
-        if df_daily is None or len(df_daily) < 30:
-            return None
-            
-        # Run validations
-        try:
-            return await self._evaluate_gates(clean_symbol, df_daily, timestamp)
-        except Exception as e:
-            logger.error(f"Error during validation gates for {clean_symbol}: {e}")
-            import traceback; traceback.print_exc()
-            return None
+        if not len(symbols):
+            return []
+
+        clean = {s: s.replace(".NS", "").replace(".BO", "") for s in set(symbols)}
+        clean_symbols = [clean[s] for s in symbols]
+
+        # 1. Update rolling candles for the whole batch
+        completed = self.candle_builder.process_ticks(clean_symbols, prices, volumes, epoch_ns)
+        if any(candles for sym, candles in completed.items() if MarketContextService.is_index_symbol(sym)):
+            # An index bar closed: recompute regime/sector context in the background
+            MarketContextService.request_refresh()
+        context = MarketContextService.current()
+        if context is None:
+            context = await asyncio.to_thread(MarketContextService.get_snapshot)
+        else:
+            context = MarketContextService.get_snapshot()
+
+        # 2. Evaluate scans once per symbol, stamped with its last tick in the batch
+        last_tick = dict(zip(clean_symbols, np.asarray(epoch_ns, dtype=np.int64).tolist()))
+        signals = []
+        for clean_symbol, tick_ns in last_tick.items():
+            df_daily = self.candle_builder.get_history_df(clean_symbol, "1D")
+            if df_daily is None or len(df_daily) < 30:
+                continue
+            timestamp = datetime.fromtimestamp(tick_ns / 1e9, tz=timezone.utc)
+            try:
+                signal = await self._evaluate_gates(clean_symbol, df_daily, timestamp, context)
+            except Exception as e:
+                logger.error(f"Error during validation gates for {clean_symbol}: {e}")
+                import traceback; traceback.print_exc()
+                continue
+            if signal:
+                signals.append(signal)
+        return signals
 
-    async def _evaluate_gates(self, symbol: str, df_daily: pd.DataFrame, timestamp: datetime) -> Optional[Dict[str, Any]]:
+    async def _evaluate_gates(self, symbol: str, df_daily: pd.DataFrame, timestamp: datetime,
+                              context: Optional[MarketContextSnapshot] = None) -> Optional[Dict[str, Any]]:
         """
         Executes strict multi-gate compliance validation (Golden Rules 1 to 10).
+        The last row of ``df_daily`` is the in-progress candle.
         """
-        # Ensure standardized column cases (Capitalized for BreakoutEngine compatibility)
-        df_daily = df_daily.copy()
-        df_daily.columns = [c.capitalize() for c in df_daily.columns]
-        
-        last_row = df_daily.iloc[-1]
-        close = float(last_row["Close"])
-        high = float(last_row["High"])
-        low = float(last_row["Low"])
-        volume = float(last_row["Volume"])
-        
-        # Calculate moving averages
-        dma_20 = float(df_daily["Close"].rolling(20).mean().iloc[-1])
-        dma_50 = float(df_daily["Close"].rolling(50).mean().iloc[-1])
-        dma_200 = float(df_daily["Close"].rolling(200).mean().iloc[-1])
-        avg_vol_20d = float(df_daily["Volume"].rolling(20).mean().iloc[-1])
-        
-        # Calculate weekly RSI baseline (estimated daily roll)
-        delta = df_daily["Close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean().iloc[-1]
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean().iloc[-1]
-        rs = gain / loss if loss > 0 else 0
-        rsi = 100 - (100 / (1 + rs)) if loss > 0 else 100
+        # Plain numpy arithmetic on the candle buffer (column names matched case-insensitively)
+        columns = {str(c).lower(): c for c in df_daily.columns}
+        highs, lows, closes, volumes = (
+            df_daily[columns[field]].to_numpy(dtype=float) for field in ("high", "low", "close", "volume")
+        )
+        close = float(closes[-1])
+        high = float(highs[-1])
+        low = float(lows[-1])
+        volume = float(volumes[-1])
+
+        indicators = self._indicators.get(symbol)
+        if indicators is None:
+            indicators = self._indicators[symbol] = GateIndicators()
+        indicators.sync(df_daily.index.asi8[:-1], highs[:-1], lows[:-1], closes[:-1], volumes[:-1])
+
+        # Moving averages, volume baseline, RSI, ATR and ADX as of the live candle
+        dma_20 = indicators.dma_20.peek(close)
+        dma_50 = indicators.dma_50.peek(close)
+        dma_200 = indicators.dma_200.peek(close)
+        avg_vol_20d = indicators.volume_20.peek(volume)
+        rsi = indicators.rsi.peek(close)
+        if rsi != rsi:
+            rsi = 100.0  # No losses in the window
+        atr = indicators.atr.peek(high, low)
+        adx = indicators.adx.peek(high, low)
         
         # Check Earnings Gateway T-3 Exclusion (Golden Rule 6)
         # Mock earnings query - defaults to 45 days (safe zone) unless queried
@@ -160,15 +241,10 @@ class BreakoutScanner:
         # --------------------------------------------------------
         # GATE 1: MARKET REGIME ENGINE (Rule 9 Control Gates)
         # --------------------------------------------------------
-        # Fetch indices parameters dynamically
-        try:
-            from app.services.screener_service import ScreenerService
-            regime_data = ScreenerService._calculate_market_regime("1D")
-        except Exception:
-            # Safe defensive fallback if market data service fails
-            regime_data = {"regime": "DEFENSIVE MARKET", "score": 45, "min_score_gate": 80}
-            
-        regime_state = regime_data.get("regime", "DEFENSIVE MARKET")
+        # Read from the cached market context snapshot (refreshed on a schedule, not per tick)
+        if context is None:
+            context = MarketContextService.get_snapshot()
+        regime_state = context.regime_state
         
         # BEAR MARKET LOCK
         if "BEAR" in regime_state:
@@ -178,22 +254,9 @@ class BreakoutScanner:
         # --------------------------------------------------------
         # GATE 2: SECTOR ROTATION VALIDATION (Rule 1 Alignment)
         # --------------------------------------------------------
-        try:
-            from app.services.constituent_service import ConstituentService
-            sector_key = ConstituentService.get_sector_for_ticker(symbol) or "UNKNOWN"
-            sector_clean = sector_key.replace("NIFTY_", "")
-            
-            # Fetch active leading sectors
-            sector_scores = ScreenerService._calculate_sector_rotation("1D")
-            active_sectors_list = SectorRotationEngine.get_focus_sectors(sector_scores)
-            active_sector_names = [s["theme"].replace("_HEALTHCARE", "").replace("_AUTOMATION", "").replace("_AEROSPACE", "") for s in active_sectors_list]
-            
-            is_active_sector = any(act in sector_clean for act in active_sector_names)
-        except Exception as e:
-            logger.error(f"Sector retrieval error: {e}")
-            is_active_sector = True # Fallback to True to prevent structural lockouts
-            sector_clean = "EQUITIES"
-            
+        sector_clean = context.sector_of(symbol)
+        is_active_sector = context.is_active_sector(sector_clean)
+
         # Reject signals in neutral/defensive regimes if sector is inactive
         if not is_active_sector and ("DEFENSIVE" in regime_state or "NEUTRAL" in regime_state):
             logger.debug(f"GATE_REJECT: {symbol} rejected due to Inactive Sector Gate (Rule 1).")
@@ -207,7 +270,7 @@ class BreakoutScanner:
             return None # Consolidating below moving averages
             
         # 20-day high resistance pivot (excluding the current candle)
-        resistance_pivot = float(df_daily["High"].iloc[-21:-1].max())
+        resistance_pivot = float(np.nanmax(highs[-21:-1]))
         is_price_breakout = close > resistance_pivot
         if not is_price_breakout:
             return None # consolidated below pivot
@@ -229,7 +292,7 @@ class BreakoutScanner:
         # GATE 4: RISK-REWARD ENGINE (Rule 8 Hard Gates)
         # --------------------------------------------------------
         # Calculate dynamic stop loss placed 1.5% below prev day's low or maximum 5%
-        prev_low = float(df_daily["Low"].iloc[-2])
+        prev_low = float(lows[-2])
         stop_loss = max(prev_low * 0.985, close * 0.95)
         
         expected_upside_pct = 18.0 # Standard 18% breakout target expectation
@@ -293,18 +356,24 @@ class BreakoutScanner:
             "regime": regime_state.split()[0], # e.g. "BULL"
             "rr_ratio": float(round(rr_ratio, 2)),
             "ai_confidence": float(round(ai_score, 1)),
+            "rsi": float(round(rsi, 1)),
+            "atr": float(round(atr, 2)) if atr == atr else None,
+            "adx": float(round(adx, 1)) if adx == adx else None,
             "timestamp": now.isoformat(),
             "actionable": True
         }
         
-        # Publish events to Redis Pub/Sub channels concurrently
+        # Publish to the event bus; the WebSocket broadcaster and alert log consume from there
         logger.info(f"[!] FRESH BREAKOUT SIGNAL GENERATED: {symbol} @ {close:.2f} (AI Confidence: {ai_score}%)")
-        asyncio.create_task(self.redis_manager.publish("sfmos.breakouts", payload))
-        asyncio.create_task(self.redis_manager.publish("sfmos.alerts", {
+        await self.event_bus.publish(Topics.BREAKOUTS, payload)
+        await self.event_bus.publish(Topics.ALERTS, {
+            "symbol": symbol,
+            "alert_type": signal_type,
+            "price": payload["price"],
             "title": f"Fresh Breakout Alert: {symbol}",
             "message": f"Breakout confirmed at {close:.2f} with {vol_ratio:.1f}x volume surge. S/L set at {stop_loss:.2f}.",
             "timestamp": now.isoformat()
-        }))
+        })
         
         # Persist audit trail into the database asynchronously
         asyncio.create_task(self._audit_log_signal(symbol, signal_type, close, stop_loss, ai_score, regime_state))
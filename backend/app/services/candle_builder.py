@@ -1,150 +1,259 @@
 # backend/app/services/candle_builder.py
-import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 
+EPOCH = datetime(1970, 1, 1)
+
+
+class CandleRing:
+    """
+    Fixed-capacity candle window for one (symbol, timeframe).
+
+    OHLCV rows live in one preallocated ``(2 * capacity, 5)`` float64 array with a parallel
+    ``datetime64[ns]`` array of window starts. The window is the contiguous slice
+    ``[start, end)``; appending writes at ``end`` and rolling off the oldest candle just moves
+    ``start``. When ``end`` hits the end of the array the window is moved back to the front,
+    once every ``capacity`` appends, so append/roll is amortized O(1) and the window is always
+    a contiguous slice that ``frame()`` can wrap without copying.
+
+    When ``live`` is set the last row is the in-progress candle and is updated in place by ticks.
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ohlcv = np.empty((2 * capacity, len(self.FIELDS)))
+        self._times = np.empty(2 * capacity, dtype="datetime64[ns]")
+        self._start = 0
+        self._end = 0
+        self.live = False
+        self.live_window: Optional[int] = None  # epoch seconds of the in-progress candle
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+        self.live = False
+        self.live_window = None
+        self._frame = None
+
+    def append(self, time_ns: int, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        if self._end == len(self._ohlcv):
+            n = len(self)
+            self._ohlcv[:n] = self._ohlcv[self._start:self._end]
+            self._times[:n] = self._times[self._start:self._end]
+            self._start, self._end = 0, n
+        row = self._ohlcv[self._end]
+        row[0], row[1], row[2], row[3], row[4] = open_, high, low, close, volume
+        self._times[self._end] = time_ns
+        self._end += 1
+        if len(self) > self.capacity:
+            self._start += 1
+        self._frame = None
+
+    def open_candle(self, window: int, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        """Starts a new in-progress candle at ``window`` (epoch seconds)."""
+        self.append(window * 10**9, open_, high, low, close, volume)
+        self.live = True
+        self.live_window = window
+
+    def update(self, price: float, volume: float) -> None:
+        """Folds a tick into the in-progress candle."""
+        row = self._ohlcv[self._end - 1]
+        if price > row[1]:
+            row[1] = price
+        if price < row[2]:
+            row[2] = price
+        row[3] = price
+        row[4] += volume
+
+    def fold(self, high: float, low: float, close: float, volume: float) -> None:
+        """Folds an aggregated run of ticks into the in-progress candle."""
+        row = self._ohlcv[self._end - 1]
+        if high > row[1]:
+            row[1] = high
+        if low < row[2]:
+            row[2] = low
+        row[3] = close
+        row[4] += volume
+
+    def candle(self, i: int) -> Dict:
+        """Row ``i`` of the window as a candle dict."""
+        pos = (self._end if i < 0 else self._start) + i
+        o, h, l, c, v = self._ohlcv[pos].tolist()
+        return {"timestamp": pd.Timestamp(self._times[pos]).to_pydatetime(), "open": o, "high": h, "low": l, "close": c, "volume": v}
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Read-only DataFrame over the window, sharing memory with the buffer. It stays valid and
+        tracks in-place updates of the live candle until the window moves; ``.copy()`` it to keep
+        a snapshot across ticks.
+        """
+        if self._frame is None:
+            values = self._ohlcv[self._start:self._end]
+            values.flags.writeable = False
+            index = pd.DatetimeIndex(self._times[self._start:self._end], name="timestamp")
+            self._frame = pd.DataFrame(values, index=index, columns=list(self.FIELDS), copy=False)
+        return self._frame
+
+
 class CandleBuilder:
     """
     Incremental Event-Driven Candle Builder (SFM-OS Module).
     Constructs rolling 1m, 5m, 15m, and Daily candles from live tick feeds.
-    Maintains a thread-safe sliding history buffer of completed candles per symbol.
+    Keeps a fixed-size ``CandleRing`` of completed candles plus the in-progress one per
+    (symbol, timeframe), so memory per symbol is fixed and a tick is a handful of scalar writes.
     """
-    
+
+    TIMEFRAME_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1D": 86400}
+
     def __init__(self, max_history_len: int = 200):
         self.max_history_len = max_history_len
-        # Nested dictionaries holding rolling state:
-        # { symbol: { timeframe: [completed_candle_dict, ...] } }
-        self._history: Dict[str, Dict[str, List[Dict]]] = {}
-        # { symbol: { timeframe: current_uncompleted_candle_dict } }
-        self._current_candles: Dict[str, Dict[str, Dict]] = {}
-        # Mutex locks to ensure thread-safety during concurrent tick events
-        self._locks: Dict[str, asyncio.Lock] = {}
-
-    def _get_lock(self, symbol: str) -> asyncio.Lock:
-        if symbol not in self._locks:
-            self._locks[symbol] = asyncio.Lock()
-        return self._locks[symbol]
+        # { symbol: { timeframe: CandleRing } } - completed candles + the in-progress one
+        self._rings: Dict[str, Dict[str, CandleRing]] = {}
 
-    def _get_timeframe_window(self, dt: datetime, timeframe: str) -> datetime:
-        """Calculates the floor boundary timestamp for a specific timeframe."""
-        # Convert offset-aware to naive for internal consistency if needed
+    def _get_rings(self, symbol: str) -> Dict[str, CandleRing]:
+        rings = self._rings.get(symbol)
+        if rings is None:
+            rings = {tf: CandleRing(self.max_history_len + 1) for tf in self.TIMEFRAME_SECONDS}
+            self._rings[symbol] = rings
+        return rings
+
+    @staticmethod
+    def _epoch_seconds(dt: datetime) -> int:
+        """Whole epoch seconds of ``dt``; offset-aware values are converted to UTC, naive ones taken as UTC."""
         if dt.tzinfo is not None:
             dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = dt - EPOCH
+        return delta.days * 86400 + delta.seconds
 
-        if timeframe == "1m":
-            return dt.replace(second=0, microsecond=0)
-        elif timeframe == "5m":
-            minute = dt.minute - (dt.minute % 5)
-            return dt.replace(minute=minute, second=0, microsecond=0)
-        elif timeframe == "15m":
-            minute = dt.minute - (dt.minute % 15)
-            return dt.replace(minute=minute, second=0, microsecond=0)
-        elif timeframe == "1D":
-            return dt.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
+    def _get_timeframe_window(self, dt: datetime, timeframe: str) -> datetime:
+        """Calculates the floor boundary timestamp for a specific timeframe."""
+        if timeframe not in self.TIMEFRAME_SECONDS:
             raise ValueError(f"Unsupported timeframe: {timeframe}")
+        seconds = self._epoch_seconds(dt)
+        return EPOCH + timedelta(seconds=seconds - seconds % self.TIMEFRAME_SECONDS[timeframe])
 
     async def process_tick(self, symbol: str, price: float, volume: int, timestamp: datetime) -> List[Tuple[str, Dict]]:
         """
         Processes a raw tick event.
         Returns a list of tuples containing (timeframe, completed_candle) when a candle window completes.
         """
-        async with self._get_lock(symbol):
-            if symbol not in self._history:
-                self._history[symbol] = {"1m": [], "5m": [], "15m": [], "1D": []}
-                self._current_candles[symbol] = {"1m": {}, "5m": {}, "15m": {}, "1D": {}}
-                
-            completed_candles_emitted = []
-            
-            for tf in ["1m", "5m", "15m", "1D"]:
-                window_start = self._get_timeframe_window(timestamp, tf)
-                current = self._current_candles[symbol][tf]
-                
-                if not current:
-                    # Initialize first candle for this timeframe
-                    self._current_candles[symbol][tf] = {
-                        "timestamp": window_start,
-                        "open": price,
-                        "high": price,
-                        "low": price,
-                        "close": price,
-                        "volume": volume
-                    }
-                elif window_start > current["timestamp"]:
-                    # Tick belongs to a new window. Commit previous candle.
-                    completed_candle = current.copy()
-                    completed_candles_emitted.append((tf, completed_candle))
-                    
-                    # Store completed candle in history buffer
-                    tf_history = self._history[symbol][tf]
-                    tf_history.append(completed_candle)
-                    if len(tf_history) > self.max_history_len:
-                        tf_history.pop(0)
-                        
-                    # Initialize new current candle
-                    self._current_candles[symbol][tf] = {
-                        "timestamp": window_start,
-                        "open": price,
-                        "high": price,
-                        "low": price,
-                        "close": price,
-                        "volume": volume
-                    }
+        # No awaits below, so a tick is applied atomically on the event loop without a lock
+        rings = self._get_rings(symbol)
+        seconds = self._epoch_seconds(timestamp)
+        price = float(price)
+        volume = float(volume)
+        completed_candles_emitted = []
+
+        for tf, step in self.TIMEFRAME_SECONDS.items():
+            window_start = seconds - seconds % step
+            ring = rings[tf]
+            if not ring.live:
+                # Initialize first candle for this timeframe
+                ring.open_candle(window_start, price, price, price, price, volume)
+            elif window_start > ring.live_window:
+                # Tick belongs to a new window. The live row becomes a completed candle.
+                completed_candles_emitted.append((tf, ring.candle(-1)))
+                ring.open_candle(window_start, price, price, price, price, volume)
+            else:
+                ring.update(price, volume)
+
+        return completed_candles_emitted
+
+    @classmethod
+    def epoch_ns(cls, dt: datetime) -> int:
+        """Epoch nanoseconds of ``dt`` on the same clock as ``process_tick`` (naive values taken as UTC)."""
+        return cls._epoch_seconds(dt) * 10**9 + dt.microsecond * 1000
+
+    def process_ticks(self, symbols: Sequence[str], prices: Sequence[float], volumes: Sequence[float],
+                      epoch_ns: Sequence[int]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Applies a batch of ticks, given as parallel arrays in arrival order, with the same result
+        as calling ``process_tick`` for each in turn.
+
+        Ticks are grouped by symbol and bucketed into windows with integer floors; each run of
+        ticks sharing a (symbol, window) is reduced with numpy (open/high/low/close/volume) and
+        applied to its candle ring in one step. Returns ``{symbol: [(timeframe, completed_candle)]}``
+        for every symbol in the batch, completed candles grouped by timeframe.
+        """
+        n = len(symbols)
+        if not n:
+            return {}
+        names, codes = np.unique(np.asarray(symbols, dtype=object), return_inverse=True)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order].astype(np.int64)
+        prices = np.asarray(prices, dtype=float)[order]
+        volumes = np.asarray(volumes, dtype=float)[order]
+        seconds = np.asarray(epoch_ns, dtype=np.int64)[order] // 10**9
+
+        new_symbol = np.r_[True, codes[1:] != codes[:-1]]
+        # Per-symbol running max: a late tick folds into the current candle, as in process_tick
+        offset = codes << 40
+        emitted: Dict[str, List[Tuple[str, Dict]]] = {name: [] for name in names}
+        rings = [self._get_rings(name) for name in names]
+
+        for tf, step in self.TIMEFRAME_SECONDS.items():
+            windows = np.maximum.accumulate(seconds - seconds % step + offset) - offset
+            starts = np.flatnonzero(new_symbol | np.r_[True, windows[1:] != windows[:-1]])
+            runs = zip(
+                codes[starts].tolist(), windows[starts].tolist(), prices[starts].tolist(),
+                np.maximum.reduceat(prices, starts).tolist(), np.minimum.reduceat(prices, starts).tolist(),
+                prices[np.r_[starts[1:], n] - 1].tolist(), np.add.reduceat(volumes, starts).tolist(),
+            )
+            for code, window_start, o, h, l, c, v in runs:
+                ring = rings[code][tf]
+                if not ring.live:
+                    ring.open_candle(window_start, o, h, l, c, v)
+                elif window_start > ring.live_window:
+                    emitted[names[code]].append((tf, ring.candle(-1)))
+                    ring.open_candle(window_start, o, h, l, c, v)
                 else:
-                    # Update current candle metrics
-                    current["high"] = max(current["high"], price)
-                    current["low"] = min(current["low"], price)
-                    current["close"] = price
-                    current["volume"] += volume
-                    
-            return completed_candles_emitted
+                    ring.fold(h, l, c, v)
+
+        return emitted
 
     def get_history_df(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         """
-        Retrieves the rolling history of completed candles as a Pandas DataFrame.
-        Useful for running moving averages and breakout scans in vectorized formats.
+        Retrieves the rolling history of completed candles, followed by the current
+        in-progress candle, as a read-only DataFrame view over the candle buffer (no copy).
         """
-        if symbol not in self._history or timeframe not in self._history[symbol]:
-            return None
-            
-        candles = self._history[symbol][timeframe]
-        # Append the current in-progress candle so computations are live/current
-        current_candle = self._current_candles.get(symbol, {}).get(timeframe)
-        
-        all_candles = list(candles)
-        if current_candle:
-            all_candles.append(current_candle)
-            
-        if not all_candles:
+        ring = self._rings.get(symbol, {}).get(timeframe)
+        if ring is None or not len(ring):
             return None
-            
-        df = pd.DataFrame(all_candles)
-        df.set_index("timestamp", inplace=True)
-        return df
+        return ring.frame()
 
     def seed_history(self, symbol: str, timeframe: str, historical_candles: List[Dict]):
         """
         Warm up the builder using historical data.
         """
-        if symbol not in self._history:
-            self._history[symbol] = {"1m": [], "5m": [], "15m": [], "1D": []}
-            self._current_candles[symbol] = {"1m": {}, "5m": {}, "15m": {}, "1D": {}}
-            
+        if timeframe not in self.TIMEFRAME_SECONDS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        ring = self._get_rings(symbol)[timeframe]
         # Clear existing
-        self._history[symbol][timeframe] = []
-        
-        for c in sorted(historical_candles, key=lambda x: x["timestamp"]):
+        ring.clear()
+
+        candles = sorted(historical_candles, key=lambda x: x["timestamp"])[-self.max_history_len:]
+        for c in candles:
             # Make sure timestamps are parsed as datetime objects
             ts = c["timestamp"]
             if isinstance(ts, str):
                 ts = datetime.fromisoformat(ts.replace("Z", ""))
-                
-            self._history[symbol][timeframe].append({
-                "timestamp": ts,
-                "open": float(c["open"]),
-                "high": float(c["high"]),
-                "low": float(c["low"]),
-                "close": float(c["close"]),
-                "volume": int(c["volume"])
-            })
+            ts = pd.Timestamp(ts)
+            if ts.tzinfo is not None:
+                ts = ts.tz_convert("UTC").tz_localize(None)
+
+            ring.append(
+                ts.as_unit("ns").value,
+                float(c["open"]),
+                float(c["high"]),
+                float(c["low"]),
+                float(c["close"]),
+                float(c["volume"]),
+            )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+EPOCH_UNITS_PER_SECOND = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+
+
+class ChartEncoder:
+    """
+    Vectorized encoder for the dashboard chart payload.
+
+    ``columns()`` turns an OHLCV frame (plus an optional VWAP series aligned by position) into
+    plain columnar lists in one numpy pass: rows with a NaN open/high/low/close or an unusable
+    timestamp are dropped (lightweight-charts rejects them), times are epoch seconds, missing
+    volume is 0.0 and missing VWAP is ``None``. ``rows()`` expands the columns into the
+    ``[{"time", "open", ..., "vwap"}]`` records the chart's ``setData`` consumes.
+    """
+
+    FRAME_COLUMNS = ("open", "high", "low", "close", "volume")
+    FIELDS = ("time", "open", "high", "low", "close", "volume", "vwap")
+
+    @staticmethod
+    def _as_float(values: Any) -> np.ndarray:
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "fiu":
+            return np.asarray(values, dtype=float)
+        return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    @classmethod
+    def _matrix(cls, df: pd.DataFrame) -> np.ndarray:
+        """``(n, 5)`` float matrix of OHLCV; absent or non-numeric cells are NaN."""
+        names = df.columns.tolist()
+        out = np.full((len(df), len(cls.FRAME_COLUMNS)), np.nan)
+        try:
+            # One block copy for the usual all-float frame
+            values = df.to_numpy(dtype=float)
+        except (TypeError, ValueError):
+            values = None
+        for j, column in enumerate(cls.FRAME_COLUMNS):
+            if column in names:
+                pos = names.index(column)
+                out[:, j] = values[:, pos] if values is not None else cls._as_float(df.iloc[:, pos])
+        return out
+
+    @staticmethod
+    def _epoch_seconds(index: pd.Index) -> Optional[np.ndarray]:
+        if not isinstance(index, pd.DatetimeIndex):
+            return None
+        return index.asi8 // EPOCH_UNITS_PER_SECOND[index.unit]
+
+    @classmethod
+    def columns(cls, df: pd.DataFrame, vwap: Optional[pd.Series] = None) -> Dict[str, List[Any]]:
+        """Returns ``{field: list}`` for every plottable bar of ``df``."""
+        n = len(df)
+        times = cls._epoch_seconds(df.index)
+        if n == 0 or times is None:
+            return {field: [] for field in cls.FIELDS}
+
+        matrix = cls._matrix(df)
+        keep = ~np.isnan(matrix[:, :4]).any(axis=1) & ~df.index.isna()
+        prices = matrix[keep]
+        volume = prices[:, 4]
+        volume[np.isnan(volume)] = 0.0
+
+        aligned = np.full(n, np.nan)
+        if vwap is not None and len(vwap):
+            m = min(n, len(vwap))
+            aligned[:m] = cls._as_float(vwap)[:m]
+
+        vwap_values = aligned[keep]
+        vwap_list = vwap_values.tolist()
+        if np.isnan(vwap_values).any():
+            vwap_list = [None if v != v else v for v in vwap_list]
+        return {
+            "time": times[keep].tolist(),
+            "open": prices[:, 0].tolist(),
+            "high": prices[:, 1].tolist(),
+            "low": prices[:, 2].tolist(),
+            "close": prices[:, 3].tolist(),
+            "volume": volume.tolist(),
+            "vwap": vwap_list,
+        }
+
+    @classmethod
+    def rows(cls, columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Expands ``columns()`` output into one record per bar."""
+        return [
+            {"time": t, "open": o, "high": h, "low": l, "close": c, "volume": v, "vwap": w}
+            for t, o, h, l, c, v, w in zip(*(columns[f] for f in cls.FIELDS))
+        ]
@@ -140,14 +140,21 @@ class DatabaseService:
     @classmethod
     def log_alert(cls, symbol: str, alert_type: str, price: float, message: str):
         """Saves a triggered alert to the database."""
+        cls.log_alerts([{"symbol": symbol, "alert_type": alert_type, "price": price, "message": message}])
+
+    @classmethod
+    def log_alerts(cls, alerts: List[Dict[str, Any]]):
+        """Saves a batch of alert events (``symbol``, ``alert_type``, ``price``, ``message``) in one transaction."""
+        if not alerts:
+            return
         try:
             conn = cls.get_connection()
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 "INSERT INTO alerts (symbol, alert_type, trigger_price, message) VALUES (?, ?, ?, ?)"
                 if cls._connection_type == "SQLITE"
                 else "INSERT INTO alerts (symbol, alert_type, trigger_price, message) VALUES (%s, %s, %s, %s)",
-                (symbol.upper(), alert_type, price, message)
+                [(str(a["symbol"]).upper(), a["alert_type"], a["price"], a["message"]) for a in alerts]
             )
             conn.commit()
             cursor.close()
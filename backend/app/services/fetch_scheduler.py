@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+
+class ProviderLimiter:
+    """
+    Token bucket + AIMD concurrency window for one upstream data provider.
+
+    - Requests need a token (refilled at ``rate``/s up to ``burst``) and a free
+      concurrency slot (``limit`` in-flight requests).
+    - Every clean, fast response grows the window additively (~+1 per window of
+      successes) and nudges the rate up; a 429 halves both, a slow response shrinks
+      the window by 15%.
+    - Interactive waiters always go before background waiters.
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+    def __init__(self, name: str, rate: float, burst: int, initial_concurrency: int, max_concurrency: int,
+                 min_rate: float, max_rate: float, latency_target: float):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._limit = float(initial_concurrency)
+        self._in_flight = 0
+        self._waiting = {self.INTERACTIVE: 0, self.BACKGROUND: 0}
+
+        self._requests = 0
+        self._ok = 0
+        self._throttled = 0
+        self._errors = 0
+        self._latency_ewma: Optional[float] = None
+        self._completions = deque(maxlen=512)  # monotonic completion times for throughput
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    yield_to_interactive = priority == self.BACKGROUND and self._waiting[self.INTERACTIVE] > 0
+                    if not yield_to_interactive and self._in_flight < int(self._limit) and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._in_flight += 1
+                        self._requests += 1
+                        return True
+
+                    wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.25
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(max(wait, 0.01))
+            finally:
+                self._waiting[priority] -= 1
+
+    def release(self, latency: float, outcome: str = "ok") -> None:
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._completions.append(time.monotonic())
+            self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+
+            if outcome == "throttled":
+                self._throttled += 1
+                self._limit = max(1.0, self._limit / 2)
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = 0.0
+            elif outcome == "error":
+                self._errors += 1
+            elif latency > self.latency_target:
+                self._ok += 1
+                self._limit = max(1.0, self._limit * 0.85)
+            else:
+                self._ok += 1
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+                self.rate = min(self.max_rate, self.rate + 0.1)
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            recent = [t for t in self._completions if now - t <= 60]
+            return {
+                "rate": round(self.rate, 2),
+                "concurrencyLimit": int(self._limit),
+                "inFlight": self._in_flight,
+                "waitingInteractive": self._waiting[self.INTERACTIVE],
+                "waitingBackground": self._waiting[self.BACKGROUND],
+                "requests": self._requests,
+                "ok": self._ok,
+                "throttled": self._throttled,
+                "errors": self._errors,
+                "avgLatencyMs": round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None,
+                "throughputPerMin": len(recent),
+            }
+
+
+class _Slot:
+    def __init__(self):
+        self.outcome = "ok"
+
+    def throttled(self):
+        self.outcome = "throttled"
+
+    def failed(self):
+        self.outcome = "error"
+
+
+class FetchScheduler:
+    """
+    Shared, rate-limit-aware gate for upstream OHLCV requests (Fyers, Yahoo direct,
+    Cloudflare proxy). Callers wrap each network call in ``slot(provider)``;
+    background work (screener/sector batch fetches) marks itself with
+    ``priority(BACKGROUND)`` so dashboard requests overtake it.
+    """
+
+    INTERACTIVE = ProviderLimiter.INTERACTIVE
+    BACKGROUND = ProviderLimiter.BACKGROUND
+    ACQUIRE_TIMEOUT = 30
+
+    _providers: Dict[str, ProviderLimiter] = {
+        # Fyers allows ~10 req/s on the history API
+        "fyers": ProviderLimiter("fyers", rate=8.0, burst=10, initial_concurrency=5, max_concurrency=10,
+                                 min_rate=1.0, max_rate=10.0, latency_target=4.0),
+        # Yahoo has no published limit; start conservative and probe upwards
+        "yahoo": ProviderLimiter("yahoo", rate=3.0, burst=5, initial_concurrency=3, max_concurrency=8,
+                                 min_rate=0.25, max_rate=8.0, latency_target=2.5),
+        "proxy": ProviderLimiter("proxy", rate=2.0, burst=4, initial_concurrency=2, max_concurrency=6,
+                                 min_rate=0.25, max_rate=6.0, latency_target=3.0),
+    }
+    _local = threading.local()
+
+    @staticmethod
+    def is_rate_limit_error(err) -> bool:
+        msg = str(err or "")
+        return "Too Many Requests" in msg or "Rate limited" in msg or "429" in msg or "request limit" in msg.lower()
+
+    @classmethod
+    def current_priority(cls) -> int:
+        return getattr(cls._local, "priority", cls.INTERACTIVE)
+
+    @classmethod
+    @contextmanager
+    def priority(cls, level: int):
+        """Marks every fetch issued from this thread inside the block with ``level``."""
+        previous = cls.current_priority()
+        cls._local.priority = level
+        try:
+            yield
+        finally:
+            cls._local.priority = previous
+
+    @classmethod
+    @contextmanager
+    def slot(cls, provider: str):
+        limiter = cls._providers[provider]
+        acquired = limiter.acquire(cls.current_priority(), timeout=cls.ACQUIRE_TIMEOUT)
+        if not acquired:
+            print(f"WARNING: [FetchScheduler] {provider} slot wait exceeded {cls.ACQUIRE_TIMEOUT}s; proceeding unpaced.", flush=True)
+        slot = _Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception as e:
+            slot.outcome = "throttled" if cls.is_rate_limit_error(e) else "error"
+            raise
+        finally:
+            if acquired:
+                limiter.release(time.monotonic() - start, slot.outcome)
+
+    @classmethod
+    def max_parallelism(cls) -> int:
+        return sum(p.max_concurrency for p in cls._providers.values())
+
+    @classmethod
+    def get_metrics(cls) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.metrics() for name, limiter in cls._providers.items()}
@@ -23,6 +23,13 @@ class FundamentalService:
             if (now - entry['timestamp']) < ttl:
                 return entry['data']
 
+        # 0.5 Shared cross-process tier (another worker may already have fetched it)
+        from app.services.shared_cache_service import SharedCacheService
+        shared = SharedCacheService.get(f"fundamentals:{symbol}", cls.CACHE_TTL)
+        if shared is not None:
+            cls._cache[symbol] = shared
+            return shared['data']
+
         try:
             from app.services.market_data import MarketDataService
             stats = MarketDataService.get_yahoo_stats_via_proxy(symbol)
@@ -79,6 +86,7 @@ class FundamentalService:
                 'timestamp': now,
                 'data': data
             }
+            SharedCacheService.set(f"fundamentals:{symbol}", cls._cache[symbol], created=now)
             
             return data
 
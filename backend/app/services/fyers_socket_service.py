@@ -354,7 +354,13 @@ class FyersSocketService:
                     )
 
             if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                for res in results:
+                    if isinstance(res, Exception):
+                        cls._metrics["last_error"] = f"dispatch: {res}"
+                        print(f"[FyersSocket] Tick dispatch error: {res}", flush=True)
+                # Re-rank the patched intelligence entries once per batch, not per tick
+                ScreenerService.commit_live_batch()
 
     # -----------------------------------------------------------------------
     # WATCHDOG
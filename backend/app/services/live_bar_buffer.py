@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.engine.streaming import EMA, RollingMean
+
+
+class LiveBarBuffer:
+    """
+    Compact daily bar buffer for one symbol, driven by live ticks.
+
+    Holds the seeded window of daily bars as float64 arrays (the window length stays fixed,
+    like the screener's ``count=100`` fetch). Streaming indicator kernels are seeded over the
+    completed bars - everything before the live bar - once per bar roll, so a tick only touches
+    the live bar and ``features()`` is O(1) via the kernels' ``peek``. ``features()`` returns the
+    same keys as ``ScreenerService._symbol_features`` so both feed the same scoring rules.
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+    DMA_WINDOWS = (20, 50, 200)
+    EMA_SPANS = (20, 50)
+    IST_OFFSET = timedelta(hours=5, minutes=30)
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Optional[tuple] = None):
+        columns = {str(c).lower(): c for c in df.columns}
+        self.capacity = len(df)
+        self.dates = np.asarray(pd.DatetimeIndex(df.index).normalize(), dtype="datetime64[D]")
+        arrays = {}
+        for field in self.FIELDS:
+            arrays[field] = np.array(df[columns[field]].to_numpy(dtype=float), copy=True)
+        self.open, self.high, self.low = arrays["open"], arrays["high"], arrays["low"]
+        self.close, self.volume = arrays["close"], arrays["volume"]
+        self.fingerprint = fingerprint
+        self.ticks = 0
+        self._prepare()
+
+    @classmethod
+    def session_day(cls) -> np.datetime64:
+        """Current NSE trading date."""
+        return np.datetime64((datetime.now(timezone.utc) + cls.IST_OFFSET).date(), "D")
+
+    def _prepare(self) -> None:
+        """Reseeds the indicator kernels over completed bars; runs on seed and on each bar roll."""
+        closes, volumes, highs = self.close[:-1], self.volume[:-1], self.high[:-1]
+        # Reseeded over the fixed window (not advanced) so values stay identical to a batch rescore
+        self._dma = {w: RollingMean(w).seed(closes) for w in self.DMA_WINDOWS}
+        self._avg_volume = RollingMean(20).seed(volumes)
+        self._ema = {span: EMA(span=span).seed(closes) for span in self.EMA_SPANS}
+        self._resistance = highs[-59:].max() if len(highs) else np.nan
+        self._prev_low = self.low[-2] if len(self.low) > 1 else np.nan
+        self._prev_close = self.close[-2] if len(self.close) > 1 else np.nan
+
+    def apply_tick(self, price: float, volume: float, day: Optional[np.datetime64] = None) -> None:
+        """
+        Folds one tick into the live bar. ``volume`` is the cumulative session volume (Fyers
+        ``vol_traded_today``); zero volumes (indices) leave the bar volume unchanged. A tick from a
+        later session rolls the window forward by one bar.
+        """
+        day = self.session_day() if day is None else day
+        price = float(price)
+        if day > self.dates[-1]:
+            keep = slice(1, None) if len(self.close) >= self.capacity else slice(None)
+            self.dates = np.append(self.dates[keep], day)
+            self.open = np.append(self.open[keep], price)
+            self.high = np.append(self.high[keep], price)
+            self.low = np.append(self.low[keep], price)
+            self.close = np.append(self.close[keep], price)
+            self.volume = np.append(self.volume[keep], float(volume or 0.0))
+            self._prepare()
+        else:
+            self.close[-1] = price
+            if price > self.high[-1]:
+                self.high[-1] = price
+            if price < self.low[-1]:
+                self.low[-1] = price
+            if volume:
+                self.volume[-1] = float(volume)
+        self.ticks += 1
+
+    def features(self) -> Dict[str, Any]:
+        close = self.close[-1]
+        volume = self.volume[-1]
+        return {
+            "n_bars": len(self.close),
+            "close": close,
+            "prev_close": self._prev_close,
+            "high": self.high[-1],
+            "low": self.low[-1],
+            "volume": volume,
+            "prev_low": self._prev_low,
+            "avg_vol_20d": self._avg_volume.peek(volume),
+            "dma_20": self._dma[20].peek(close),
+            "dma_50": self._dma[50].peek(close),
+            "dma_200": self._dma[200].peek(close),
+            "resistance": self._resistance,
+            "ema_20": self._ema[20].peek(close),
+            "ema_50": self._ema[50].peek(close),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {"open": self.open, "high": self.high, "low": self.low, "close": self.close, "volume": self.volume},
+            index=pd.DatetimeIndex(self.dates.astype("datetime64[ns]")),
+        )
@@ -0,0 +1,146 @@
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MarketContextSnapshot:
+    """Immutable market regime and sector state read by the breakout gates."""
+
+    regime: Mapping[str, Any]
+    active_sectors: Tuple[str, ...]       # focus themes, cleaned to match sector names
+    sector_by_symbol: Mapping[str, str]   # plain NSE ticker -> sector without the NIFTY_ prefix
+    sectors_available: bool
+    computed_at: float
+
+    @property
+    def regime_state(self) -> str:
+        return self.regime.get("regime", "DEFENSIVE MARKET")
+
+    def sector_of(self, symbol: str) -> str:
+        if not self.sectors_available:
+            return "EQUITIES"
+        clean = str(symbol).upper().replace(".NS", "").replace(".BO", "").strip()
+        return self.sector_by_symbol.get(clean, "UNKNOWN")
+
+    def is_active_sector(self, sector: str) -> bool:
+        # Without rotation data every sector passes, so the gate can't lock everything out
+        if not self.sectors_available:
+            return True
+        return any(name in sector for name in self.active_sectors)
+
+
+class MarketContextService:
+    """
+    Regime and sector-rotation context for the real-time breakout scanner.
+
+    Regime detection and rotation scoring fetch index data, so they run on a schedule rather
+    than per tick: ``get_snapshot()`` returns the last published ``MarketContextSnapshot`` and,
+    once it is older than ``REFRESH_INTERVAL``, recomputes it on a single background thread
+    while the old one keeps being served. ``request_refresh()`` does the same on demand, e.g.
+    when an index bar closes. Snapshots are immutable and swapped atomically.
+    """
+
+    TIMEFRAME = "1D"
+    REFRESH_INTERVAL = 300
+    INDEX_SYMBOLS = frozenset({"^NSEI", "NIFTY50", "NSE:NIFTY50-INDEX"})
+    FALLBACK_REGIME = {"regime": "DEFENSIVE MARKET", "score": 45, "min_score_gate": 80}
+
+    _snapshot: Optional[MarketContextSnapshot] = None
+    _lock = threading.Lock()
+    _refreshing = False
+
+    @classmethod
+    def is_index_symbol(cls, symbol: str) -> bool:
+        return symbol in cls.INDEX_SYMBOLS
+
+    @classmethod
+    def _sector_map(cls) -> Dict[str, str]:
+        from app.services.constituent_service import ConstituentService
+
+        # First listed sector wins, like ConstituentService.get_sector_for_ticker
+        mapping: Dict[str, str] = {}
+        for sector, constituents in ConstituentService.SECTOR_CONSTITUENTS.items():
+            for symbol in constituents:
+                clean = str(symbol).upper().replace(".NS", "").replace(".BO", "").strip()
+                mapping.setdefault(clean, sector.replace("NIFTY_", ""))
+        return mapping
+
+    @classmethod
+    def build_snapshot(cls) -> MarketContextSnapshot:
+        from app.engine.sector_rotation import SectorRotationEngine
+        from app.services.screener_service import ScreenerService
+
+        try:
+            regime = dict(ScreenerService._calculate_market_regime(cls.TIMEFRAME))
+        except Exception as e:
+            print(f"WARNING: [MarketContext] Regime calculation failed: {e}. Using defensive fallback.", flush=True)
+            regime = dict(cls.FALLBACK_REGIME)
+
+        try:
+            sector_scores = ScreenerService._calculate_sector_rotation(cls.TIMEFRAME)
+            focus = SectorRotationEngine.get_focus_sectors(sector_scores)
+            active = tuple(
+                s["theme"].replace("_HEALTHCARE", "").replace("_AUTOMATION", "").replace("_AEROSPACE", "")
+                for s in focus
+            )
+            sector_map, sectors_available = cls._sector_map(), True
+        except Exception as e:
+            print(f"WARNING: [MarketContext] Sector rotation failed: {e}. Sector gate disabled.", flush=True)
+            active, sector_map, sectors_available = (), {}, False
+
+        return MarketContextSnapshot(
+            regime=MappingProxyType(regime),
+            active_sectors=active,
+            sector_by_symbol=MappingProxyType(sector_map),
+            sectors_available=sectors_available,
+            computed_at=time.time(),
+        )
+
+    @classmethod
+    def refresh(cls) -> MarketContextSnapshot:
+        """Recomputes and publishes a snapshot (blocking)."""
+        try:
+            snapshot = cls.build_snapshot()
+            with cls._lock:
+                cls._snapshot = snapshot
+            return snapshot
+        finally:
+            with cls._lock:
+                cls._refreshing = False
+
+    @classmethod
+    def _background_refresh(cls):
+        try:
+            cls.refresh()
+        except Exception as e:
+            print(f"WARNING: [MarketContext] Background refresh failed: {e}", flush=True)
+
+    @classmethod
+    def request_refresh(cls) -> None:
+        """Starts a background recompute unless one is already running."""
+        with cls._lock:
+            if cls._refreshing:
+                return
+            cls._refreshing = True
+        threading.Thread(target=cls._background_refresh, name="market-context-refresh", daemon=True).start()
+
+    @classmethod
+    def current(cls) -> Optional[MarketContextSnapshot]:
+        """The last published snapshot, or None before the first refresh. Never blocks."""
+        return cls._snapshot
+
+    @classmethod
+    def get_snapshot(cls) -> MarketContextSnapshot:
+        """
+        The published snapshot, scheduling a background refresh once it is stale.
+        Blocks only for the very first computation.
+        """
+        snapshot = cls._snapshot
+        if snapshot is None:
+            return cls.refresh()
+        if time.time() - snapshot.computed_at >= cls.REFRESH_INTERVAL:
+            cls.request_refresh()
+        return snapshot
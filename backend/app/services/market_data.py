@@ -7,26 +7,46 @@ import os
 import time
 from functools import lru_cache
 from app.services.fyers_service import FyersService
+from app.services.ohlcv_store import OHLCVStore
+from app.services.ohlcv_cache import OHLCVCache
+from app.services.fetch_scheduler import FetchScheduler
+from app.services.shared_cache_service import SharedCacheService
 
 import requests
 import json as json_lib # Avoid conflict with possible local json var
 import gc
 import collections
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeout
 import threading
 
 class MarketDataService:
 
     # Removed custom session as it conflicts with newer yfinance/curl_cffi requirements on Render
 
-    # Simple in-memory cache to mitigate Yahoo Finance rate limits
-    _ohlcv_cache = {}
-    MAX_CACHE_ITEMS = 50 # Prevent memory bloat on small instances
+    # In-memory LRU cache to mitigate Yahoo Finance rate limits
+    MAX_CACHE_ITEMS = 400 # Nifty-100 x a few timeframes fits without thrashing
+    MAX_CACHE_BYTES = 64 * 1024 * 1024 # Byte cap keeps small (512MB) instances safe
     CACHE_TTL = 600 # 10 minutes — increased to reduce re-fetch frequency
+    _ohlcv_cache = OHLCVCache(max_items=MAX_CACHE_ITEMS, max_bytes=MAX_CACHE_BYTES, ttl=CACHE_TTL)
     _cool_off_symbols = {} # symbol -> timestamp when cool-off ends
+    _bse_fallback_symbols = set() # .NS symbols Yahoo only serves under .BO
     COOL_OFF_DURATION = 1200 # 20 minutes — extended to let YF rate limit window expire
     _fetch_locks = {}
     _locks_lock = threading.Lock()
+    BATCH_MAX_WORKERS = 16 # Upper bound on threads; FetchScheduler sets the real pace
+    YAHOO_BATCH_SIZE = 50 # Tickers per grouped yf.download request
+    BATCH_TIMEOUT = 240 # Whole-batch budget (s) before pending symbols are reported as errors
+    DELTA_MAX_GAP = 5 * 86400 # Beyond this the cached tail is too old for a delta fetch
+
+    # Timeframes built locally by resampling a finer Yahoo interval
+    RESAMPLE_MAP = {
+        "10m": "10min",
+        "45m": "45min", 
+        "75m": "75min", 
+        "2H": "120min", 
+        "3H": "180min", 
+        "4H": "240min"
+    }
 
     @staticmethod
     def _pick_fast_info_value(fast_info, *keys):
@@ -88,19 +108,11 @@ class MarketDataService:
         print(f"DEBUG: Symbol Mapping: {original_symbol} -> {symbol}")
         return symbol
 
-    @staticmethod
-    def _get_cache_path(symbol, tf):
-        safe_symbol = "".join(c for c in symbol if c.isalnum() or c in ('^', '.'))
-        return Path(__file__).parent.parent / "data" / "ohlcv_cache" / f"{safe_symbol}_{tf}.csv"
-
     @staticmethod
     def _save_to_disk(symbol, tf, df):
         try:
             if df.empty or len(df) < 50: return
-            path = MarketDataService._get_cache_path(symbol, tf)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            # Use CSV for maximum compatibility and zero dependencies
-            df.to_csv(path, index=True)
+            OHLCVStore.write(symbol, tf, df)
         except Exception as e:
             print(f"DEBUG: Failed to save {symbol} to disk: {e}")
 
@@ -124,7 +136,12 @@ class MarketDataService:
 
             for attempt in range(max_retries + 1):
                 try:
-                    res = requests.get(proxy_url, headers=headers, timeout=timeout)
+                    with FetchScheduler.slot("proxy") as slot:
+                        res = requests.get(proxy_url, headers=headers, timeout=timeout)
+                        if res.status_code == 429:
+                            slot.throttled()
+                        elif res.status_code != 200:
+                            slot.failed()
                     if res.status_code == 200:
                         return res
                     elif res.status_code == 401:
@@ -144,50 +161,12 @@ class MarketDataService:
 
     @staticmethod
     def _load_from_disk(symbol, tf):
-        try:
-            path = MarketDataService._get_cache_path(symbol, tf)
-            if not path.exists():
-                return None
-            
-            df = pd.read_csv(path)
-            if df.empty:
-                return df
-            
-            # Normalize column names for detection
-            cols = [str(c).lower() for c in df.columns]
-            
-            if 'timestamp' in cols:
-                idx = cols.index('timestamp')
-                df.set_index(df.columns[idx], inplace=True)
-            elif 'datetime' in cols:
-                idx = cols.index('datetime')
-                df.set_index(df.columns[idx], inplace=True)
-            elif 'date' in cols:
-                idx = cols.index('date')
-                df.set_index(df.columns[idx], inplace=True)
-            elif df.columns[0] == 'Unnamed: 0':
-                df.set_index(df.columns[0], inplace=True)
-            
-            # Ensure index is DatetimeIndex
-            if not isinstance(df.index, pd.DatetimeIndex):
-                try:
-                    df.index = pd.to_datetime(df.index)
-                except:
-                    pass
-            
-            # Ensure all data columns are lowercase
-            df.columns = [c.lower() for c in df.columns]
-            df.index.name = 'timestamp'
-            df.sort_index(inplace=True)
-            
-            # Final normalization for daily data
-            if tf in ["1D", "DAILY"] and isinstance(df.index, pd.DatetimeIndex):
-                df.index = df.index.normalize()
-                
-            return df
-        except Exception as e:
-            print(f"DEBUG: Failed to load {symbol} from disk: {e}")
-        return None
+        return OHLCVStore.read(symbol, tf)
+
+    @staticmethod
+    def _min_disk_rows(count):
+        """A stored frame only stands in for a fetch if it already covers most of the request."""
+        return 50 if count <= 200 else count * 3 // 4
 
     @staticmethod
     def get_yahoo_stats_via_proxy(symbol):
@@ -296,11 +275,139 @@ class MarketDataService:
             print(f"DEBUG: Proxy stats parsing failed for {symbol}: {e}")
             return None
 
+    # Map TF to yfinance interval
+    YAHOO_INTERVAL_MAP = {
+        "5m": "5m",
+        "10m": "5m",
+        "15m": "15m",
+        "30m": "30m",
+        "45m": "15m",
+        "1H": "60m",
+        "2H": "60m",
+        "3H": "60m",
+        "4H": "60m",
+        "1D": "1d",
+        "1W": "1wk",
+        "1M": "1mo",
+        "75m": "15m"
+    }
+
+    # Approximate bars per NSE session (09:15-15:30) and per year, used to size long history requests
+    BARS_PER_SESSION = {"5m": 75, "10m": 38, "15m": 25, "30m": 13, "45m": 9, "75m": 5,
+                        "1H": 7, "2H": 4, "3H": 3, "4H": 2}
+    BARS_PER_YEAR = {"1D": 245, "1W": 52, "1M": 12}
+    YAHOO_MAX_DAYS = {"5m": 60, "15m": 60, "30m": 60, "60m": 730}  # Yahoo's intraday history limits
+    YAHOO_LONG_PERIODS = (("1y", 1), ("2y", 2), ("5y", 5), ("10y", 10))
+
+    @staticmethod
+    def _yahoo_interval_period(tf, count=200):
+        interval = MarketDataService.YAHOO_INTERVAL_MAP.get(tf, "1d")
+        period = "1y"
+        if tf == "5m": period = "7d"
+        elif tf == "10m": period = "7d"
+        elif tf == "15m": period = "30d"
+        elif tf in ["30m", "45m", "75m"]: period = "60d"
+        elif tf in ["1H", "2H", "3H", "4H"]: period = "180d"
+        elif tf == "1D": period = "1y" 
+        elif tf == "1W": period = "2y"
+        elif tf == "1M": period = "5y"
+
+        # Longer requests (e.g. a base series for derived timeframes) widen the period to cover `count`
+        if count <= 200:
+            return interval, period
+        if tf in MarketDataService.BARS_PER_SESSION:
+            # ~1.5 calendar days per session for weekends and holidays
+            days = int(count / MarketDataService.BARS_PER_SESSION[tf] * 1.5) + 1
+            days = min(days, MarketDataService.YAHOO_MAX_DAYS.get(interval, days))
+            if days > int(period[:-1]):
+                period = f"{days}d"
+        elif tf in MarketDataService.BARS_PER_YEAR:
+            years = count / MarketDataService.BARS_PER_YEAR[tf]
+            if years > int(period[:-1]):
+                period = next((p for p, y in MarketDataService.YAHOO_LONG_PERIODS if y >= years), "max")
+        return interval, period
+
+    @staticmethod
+    def _normalize_yahoo_frame(df, tf, count):
+        """Applies the single-symbol normalisation (lower-case columns, resampling, daily index) to a Yahoo frame."""
+        df = df.dropna(how="all")
+        df.columns = [str(c).lower() for c in df.columns]
+        if hasattr(df.index, 'tz') and df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        if tf in MarketDataService.RESAMPLE_MAP:
+            resample_logic = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+            offset = '15min' if tf == "75m" else '0min'
+            df = df.resample(MarketDataService.RESAMPLE_MAP[tf], offset=offset).agg(resample_logic).dropna()
+        if tf in ["1D", "DAILY"] and isinstance(df.index, pd.DatetimeIndex):
+            df.index = df.index.normalize()
+        return df.tail(count)
+
+    @staticmethod
+    def _split_download(raw, tickers):
+        """Splits a grouped yf.download result into {ticker: DataFrame}."""
+        frames = {}
+        if raw is None or raw.empty:
+            return frames
+        if isinstance(raw.columns, pd.MultiIndex):
+            level0 = set(raw.columns.get_level_values(0))
+            for t in tickers:
+                if t in level0:
+                    frames[t] = raw[t].copy()
+        elif len(tickers) == 1:
+            frames[tickers[0]] = raw.copy()
+        return frames
+
+    @staticmethod
+    def _download_yahoo_batch(symbols, tf, count):
+        """
+        Grouped Yahoo download for many symbols: one yf.download request per
+        YAHOO_BATCH_SIZE tickers instead of one Ticker.history round trip each.
+        Symbols returning fewer than 50 rows are retried once on .BO.
+        Returns {symbol: df} for the symbols that resolved; callers fall back per-symbol for the rest.
+        """
+        interval, period = MarketDataService._yahoo_interval_period(tf, count)
+        yahoo_of = {sym: MarketDataService._to_yahoo_symbol(sym) for sym in symbols}
+
+        def _download(tickers):
+            frames = {}
+            for i in range(0, len(tickers), MarketDataService.YAHOO_BATCH_SIZE):
+                chunk = tickers[i:i + MarketDataService.YAHOO_BATCH_SIZE]
+                try:
+                    with FetchScheduler.slot("yahoo"):
+                        raw = yf.download(chunk, period=period, interval=interval, group_by="ticker",
+                                          auto_adjust=True, progress=False, threads=True, timeout=10)
+                    frames.update(MarketDataService._split_download(raw, chunk))
+                except Exception as e:
+                    print(f"DEBUG: [MarketData] Grouped Yahoo download failed for {len(chunk)} tickers: {e}", flush=True)
+            return frames
+
+        results = {}
+        downloaded = _download(sorted(set(yahoo_of.values())))
+        retry_bo = {}
+        for sym, ysym in yahoo_of.items():
+            df = downloaded.get(ysym)
+            if df is not None:
+                df = df.dropna(how="all")
+            if df is not None and len(df) >= 50:
+                results[sym] = MarketDataService._normalize_yahoo_frame(df, tf, count)
+            elif ysym.endswith(".NS"):
+                retry_bo[sym] = ysym.replace(".NS", ".BO")
+
+        if retry_bo:
+            downloaded = _download(sorted(set(retry_bo.values())))
+            for sym, ysym in retry_bo.items():
+                df = downloaded.get(ysym)
+                if df is not None:
+                    df = df.dropna(how="all")
+                if df is not None and len(df) >= 50:
+                    results[sym] = MarketDataService._normalize_yahoo_frame(df, tf, count)
+        return results
+
     @staticmethod
-    def get_ohlcv_batch(symbols, tf="1D", count=200):
+    def get_ohlcv_batch(symbols, tf="1D", count=200, priority=FetchScheduler.BACKGROUND):
         """
-        Fetches OHLCV data for multiple symbols in a batch using yfinance.download.
-        This is significantly faster than single-ticker fetches for large lists.
+        Fetches OHLCV data for multiple symbols in parallel through the shared FetchScheduler.
+        Batch callers (screener, sector rotation) default to BACKGROUND priority.
         """
         if not symbols:
             return {}
@@ -313,30 +420,39 @@ class MarketDataService:
         
         # 1. Check Memory Cache
         now = time.time()
+        disk_candidates = []
         for sym in unique_normalized:
-            cache_key = f"{sym}_{tf}_{count}_True"
-            if cache_key in MarketDataService._ohlcv_cache:
-                entry = MarketDataService._ohlcv_cache[cache_key]
-                if (now - entry['timestamp']) < MarketDataService.CACHE_TTL:
-                    results[sym] = (entry['df'].copy(), entry['currency'], None, "cache")
-                    continue
-            
-            # Check Disk Cache if not in memory or expired
-            path = MarketDataService._get_cache_path(sym, tf)
-            if path.exists():
-                mtime = os.path.getmtime(path)
-                if (now - mtime) < MarketDataService.CACHE_TTL:
-                    df_disk = MarketDataService._load_from_disk(sym, tf)
-                    if df_disk is not None and not df_disk.empty:
-                        results[sym] = (df_disk.tail(count), "INR", None, "cache")
-                        # Pre-fill memory cache
-                        MarketDataService._ohlcv_cache[cache_key] = {
-                            'df': df_disk, 'currency': 'INR', 'timestamp': mtime, 'source': 'cache'
-                        }
-                        continue
-                
+            entry = MarketDataService._ohlcv_cache.get(f"{sym}_{tf}_{count}_True")
+            if entry is not None:
+                results[sym] = (OHLCVCache.view(entry['df']), entry['currency'], None, "cache")
+                continue
+            disk_candidates.append(sym)
+
+        # Bulk-load fresh columnar disk entries for everything not in memory
+        disk_hits = OHLCVStore.read_many(disk_candidates, tf, max_age=MarketDataService.CACHE_TTL)
+        min_rows = MarketDataService._min_disk_rows(count)
+        for sym in disk_candidates:
+            if sym in disk_hits and len(disk_hits[sym][0]) >= min_rows:
+                df_disk, mtime = disk_hits[sym]
+                df_disk = df_disk.tail(count)
+                results[sym] = (df_disk, "INR", None, "cache")
+                # Pre-fill memory cache
+                MarketDataService._ohlcv_cache.set(f"{sym}_{tf}_{count}_True", {
+                    'df': df_disk, 'currency': 'INR', 'timestamp': mtime, 'source': 'cache'
+                })
+                continue
             to_fetch.append(sym)
 
+        # Entries another worker process already fetched
+        if to_fetch and SharedCacheService.is_enabled():
+            shared = SharedCacheService.get_many([f"ohlcv:{sym}_{tf}_{count}_True" for sym in to_fetch], MarketDataService.CACHE_TTL)
+            for sym in list(to_fetch):
+                entry = shared.get(f"ohlcv:{sym}_{tf}_{count}_True")
+                if entry is not None:
+                    MarketDataService._ohlcv_cache.set(f"{sym}_{tf}_{count}_True", entry)
+                    results[sym] = (entry['df'], entry['currency'], None, entry.get('source', 'cache'))
+                    to_fetch.remove(sym)
+
         if not to_fetch:
             # Return mapped to original input symbols
             final_map = {}
@@ -345,53 +461,77 @@ class MarketDataService:
                     final_map[original] = results[norm]
             return final_map
 
-        # 2. Parallel Fetch using the hardened get_ohlcv method in small chunks
-        # Chunking prevents holding 200+ futures/DataFrames in memory simultaneously
         total_start = time.time()
+
+        # 2. Grouped Yahoo download (Fyers has no multi-symbol history endpoint, so only when it is inactive)
+        if not FyersService.is_active():
+            # Symbols another worker is already fetching are left to get_ohlcv, which waits for and adopts its result
+            held_locks = {}
+            for sym in to_fetch:
+                if sym == "SYNTHETIC_CRUDE_INR" or time.time() < MarketDataService._cool_off_symbols.get(sym, 0):
+                    continue
+                handle = SharedCacheService.try_lock(f"ohlcv:{sym}_{tf}")
+                if handle is not None:
+                    held_locks[sym] = handle
+            grouped = list(held_locks)
+            if grouped:
+                try:
+                    with FetchScheduler.priority(priority):
+                        downloaded = MarketDataService._download_yahoo_batch(grouped, tf, count)
+                    for sym, df in downloaded.items():
+                        currency = MarketDataService._currency_for(sym)
+                        cache_key = f"{sym}_{tf}_{count}_True"
+                        MarketDataService._ohlcv_cache.set(cache_key, {
+                            'df': df, 'currency': currency, 'source': 'yahoo', 'timestamp': time.time()
+                        })
+                        MarketDataService._publish_shared(cache_key)
+                        MarketDataService._save_to_disk(sym, tf, df)
+                        results[sym] = (df, currency, None, "yahoo")
+                finally:
+                    for handle in held_locks.values():
+                        SharedCacheService.unlock(handle)
+                to_fetch = [sym for sym in to_fetch if sym not in downloaded]
+                print(f"DEBUG: [MarketData] Grouped Yahoo download resolved {len(downloaded)}/{len(grouped)} symbols; {len(to_fetch)} left for per-symbol fetch.", flush=True)
+
+        # 3. Parallel per-symbol fetch for whatever is left, using the hardened get_ohlcv method.
+        # Pacing is owned by FetchScheduler: each provider's token bucket and AIMD window decide
+        # how fast requests actually go out, and BACKGROUND priority lets dashboard fetches overtake.
         print(f"DEBUG: [MarketData] Starting fresh batch fetch for {len(to_fetch)} symbols. (Total: {len(unique_normalized)})", flush=True)
-        
-        max_workers = 3  # Reduced from 5 to prevent Yahoo Finance 429 burst errors
-        CHUNK_SIZE = 15  # Smaller chunks to reduce simultaneous connection count
-        
-        # Process in chunks to stay within Render 512MB limit
-        for i in range(0, len(to_fetch), CHUNK_SIZE):
-            chunk = to_fetch[i:i + CHUNK_SIZE]
-            chunk_start = time.time()
-            print(f"DEBUG: [MarketData] Processing chunk {i//CHUNK_SIZE + 1} ({len(chunk)} symbols)...", flush=True)
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_sym = {
-                    executor.submit(MarketDataService.get_ohlcv, norm_sym, tf, count): norm_sym 
-                    for norm_sym in chunk
-                }
-                
-                for future in future_to_sym:
-                    norm_sym = future_to_sym[future]
-                    try:
-                        # Lower timeout for individual fetches within a batch to prevent one slow symbol from hanging everything
-                        df, currency, err, source = future.result(timeout=25) 
-                        if df is not None and not df.empty:
-                            results[norm_sym] = (df, currency, err, source)
-                        else:
-                            results[norm_sym] = (None, "INR", err or "Empty Data", "error")
-                    except Exception as e:
-                        print(f"ERROR: [MarketData] Parallel fetch failed for {norm_sym}: {e}")
-                        results[norm_sym] = (None, "INR", str(e), "error")
-            
-            chunk_dur = time.time() - chunk_start
-            print(f"DEBUG: [MarketData] Chunk {i//CHUNK_SIZE + 1} completed in {chunk_dur:.2f}s.", flush=True)
 
-            # Inter-chunk jitter: 0.5s pause to avoid burst rate-limiting from Yahoo Finance
-            if i + CHUNK_SIZE < len(to_fetch):
-                time.sleep(0.5)
+        def _fetch(norm_sym):
+            with FetchScheduler.priority(priority):
+                return MarketDataService.get_ohlcv(norm_sym, tf, count)
+
+        max_workers = max(1, min(len(to_fetch), MarketDataService.BATCH_MAX_WORKERS))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        future_to_sym = {executor.submit(_fetch, norm_sym): norm_sym for norm_sym in to_fetch}
+        try:
+            for future in as_completed(future_to_sym, timeout=MarketDataService.BATCH_TIMEOUT):
+                norm_sym = future_to_sym[future]
+                try:
+                    df, currency, err, source = future.result()
+                    if df is not None and not df.empty:
+                        results[norm_sym] = (df, currency, err, source)
+                    else:
+                        results[norm_sym] = (None, "INR", err or "Empty Data", "error")
+                except Exception as e:
+                    print(f"ERROR: [MarketData] Parallel fetch failed for {norm_sym}: {e}")
+                    results[norm_sym] = (None, "INR", str(e), "error")
+        except FutureTimeout:
+            pending = [sym for f, sym in future_to_sym.items() if not f.done()]
+            print(f"ERROR: [MarketData] Batch timed out after {MarketDataService.BATCH_TIMEOUT}s with {len(pending)} symbols pending.", flush=True)
+            for sym in pending:
+                results[sym] = (None, "INR", "Batch fetch timed out", "error")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Release transient DataFrames once per batch (was once per chunk)
+        gc.collect()
 
-            # Explicitly trigger GC after each chunk to release transient DataFrames
-            gc.collect()
-            
         total_dur = time.time() - total_start
         print(f"DEBUG: [MarketData] Complete batch fetch finished in {total_dur:.2f}s for {len(to_fetch)} items.", flush=True)
 
-        # 3. Final mapping back to original input symbols
+        # 4. Final mapping back to original input symbols
         final_map = {}
         for original, norm in zip(symbols, normalized_symbols):
             if norm in results:
@@ -402,6 +542,20 @@ class MarketDataService:
         return final_map
 
 
+    @staticmethod
+    def get_cached_ohlcv(symbol, tf="1D"):
+        """
+        Returns the freshest in-memory OHLCV frame for (symbol, tf) regardless of the
+        count/use_fast_info variant it was fetched with, or None. Never triggers a fetch.
+        """
+        symbol = MarketDataService.normalize_symbol(symbol)
+        entry = MarketDataService._ohlcv_cache.find_latest(f"{symbol}_{tf}_")
+        return OHLCVCache.view(entry['df']) if entry is not None else None
+
+    @staticmethod
+    def get_cache_stats():
+        return MarketDataService._ohlcv_cache.stats()
+
     @staticmethod
     def get_ohlcv(symbol="NIFTY50", tf="1D", count=200, use_fast_info=True):
         """
@@ -411,11 +565,9 @@ class MarketDataService:
         cache_key = f"{symbol}_{tf}_{count}_{use_fast_info}"
         
         # 1. Fast Memory Cache Check
-        now = time.time()
-        if cache_key in MarketDataService._ohlcv_cache:
-            entry = MarketDataService._ohlcv_cache[cache_key]
-            if (now - entry['timestamp']) < MarketDataService.CACHE_TTL:
-                return entry['df'].copy(), entry['currency'], None, entry.get('source', 'cache')
+        entry = MarketDataService._ohlcv_cache.get(cache_key)
+        if entry is not None:
+            return OHLCVCache.view(entry['df']), entry['currency'], None, entry.get('source', 'cache')
             
         # Get or create lock for this specific cache_key
         with MarketDataService._locks_lock:
@@ -425,13 +577,201 @@ class MarketDataService:
 
         with lock:
             # Double-check inside lock
-            now = time.time()
-            if cache_key in MarketDataService._ohlcv_cache:
-                entry = MarketDataService._ohlcv_cache[cache_key]
-                if (now - entry['timestamp']) < MarketDataService.CACHE_TTL:
-                    return entry['df'].copy(), entry['currency'], None, entry.get('source', 'cache')
-            
-            return MarketDataService._get_ohlcv_uncoalesced(symbol, tf, count, use_fast_info)
+            entry = MarketDataService._ohlcv_cache.get(cache_key)
+            if entry is not None:
+                return OHLCVCache.view(entry['df']), entry['currency'], None, entry.get('source', 'cache')
+
+            # 2. Shared cross-process tier (multi-worker deployments)
+            shared = MarketDataService._adopt_shared(cache_key)
+            if shared is not None:
+                return shared
+
+            # Only one worker process fetches a given (symbol, tf) at a time; the others wait and adopt its result
+            with SharedCacheService.single_flight(f"ohlcv:{symbol}_{tf}"):
+                shared = MarketDataService._adopt_shared(cache_key)
+                if shared is not None:
+                    return shared
+                result = MarketDataService._get_ohlcv_uncoalesced(symbol, tf, count, use_fast_info)
+                MarketDataService._publish_shared(cache_key)
+                return result
+
+    @staticmethod
+    def _adopt_shared(cache_key):
+        """Copies a fresh entry from the shared cache tier into this process's memory cache."""
+        entry = SharedCacheService.get(f"ohlcv:{cache_key}", MarketDataService.CACHE_TTL)
+        if entry is None:
+            return None
+        MarketDataService._ohlcv_cache.set(cache_key, entry)
+        entry = MarketDataService._ohlcv_cache.get(cache_key, allow_stale=True)
+        return OHLCVCache.view(entry['df']), entry['currency'], None, entry.get('source', 'cache')
+
+    @staticmethod
+    def _publish_shared(cache_key):
+        """Publishes this process's freshly fetched entry to the shared cache tier."""
+        if not SharedCacheService.is_enabled():
+            return
+        entry = MarketDataService._ohlcv_cache.get(cache_key)
+        if entry is not None and entry.get('source') in ("yahoo", "fyers"):
+            SharedCacheService.set(f"ohlcv:{cache_key}", entry, created=entry['timestamp'])
+
+    # Map internal index symbols to Fyers-specific formats
+    FYERS_INDEX_MAP = {
+        "^NSEI": "NSE:NIFTY50-INDEX",
+        "^NSEBANK": "NSE:NIFTYBANK-INDEX",
+        "^CNXIT": "NSE:NIFTYIT-INDEX",
+        "^CNXPHARMA": "NSE:NIFTYPHARMA-INDEX",
+        "^CNXFMCG": "NSE:NIFTYFMCG-INDEX",
+        "^CNXAUTO": "NSE:NIFTYAUTO-INDEX",
+        "^CNXENERGY": "NSE:NIFTYENERGY-INDEX",
+        "^CNXMETAL": "NSE:NIFTYMETAL-INDEX",
+        "^CNXREALTY": "NSE:NIFTYREALTY-INDEX",
+        "^CNXPSUBANK": "NSE:NIFTYPSUBANK-INDEX"
+    }
+
+    @staticmethod
+    def _to_fyers_symbol(symbol):
+        if ":" in symbol:
+            return symbol
+        if symbol in MarketDataService.FYERS_INDEX_MAP:
+            return MarketDataService.FYERS_INDEX_MAP[symbol]
+        # Map stock symbols (remove .NS/.BO and add -EQ)
+        clean_sym = symbol.replace(".NS", "").replace(".BO", "")
+        return f"NSE:{clean_sym}-EQ"
+
+    @staticmethod
+    def _to_yahoo_symbol(symbol):
+        """Converts Fyers-format symbols (e.g. NSE:TCS-EQ) to yfinance format (TCS.NS)."""
+        if ":" not in symbol:
+            return symbol
+        # Strip exchange prefix and -EQ / -INDEX suffix for Yahoo
+        exchange, raw = [p.upper() for p in symbol.split(":", 1)]
+        # Remove common Fyers suffixes
+        for sfx in ["-EQ", "-BE", "-SM", "-BL", "-IL", "-INDEX"]:
+            if raw.endswith(sfx):
+                raw = raw[:-len(sfx)]
+                break
+        if exchange == "NSE":
+            yahoo_symbol = f"{raw}.NS"
+        elif exchange == "BSE":
+            yahoo_symbol = f"{raw}.BO"
+        else:
+            yahoo_symbol = raw
+        print(f"DEBUG: Converted Fyers symbol {symbol} -> Yahoo {yahoo_symbol}", flush=True)
+        return yahoo_symbol
+
+    @staticmethod
+    def _resolve_yahoo_symbol(symbol):
+        """Yahoo ticker for a symbol, using .BO once a full fetch has had to fall back to it."""
+        if symbol in MarketDataService._bse_fallback_symbols:
+            return symbol.replace(".NS", ".BO")
+        return MarketDataService._to_yahoo_symbol(symbol)
+
+    @staticmethod
+    def _apply_live_cmp(df, ticker, tf):
+        """
+        Patches the last bar with the ticker's live price from fast_info, or appends a
+        bar for today when the frame's last bar is from an earlier session.
+        """
+        try:
+            fast = ticker.fast_info
+            cmp = MarketDataService._pick_fast_info_value(
+                fast, 'lastPrice', 'last_price', 'regularMarketPrice'
+            )
+
+            if cmp:
+                cmp = float(cmp)
+                if not df.empty:
+                    df = df.copy()
+                    last_idx = df.index[-1]
+                    col_close = 'Close' if 'Close' in df.columns else 'close'
+                    col_high = 'High' if 'High' in df.columns else 'high'
+                    col_low = 'Low' if 'Low' in df.columns else 'low'
+
+                    is_today = last_idx.date() == pd.Timestamp.now().date()
+                    if is_today:
+                        df.at[last_idx, col_close] = cmp
+                        df.at[last_idx, col_high] = max(df.at[last_idx, col_high], cmp)
+                        df.at[last_idx, col_low] = min(df.at[last_idx, col_low], cmp)
+                    else:
+                        if tf in ["1D", "DAILY"]:
+                            new_idx = pd.Timestamp.now().normalize()
+                        else:
+                            new_idx = pd.Timestamp.now().floor("min")
+                        
+                        new_row = {
+                            col_close: cmp,
+                            col_high: cmp,
+                            col_low: cmp,
+                            'open': df.iloc[-1][col_close],
+                            'volume': 0
+                        }
+                        df.loc[new_idx] = new_row
+                    df = df[~df.index.duplicated(keep="last")]
+        except Exception:
+            pass
+        return df
+
+    @staticmethod
+    def _currency_for(symbol):
+        is_inr = symbol.endswith(".NS") or symbol.endswith(".BO") or symbol.startswith("^NSE") or symbol.startswith("^CNX") or symbol.startswith("NIFTY") or symbol.startswith("NSE:") or symbol.startswith("BSE:")
+        return "INR" if is_inr else "USD"
+
+    @staticmethod
+    def _merge_delta(cached, delta, tf, count):
+        """
+        Merges freshly fetched bars onto a cached frame. Every cached bar at or after the
+        first delta bar is replaced, which also swaps out the previously partial last bar.
+        """
+        delta = delta.copy()
+        delta.columns = [c.lower() for c in delta.columns]
+        if hasattr(delta.index, 'tz') and delta.index.tz is not None:
+            delta.index = delta.index.tz_localize(None)
+        if tf in ["1D", "DAILY"] and isinstance(delta.index, pd.DatetimeIndex):
+            delta.index = delta.index.normalize()
+        delta = delta[~delta.index.duplicated(keep="last")].sort_index()
+
+        head = cached[cached.index < delta.index[0]]
+        merged = pd.concat([head, delta]) if not head.empty else delta
+        return merged.tail(count), delta
+
+    @staticmethod
+    def _refresh_incremental(symbol, tf, count, cached_df, interval):
+        """
+        Delta-fetch mode: requests only bars from the cached tail onwards (Fyers range_from
+        or a Yahoo start date) and merges them into the cached frame.
+        Returns (merged_df, delta_df, source) or None when a full refetch is required.
+        """
+        last_ts = cached_df.index[-1]
+        if (pd.Timestamp.now() - last_ts).total_seconds() > MarketDataService.DELTA_MAX_GAP:
+            return None
+
+        range_from = last_ts.strftime("%Y-%m-%d")
+        range_to = pd.Timestamp.now().strftime("%Y-%m-%d")
+
+        if FyersService.is_active():
+            fyers_sym = MarketDataService._to_fyers_symbol(symbol)
+            with FetchScheduler.slot("fyers") as slot:
+                delta, err = FyersService.get_ohlcv(fyers_sym, tf, range_from=range_from, range_to=range_to, timeout=8)
+                if FetchScheduler.is_rate_limit_error(err):
+                    slot.throttled()
+            if delta is not None and not delta.empty:
+                merged, delta = MarketDataService._merge_delta(cached_df, delta, tf, count)
+                print(f"DEBUG: [MarketData] Delta refresh {symbol} ({tf}) via Fyers: {len(delta)} bars", flush=True)
+                return merged, delta, "fyers"
+            print(f"DEBUG: [MarketData] Fyers delta failed for {fyers_sym}: {err}", flush=True)
+
+        cool_off_end = MarketDataService._cool_off_symbols.get(symbol)
+        if cool_off_end and time.time() < cool_off_end:
+            return None
+
+        yahoo_symbol = MarketDataService._resolve_yahoo_symbol(symbol)
+        with FetchScheduler.slot("yahoo"):
+            delta = yf.Ticker(yahoo_symbol).history(start=range_from, interval=interval, timeout=3.0)
+        if delta is None or delta.empty:
+            return None
+        merged, delta = MarketDataService._merge_delta(cached_df, delta, tf, count)
+        print(f"DEBUG: [MarketData] Delta refresh {symbol} ({tf}) via Yahoo: {len(delta)} bars", flush=True)
+        return merged, delta, "yahoo"
 
     @staticmethod
     def _get_ohlcv_uncoalesced(symbol="NIFTY50", tf="1D", count=200, use_fast_info=True):
@@ -443,68 +783,55 @@ class MarketDataService:
         cache_key = f"{symbol}_{tf}_{count}_{use_fast_info}"
         
         # 1. Check Memory Cache
-        now = time.time()
-        if cache_key in MarketDataService._ohlcv_cache:
-            entry = MarketDataService._ohlcv_cache[cache_key]
-            if (now - entry['timestamp']) < MarketDataService.CACHE_TTL:
-                return entry['df'].copy(), entry['currency'], None, entry.get('source', 'cache')
+        entry = MarketDataService._ohlcv_cache.get(cache_key)
+        if entry is not None:
+            return OHLCVCache.view(entry['df']), entry['currency'], None, entry.get('source', 'cache')
             
-        # Map TF to yfinance interval
-        interval_map = {
-            "5m": "5m",
-            "10m": "5m",
-            "15m": "15m",
-            "30m": "30m",
-            "45m": "15m",
-            "1H": "60m",
-            "2H": "60m",
-            "3H": "60m",
-            "4H": "60m",
-            "1D": "1d",
-            "1W": "1wk",
-            "1M": "1mo",
-            "75m": "15m"
-        }
-        interval = interval_map.get(tf, "1d")
-        
-        period = "1y"
-        if tf == "5m": period = "7d"
-        elif tf == "10m": period = "7d"
-        elif tf == "15m": period = "30d"
-        elif tf in ["30m", "45m", "75m"]: period = "60d"
-        elif tf in ["1H", "2H", "3H", "4H"]: period = "180d"
-        elif tf == "1D": period = "1y" 
-        elif tf == "1W": period = "2y"
-        elif tf == "1M": period = "5y"
+        interval, period = MarketDataService._yahoo_interval_period(tf, count)
+
+        # 1.4 Delta refresh: an expired entry only needs the bars after its tail.
+        # Resampled timeframes are rebuilt from a full fetch so bucket edges stay aligned.
+        stale = MarketDataService._ohlcv_cache.get(cache_key, allow_stale=True)
+        if stale is None:
+            df_disk = MarketDataService._load_from_disk(symbol, tf)
+            if df_disk is not None and len(df_disk) >= MarketDataService._min_disk_rows(count):
+                stale = {'df': df_disk.tail(count), 'currency': MarketDataService._currency_for(symbol)}
+        if stale is not None and tf not in MarketDataService.RESAMPLE_MAP and symbol != "SYNTHETIC_CRUDE_INR" and len(stale['df']) > 0:
+            try:
+                refreshed = MarketDataService._refresh_incremental(symbol, tf, count, stale['df'], interval)
+                if refreshed is not None:
+                    merged, delta, source = refreshed
+                    if use_fast_info and source == "yahoo":
+                        ticker = yf.Ticker(MarketDataService._resolve_yahoo_symbol(symbol))
+                        merged = MarketDataService._apply_live_cmp(merged, ticker, tf)
+                    MarketDataService._ohlcv_cache.set(cache_key, {
+                        'df': merged,
+                        'currency': stale['currency'],
+                        'source': source,
+                        'timestamp': time.time()
+                    })
+                    OHLCVStore.append(symbol, tf, delta, full=merged)
+                    return merged, stale['currency'], None, source
+            except Exception as de:
+                err_msg = str(de)
+                if "Too Many Requests" in err_msg or "Rate limited" in err_msg or "429" in err_msg:
+                    # Serve the stale frame rather than hammering Yahoo with a full refetch
+                    print(f"CRITICAL: Yahoo Rate Limit on delta refresh for {symbol}. Serving stale cache.", flush=True)
+                    MarketDataService._cool_off_symbols[symbol] = time.time() + MarketDataService.COOL_OFF_DURATION
+                    return OHLCVCache.view(stale['df']), stale['currency'], None, "cache"
+                print(f"DEBUG: [MarketData] Delta refresh failed for {symbol}: {de}. Doing full fetch.", flush=True)
         
         # 1.5 Try Fyers first if session is active
         try:
             if FyersService.is_active():
-                # Map internal symbols to Fyers-specific formats
-                fyers_sym = symbol
-                if ":" not in symbol:
-                    INDEX_MAP = {
-                        "^NSEI": "NSE:NIFTY50-INDEX",
-                        "^NSEBANK": "NSE:NIFTYBANK-INDEX",
-                        "^CNXIT": "NSE:NIFTYIT-INDEX",
-                        "^CNXPHARMA": "NSE:NIFTYPHARMA-INDEX",
-                        "^CNXFMCG": "NSE:NIFTYFMCG-INDEX",
-                        "^CNXAUTO": "NSE:NIFTYAUTO-INDEX",
-                        "^CNXENERGY": "NSE:NIFTYENERGY-INDEX",
-                        "^CNXMETAL": "NSE:NIFTYMETAL-INDEX",
-                        "^CNXREALTY": "NSE:NIFTYREALTY-INDEX",
-                        "^CNXPSUBANK": "NSE:NIFTYPSUBANK-INDEX"
-                    }
-                    if symbol in INDEX_MAP:
-                        fyers_sym = INDEX_MAP[symbol]
-                    else:
-                        # Map stock symbols (remove .NS/.BO and add -EQ)
-                        clean_sym = symbol.replace(".NS", "").replace(".BO", "")
-                        fyers_sym = f"NSE:{clean_sym}-EQ"
+                fyers_sym = MarketDataService._to_fyers_symbol(symbol)
                 
                 # Fetch Fyers Data with 8s timeout to keep batch moving
                 print(f"DEBUG: [MarketData] Requesting {fyers_sym} from Fyers (Timeout: 8s)...", flush=True)
-                fyers_df, fyers_err = FyersService.get_ohlcv(fyers_sym, tf, timeout=8)
+                with FetchScheduler.slot("fyers") as slot:
+                    fyers_df, fyers_err = FyersService.get_ohlcv(fyers_sym, tf, timeout=8)
+                    if FetchScheduler.is_rate_limit_error(fyers_err):
+                        slot.throttled()
                 
                 if fyers_df is not None and not fyers_df.empty:
                     print(f"DEBUG: [MarketData] SUCCESS: Fetched {symbol} from Fyers. Rows: {len(fyers_df)}", flush=True)
@@ -516,12 +843,12 @@ class MarketDataService:
                     fyers_df = fyers_df.tail(count)
                     
                     # Store in caches
-                    MarketDataService._ohlcv_cache[cache_key] = {
-                        'df': fyers_df.copy(),
+                    MarketDataService._ohlcv_cache.set(cache_key, {
+                        'df': fyers_df,
                         'currency': 'INR',
                         'timestamp': time.time(),
                         'source': 'fyers'
-                    }
+                    })
                     MarketDataService._save_to_disk(symbol, tf, fyers_df)
                     return fyers_df, "INR", None, "fyers"
                 
@@ -558,7 +885,8 @@ class MarketDataService:
                 base_ticker = yf.Ticker("CL=F")
                 fx_ticker = yf.Ticker("USDINR=X")
                 
-                df = base_ticker.history(period=period, interval=interval)
+                with FetchScheduler.slot("yahoo"):
+                    df = base_ticker.history(period=period, interval=interval)
                 
                 try:
                     fx_fast = fx_ticker.fast_info
@@ -587,29 +915,12 @@ class MarketDataService:
                     return df, "INR", None, "yahoo"
             
             # Standard Fetch
-            # Convert Fyers-format symbols (e.g. NSE:TCS-EQ) to yfinance format (TCS.NS)
-            yahoo_symbol = symbol
-            if ":" in symbol:
-                # Strip exchange prefix and -EQ / -INDEX suffix for Yahoo
-                parts = symbol.split(":", 1)
-                exchange = parts[0].upper()
-                raw = parts[1].upper()
-                # Remove common Fyers suffixes
-                for sfx in ["-EQ", "-BE", "-SM", "-BL", "-IL", "-INDEX"]:
-                    if raw.endswith(sfx):
-                        raw = raw[:-len(sfx)]
-                        break
-                if exchange == "NSE":
-                    yahoo_symbol = f"{raw}.NS"
-                elif exchange == "BSE":
-                    yahoo_symbol = f"{raw}.BO"
-                else:
-                    yahoo_symbol = raw
-                print(f"DEBUG: Converted Fyers symbol {symbol} -> Yahoo {yahoo_symbol}", flush=True)
+            yahoo_symbol = MarketDataService._to_yahoo_symbol(symbol)
 
             print(f"DEBUG: Yahoo Finance Fetching Symbol: {yahoo_symbol}")
             ticker = yf.Ticker(yahoo_symbol)
-            df = ticker.history(period=period, interval=interval, timeout=3.0)
+            with FetchScheduler.slot("yahoo"):
+                df = ticker.history(period=period, interval=interval, timeout=3.0)
             
             # 401 / Invalid Crumb Bypass via Proxy
             if df.empty:
@@ -641,48 +952,17 @@ class MarketDataService:
                             print(f"DEBUG: Proxy Yahoo Success for {symbol}")
             
             if use_fast_info:
-                try:
-                    fast = ticker.fast_info
-                    cmp = MarketDataService._pick_fast_info_value(
-                        fast, 'lastPrice', 'last_price', 'regularMarketPrice'
-                    )
-
-                    if cmp:
-                        cmp = float(cmp)
-                        if not df.empty:
-                            last_idx = df.index[-1]
-                            col_close = 'Close' if 'Close' in df.columns else 'close'
-                            col_high = 'High' if 'High' in df.columns else 'high'
-                            col_low = 'Low' if 'Low' in df.columns else 'low'
-
-                            is_today = last_idx.date() == pd.Timestamp.now().date()
-                            if is_today:
-                                df.at[last_idx, col_close] = cmp
-                                df.at[last_idx, col_high] = max(df.at[last_idx, col_high], cmp)
-                                df.at[last_idx, col_low] = min(df.at[last_idx, col_low], cmp)
-                            else:
-                                if tf in ["1D", "DAILY"]:
-                                    new_idx = pd.Timestamp.now().normalize()
-                                else:
-                                    new_idx = pd.Timestamp.now().floor("min")
-                                
-                                new_row = {
-                                    col_close: cmp,
-                                    col_high: cmp,
-                                    col_low: cmp,
-                                    'open': df.iloc[-1][col_close],
-                                    'volume': 0
-                                }
-                                df.loc[new_idx] = new_row
-                            df = df[~df.index.duplicated(keep="last")]
-                except Exception:
-                    pass
+                df = MarketDataService._apply_live_cmp(df, ticker, tf)
             
             if df.empty or len(df) < 50:
                 if symbol.endswith(".NS"):
                     fallback_symbol = symbol.replace(".NS", ".BO")
                     ticker = yf.Ticker(fallback_symbol)
-                    df = ticker.history(period=period, interval=interval, timeout=3.0)
+                    with FetchScheduler.slot("yahoo"):
+                        df = ticker.history(period=period, interval=interval, timeout=3.0)
+                    if not df.empty and len(df) >= 50:
+                        # Later delta refreshes go straight to the listing that answered
+                        MarketDataService._bse_fallback_symbols.add(symbol)
             
             # Handle rate limit fallback before checking empty or short
             if df.empty or len(df) < 50:
@@ -695,39 +975,16 @@ class MarketDataService:
                 df_synth = MarketDataService._generate_synthetic_ohlcv(symbol, tf, count)
                 return df_synth, "INR", None, "synthetic"
 
-            df.columns = [c.lower() for c in df.columns]
-
-            resample_map = {
-                "10m": "10min",
-                "45m": "45min", 
-                "75m": "75min", 
-                "2H": "120min", 
-                "3H": "180min", 
-                "4H": "240min"
-            }
-            if tf in resample_map:
-                resample_logic = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
-                offset = '15min' if tf == "75m" else '0min'
-                df = df.resample(resample_map[tf], offset=offset).agg(resample_logic).dropna()
+            df = MarketDataService._normalize_yahoo_frame(df, tf, count)
+            currency = MarketDataService._currency_for(symbol)
             
-            if tf in ["1D", "DAILY"] and isinstance(df.index, pd.DatetimeIndex):
-                df.index = df.index.normalize()
-            
-            df = df.tail(count)
-            is_inr = symbol.endswith(".NS") or symbol.endswith(".BO") or symbol.startswith("^NSE") or symbol.startswith("^CNX") or symbol.startswith("NIFTY") or symbol.startswith("NSE:") or symbol.startswith("BSE:")
-            currency = "INR" if is_inr else "USD"
-            
-            # 2. Update Memory Cache (with size-limiting)
-            if len(MarketDataService._ohlcv_cache) >= MarketDataService.MAX_CACHE_ITEMS:
-                # Simple clear when full to keep memory low
-                MarketDataService._ohlcv_cache.clear()
-
-            MarketDataService._ohlcv_cache[cache_key] = {
-                'df': df.copy(),
+            # 2. Update Memory Cache (LRU handles size-limiting)
+            MarketDataService._ohlcv_cache.set(cache_key, {
+                'df': df,
                 'currency': currency,
                 'source': "yahoo",
                 'timestamp': time.time()
-            }
+            })
             # 3. Save to Disk Persistence
             MarketDataService._save_to_disk(symbol, tf, df)
             
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class OHLCVCache:
+    """
+    Thread-safe LRU cache for OHLCV entries.
+
+    Entries are dicts shaped like ``{'df', 'currency', 'source', 'timestamp'}``.
+    Eviction is least-recently-used, bounded both by item count and by the total
+    memory of the cached DataFrames. ``timestamp`` is the time the data was fetched;
+    entries older than ``ttl`` seconds are treated as misses unless ``allow_stale``.
+
+    Cached frames are frozen on insert (numpy arrays marked non-writeable) so they can be
+    handed out without copying; use ``view()`` to get a frame that can take scratch columns.
+    """
+
+    def __init__(self, max_items: int = 400, max_bytes: int = 64 * 1024 * 1024, ttl: float = 600):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _sizeof(entry: Dict[str, Any]) -> int:
+        df = entry.get('df')
+        if isinstance(df, pd.DataFrame):
+            return int(df.memory_usage(index=True, deep=False).sum())
+        return 0
+
+    @staticmethod
+    def freeze(df: pd.DataFrame) -> pd.DataFrame:
+        """Returns a copy of ``df`` whose column arrays are read-only."""
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            if isinstance(series.dtype, np.dtype):
+                arr = np.array(series.to_numpy(), copy=True)
+                arr.flags.writeable = False
+                columns[col] = arr
+            else:
+                columns[col] = series.copy()
+        frozen = pd.DataFrame(columns, index=df.index.copy(), copy=False)
+        frozen.columns = df.columns
+        return frozen
+
+    @staticmethod
+    def view(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shallow (copy-on-write) view of a cached frame: new columns and renames stay local,
+        the price arrays are shared. In-place value edits need an explicit ``.copy()``.
+        """
+        return df.copy(deep=False)
+
+    def _is_fresh(self, entry: Dict[str, Any], now: float) -> bool:
+        return (now - entry.get('timestamp', 0)) < self.ttl
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """Returns the entry for ``key`` if present (and fresh, unless allow_stale), marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if not allow_stale and not self._is_fresh(entry, time.time()):
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def find_latest(self, prefix: str) -> Optional[Dict[str, Any]]:
+        """Returns the most recently fetched fresh entry whose key starts with ``prefix``."""
+        now = time.time()
+        with self._lock:
+            matches = [e for k, e in self._entries.items() if k.startswith(prefix) and self._is_fresh(e, now)]
+        if not matches:
+            return None
+        return max(matches, key=lambda e: e.get('timestamp', 0))
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        if isinstance(entry.get('df'), pd.DataFrame):
+            entry = {**entry, 'df': self.freeze(entry['df'])}
+        size = self._sizeof(entry)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes.pop(key, 0)
+                del self._entries[key]
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        # Never evict the entry that was just inserted, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (len(self._entries) > self.max_items or self._bytes > self.max_bytes):
+            key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(key, 0)
+            self.evictions += 1
+
+    def pop(self, key: str, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._bytes -= self._sizes.pop(key, 0)
+            return self._entries.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "maxItems": self.max_items,
+                "maxBytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    _PARQUET_ENGINE = "pyarrow"
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        _PARQUET_ENGINE = "fastparquet"
+    except ImportError:
+        _PARQUET_ENGINE = None
+        print("WARNING: [OHLCVStore] No parquet engine installed. Falling back to CSV persistence.", flush=True)
+
+
+class OHLCVStore:
+    """
+    Columnar on-disk OHLCV store.
+
+    Layout: ``app/data/ohlcv_store/<tf>/<symbol>.parquet`` — partitioned by timeframe,
+    one file per symbol. Price columns are stored as float64, volume as int64 and the
+    index as a naive datetime64 ``timestamp`` so loads need no re-detection or re-sorting.
+    """
+
+    ROOT = Path(__file__).parent.parent / "data" / "ohlcv_store"
+    LEGACY_ROOT = Path(__file__).parent.parent / "data" / "ohlcv_cache"
+    PRICE_COLUMNS = ("open", "high", "low", "close")
+    BULK_LOAD_WORKERS = 8
+
+    _path_locks: Dict[Path, threading.Lock] = {}
+    _locks_lock = threading.Lock()
+
+    @staticmethod
+    def _safe_symbol(symbol: str) -> str:
+        return "".join(c for c in symbol if c.isalnum() or c in ('^', '.'))
+
+    @classmethod
+    def path(cls, symbol: str, tf: str) -> Path:
+        suffix = "parquet" if _PARQUET_ENGINE else "csv"
+        return cls.ROOT / tf / f"{cls._safe_symbol(symbol)}.{suffix}"
+
+    @classmethod
+    def _legacy_path(cls, symbol: str, tf: str) -> Path:
+        return cls.LEGACY_ROOT / f"{cls._safe_symbol(symbol)}_{tf}.csv"
+
+    @classmethod
+    def _lock_for(cls, path: Path) -> threading.Lock:
+        with cls._locks_lock:
+            if path not in cls._path_locks:
+                cls._path_locks[path] = threading.Lock()
+            return cls._path_locks[path]
+
+    @staticmethod
+    def normalize(df: pd.DataFrame, tf: str) -> pd.DataFrame:
+        """Coerces a raw OHLCV frame into the store schema (typed columns, sorted datetime index)."""
+        df = df.copy()
+        df.columns = [str(c).lower() for c in df.columns]
+
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.to_datetime(df.index)
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        if tf in ["1D", "DAILY"]:
+            df.index = df.index.normalize()
+        df.index = df.index.astype("datetime64[ns]")
+        df.index.name = "timestamp"
+
+        for col in df.columns:
+            if col == "volume":
+                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64")
+            else:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df[~df.index.duplicated(keep="last")]
+
+    @classmethod
+    def _write_file(cls, path: Path, df: pd.DataFrame) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        if _PARQUET_ENGINE:
+            df.to_parquet(tmp, engine=_PARQUET_ENGINE, index=True)
+        else:
+            df.to_csv(tmp, index=True)
+        # Atomic swap so concurrent readers never observe a half-written file
+        os.replace(tmp, path)
+
+    @classmethod
+    def _read_file(cls, path: Path) -> pd.DataFrame:
+        if _PARQUET_ENGINE:
+            return pd.read_parquet(path, engine=_PARQUET_ENGINE)
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        df.index.name = "timestamp"
+        return df
+
+    @staticmethod
+    def _read_legacy_csv(path: Path) -> Optional[pd.DataFrame]:
+        """Parses the old per-symbol CSV cache, which had no fixed index column."""
+        df = pd.read_csv(path)
+        if df.empty:
+            return None
+        cols = [str(c).lower() for c in df.columns]
+        for candidate in ("timestamp", "datetime", "date"):
+            if candidate in cols:
+                df.set_index(df.columns[cols.index(candidate)], inplace=True)
+                break
+        else:
+            if df.columns[0] == 'Unnamed: 0':
+                df.set_index(df.columns[0], inplace=True)
+        df.index = pd.to_datetime(df.index, utc=True).tz_localize(None)
+        return df
+
+    @classmethod
+    def _merge(cls, existing: Optional[pd.DataFrame], new: pd.DataFrame, tf: str) -> pd.DataFrame:
+        """Stored bars strictly older than the first incoming bar, followed by the incoming rows."""
+        if existing is None or existing.empty:
+            return new
+        head = existing[existing.index < new.index[0]]
+        return cls.normalize(pd.concat([head, new]), tf) if not head.empty else new
+
+    @classmethod
+    def write(cls, symbol: str, tf: str, df: pd.DataFrame) -> None:
+        """
+        Persists a fetched series for (symbol, tf). Stored bars older than the first incoming
+        bar are kept, so a short batch fetch (screener, sector rotation) refreshes the tail of
+        a longer stored history instead of truncating it.
+        """
+        if df is None or df.empty:
+            return
+        path = cls.path(symbol, tf)
+        new = cls.normalize(df, tf)
+        with cls._lock_for(path):
+            existing = cls._read_file(path) if path.exists() else None
+            cls._write_file(path, cls._merge(existing, new, tf))
+
+    @classmethod
+    def append(cls, symbol: str, tf: str, df: pd.DataFrame, full: Optional[pd.DataFrame] = None) -> int:
+        """
+        Appends bars to the stored series. Stored bars strictly older than the first
+        incoming bar are kept as-is; everything from that point on (including the
+        previously partial last bar) is replaced by the incoming rows.
+
+        ``full`` is the complete series the delta was merged into. It is written instead
+        when there is no stored file, or the stored one is shorter, so a delta never
+        becomes the whole series on disk.
+        Returns the number of rows written beyond the previous tail.
+        """
+        if df is None or df.empty:
+            return 0
+        path = cls.path(symbol, tf)
+        new = cls.normalize(df, tf)
+        with cls._lock_for(path):
+            existing = cls._read_file(path) if path.exists() else None
+            if full is not None and not full.empty and (existing is None or len(existing) < len(full)):
+                new = cls.normalize(full, tf)
+            if existing is None or existing.empty:
+                cls._write_file(path, new)
+                return len(new)
+            prev_last = existing.index[-1]
+            cls._write_file(path, cls._merge(existing, new, tf))
+            return int((new.index > prev_last).sum())
+
+    @classmethod
+    def read(cls, symbol: str, tf: str) -> Optional[pd.DataFrame]:
+        path = cls.path(symbol, tf)
+        try:
+            if path.exists():
+                return cls._read_file(path)
+
+            # One-time migration from the legacy CSV cache
+            legacy = cls._legacy_path(symbol, tf)
+            if legacy.exists():
+                df = cls._read_legacy_csv(legacy)
+                if df is not None:
+                    df = cls.normalize(df, tf)
+                    with cls._lock_for(path):
+                        cls._write_file(path, df)
+                    return df
+        except Exception as e:
+            print(f"DEBUG: [OHLCVStore] Failed to load {symbol} ({tf}): {e}", flush=True)
+        return None
+
+    @classmethod
+    def mtime(cls, symbol: str, tf: str) -> Optional[float]:
+        path = cls.path(symbol, tf)
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    @classmethod
+    def last_timestamp(cls, symbol: str, tf: str) -> Optional[pd.Timestamp]:
+        df = cls.read(symbol, tf)
+        if df is None or df.empty:
+            return None
+        return df.index[-1]
+
+    @classmethod
+    def read_many(cls, symbols: Iterable[str], tf: str, max_age: Optional[float] = None) -> Dict[str, Tuple[pd.DataFrame, float]]:
+        """
+        Bulk-loads stored series for many symbols in parallel.
+        Symbols with no file, or whose file is older than ``max_age`` seconds, are omitted.
+        Returns {symbol: (df, mtime)}.
+        """
+        now = time.time()
+        candidates = []
+        for sym in symbols:
+            mtime = cls.mtime(sym, tf)
+            if mtime is None:
+                # Legacy CSV may still exist; let read() migrate it
+                legacy = cls._legacy_path(sym, tf)
+                if not legacy.exists():
+                    continue
+                mtime = os.path.getmtime(legacy)
+            if max_age is not None and (now - mtime) >= max_age:
+                continue
+            candidates.append((sym, mtime))
+
+        if not candidates:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(cls.BULK_LOAD_WORKERS, len(candidates))) as executor:
+            futures = {executor.submit(cls.read, sym, tf): (sym, mtime) for sym, mtime in candidates}
+            for future, (sym, mtime) in futures.items():
+                df = future.result()
+                if df is not None and not df.empty:
+                    results[sym] = (df, mtime)
+        return results
@@ -7,14 +7,19 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 import asyncio
+import concurrent.futures
 import json
+import multiprocessing
 import os
+import threading
 import time
 
 from app.services.constituent_service import ConstituentService
 from app.services.sector_service import SectorService
 from app.services.fundamentals import FundamentalService
 from app.services.signal_archive_service import SignalArchiveService
+from app.services.live_bar_buffer import LiveBarBuffer
+from app.services.shared_cache_service import SharedCacheService
 from app.utils.market_calendar import MarketCalendar
 
 from app.engine.regime import MarketRegimeEngine
@@ -50,7 +55,14 @@ class ScreenerService:
     }
 
     _intelligence_dict: Dict[str, Dict] = {}
-    _realtime_buffers: Dict[str, pd.DataFrame] = {}
+    # Live tick path: display symbol -> compact daily bars, plus the scoring context of the last cycle
+    _realtime_buffers: Dict[str, LiveBarBuffer] = {}
+    _live_context: Dict[str, tuple] = {}
+    _live_regime: Dict[str, Any] = {}
+    _live_active_sectors: List[str] = []
+    _live_dirty: bool = False
+    _live_copies: set = set()  # symbols whose intelligence entry is a live-patched copy, not a memo payload
+    _last_metrics: Dict[str, Any] = {"symbols_updated_per_batch": 0, "live_patched": 0, "live_errors": 0}
     _locks = {}
     
     # Simple global avoid list registry: symbol -> avoid_until (datetime)
@@ -58,6 +70,20 @@ class ScreenerService:
     _avoid_reasons: Dict[str, str] = {}
 
     CACHE_TTL = 900 
+    SHARED_SCREEN_WAIT = 240  # How long a worker waits on another worker's screen before running its own
+
+    # Parallel scoring stage (SCREENER_WORKERS=1 forces inline scoring)
+    SCORING_WORKERS = int(os.getenv("SCREENER_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PARALLEL_MIN_SYMBOLS = 150  # below this, process start-up and pickling cost more than they save
+    SCORING_TIMEOUT = 120
+    FUNDAMENTALS_WORKERS = 8
+    _scoring_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+    _scoring_pool_lock = threading.Lock()
+
+    # Incremental screening: (symbol, timeframe) -> (input fingerprint, scoring outcome)
+    _score_memo: Dict[tuple, tuple] = {}
+    _score_memo_lock = threading.RLock()
+    _sector_counts: Dict[str, int] = {}
 
     @classmethod
     def get_screener_data(cls, timeframe: str = "1D", force: bool = False) -> Dict:
@@ -76,6 +102,21 @@ class ScreenerService:
                 "source": "cached"
             }
 
+        if not force and SharedCacheService.is_enabled():
+            # Multi-worker: adopt a screen another process published, else run it under a
+            # cross-process lock so only one worker screens the universe at a time
+            shared_key = f"screener:{normalized_tf}"
+            with SharedCacheService.single_flight(shared_key, timeout=cls.SHARED_SCREEN_WAIT):
+                shared = SharedCacheService.get(shared_key, cls.CACHE_TTL)
+                if shared is not None:
+                    cls._cache = shared
+                    return {
+                        "hits": shared["data"],
+                        "sector_concentration": shared.get("sector_concentration", []),
+                        "source": "cached"
+                    }
+                return cls.get_screener_data(timeframe=timeframe, force=True)
+
         print(f"[Screener] Initiating full quantitative screen for timeframe: {normalized_tf}...", flush=True)
 
         # 1. Fetch Global Index Data to Calculate Market Regime (Module 1)
@@ -107,8 +148,8 @@ class ScreenerService:
         except Exception as e:
             print(f"[Screener] Error logging trades in TradeTrackingService: {e}", flush=True)
 
-        # Calculate sector concentration (Rule 15)
-        sector_concentration = cls._calculate_sector_concentration(all_hits)
+        # Patch intelligence caches in place; sector concentration (Rule 15) follows the changed hits only
+        sector_concentration = cls._merge_intelligence(all_hits)
 
         # Update caches
         cls._cache = {
@@ -117,13 +158,7 @@ class ScreenerService:
             "timeframe": normalized_tf,
             "sector_concentration": sector_concentration
         }
-
-        cls._intelligence_dict = {h["symbol"]: h for h in all_hits}
-        cls._intelligence_cache = {
-            "data": all_hits,
-            "last_updated": datetime.now(),
-            "status": "ready"
-        }
+        SharedCacheService.set(f"screener:{normalized_tf}", cls._cache, created=current_time)
 
         return {
             "hits": all_hits,
@@ -244,172 +279,370 @@ class ScreenerService:
         # Batch fetch stock prices
         batch_results = MarketDataService.get_ohlcv_batch(symbols, timeframe, count=100)
         
+        # Stage 1 (this thread): cheap filters and the I/O-bound fundamentals lookups
+        now = datetime.now()
+        candidates = []
         for symbol, result in batch_results.items():
-            try:
-                df, currency, err, source = result
-                if df is None or df.empty or len(df) < 50:
-                    continue
-                
-                display_symbol = symbol.replace(".NS", "").replace(".BO", "")
-                
-                # Check Avoid List (Day 2 failed breakouts / bad results cooldown)
-                now = datetime.now()
-                if display_symbol in cls._avoid_registry:
-                    if now < cls._avoid_registry[display_symbol]:
-                        print(f"[Screener] Skipping {display_symbol}: Marked AVOID until {cls._avoid_registry[display_symbol].isoformat()}")
-                        continue
-                
-                # Enforce Governance & Quality Hard Gates (Golden Rule 5)
-                funda = FundamentalService.get_fundamentals(symbol)
-                if funda:
-                    roe = funda.get("roe", 0.0) or 0.0
-                    mcap_str = funda.get("market_cap", "—")
-                    
-                    # Estimate Cap in Crores
-                    mcap_cr = 0.0
-                    if "Cr" in mcap_str:
-                        mcap_cr = float(mcap_str.replace("Cr", ""))
-                    elif "B" in mcap_str:
-                        mcap_cr = float(mcap_str.replace("B", "")) * 80.0 # Convert USD B to Cr approx
-                    
-                    # Golden Rule 4 & 5 Hard Filters
-                    if mcap_cr > 0 and mcap_cr < 3000.0:
-                        continue # MCAP too small
-                    if roe > 0 and roe < 15.0:
-                        continue # Failed quality bar
-
-                # Identify Sector & active state
-                sector_key = ConstituentService.get_sector_for_ticker(symbol) or "UNKNOWN"
-                clean_sector_name = sector_key.replace("NIFTY_", "")
-                is_active_sector = clean_sector_name in active_sector_names
-                sector_state = "LEADING" if is_active_sector else "NEUTRAL"
-                
-                # Calculate Technical Variables
-                close_prices = df["Close" if "Close" in df.columns else "close"]
-                volumes = df["Volume" if "Volume" in df.columns else "volume"]
-                
-                avg_vol_20d = float(volumes.rolling(20).mean().iloc[-1])
-                vol_ratio = float(volumes.iloc[-1] / avg_vol_20d) if avg_vol_20d > 0 else 1.0
-
-                # Day 1 Breakout Engine Check (Module 7)
-                breakout_res = BreakoutEngine.evaluate_breakout_day1(
-                    df_daily=df,
-                    avg_vol_20d=avg_vol_20d,
-                    active_sector=is_active_sector
-                )
-                
-                signal_status = breakout_res.get("status", "WATCHLIST")
-                
-                # If fresh breakout is detected, check if we need to simulate Day 2 confirmation
-                if signal_status == "FRESH BREAKOUT":
-                    # Check if day 2 confirmation holds
-                    day2_res = BreakoutEngine.evaluate_breakout_day2(
-                        df_daily=df,
-                        breakout_zone=breakout_res["trigger_price"],
-                        day1_sl=breakout_res["stop_loss"]
-                    )
-                    
-                    if day2_res["status"] == "FAILED BREAKOUT":
-                        # Record Avoid list (Rule 3)
-                        cls._avoid_registry[display_symbol] = datetime.now() + timedelta(days=10)
-                        cls._avoid_reasons[display_symbol] = "Failed breakout on Day 2"
-                        continue # Skip entirely, liquidate signal
-                    
-                    signal_status = day2_res["status"]
-
-                # Enforce Earnings Events Protection (Golden Rule 6)
-                # Auto-exit 2 days before results, reject entries 3 days before
-                upcoming_results_days = 5 # Mock: TCS has results in 5 days, Dixon in 2 days
-                if display_symbol == "DIXON":
-                    upcoming_results_days = 2
-                elif display_symbol == "INFY":
-                    upcoming_results_days = 3
-                
-                is_earnings_exit = False
-                if upcoming_results_days <= 2:
-                    signal_status = "EXIT NOW"
-                    is_earnings_exit = True
-                elif upcoming_results_days <= 3 and signal_status in ["FRESH BREAKOUT", "CONFIRMED BREAKOUT"]:
-                    signal_status = "WATCHLIST" # Deny new entries
-
-                # Enforce Story Sentiment Exit checks (Golden Rule 7 & 13)
-                story_res = StorySentimentEngine.calculate_story_score(
-                    policy_tailwind=90.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 60.0,
-                    macro_alignment=85.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 55.0,
-                    sentiment_score=80.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 50.0,
-                    theme_momentum=85.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 55.0
-                )
-                
-                if story_res["status"] == "Dead Story":
-                    signal_status = "EXIT NOW" # Force auto-exit
-
-                # Run Multi-Timeframe Alignment (Module 16)
-                mtf_res = MultiTimeframeEngine.evaluate_mtf_alignment(df, df, df) # Simulated 3-TF
-
-                # Master Composite Score formulation (25% Fund, 25% Breakout, 20% Sector, 15% RS, 15% Vol)
-                fund_points = 20 if funda and (funda.get("roe", 0) or 0) > 20 else 12
-                breakout_points = 22 if signal_status == "CONFIRMED BREAKOUT" else 15
-                sector_points = 18 if is_active_sector else 10
-                rs_points = 12 if vol_ratio > 1.8 else 8
-                vol_points = 13 if vol_ratio > 2.0 else 7
-                
-                composite_score = int(fund_points + breakout_points + sector_points + rs_points + vol_points)
-
-                # AI Confidence score layer (Module 17)
-                ai_conf = int((composite_score + 15 + mtf_res["bullish_count"]*5 + (30 if is_active_sector else 0)) / 1.5)
-                ai_conf = min(max(ai_conf, 0), 100)
-
-                # Risk & Sizing calculations (Module 14/15)
-                stop_loss = breakout_res.get("stop_loss", float(close_prices.iloc[-1] * 0.95))
-                risk_res = RiskManager.calculate_position_size(
-                    portfolio_val=1000000.0, # 10 Lakh portfolio default
-                    price=float(close_prices.iloc[-1]),
-                    stop_loss=stop_loss,
-                    regime=regime_data["regime"],
-                    active_sector_exposure_pct=22.0, # Active sector current exposure
-                    expected_upside_pct=18.0 # Default expected target move
-                )
+            df = result[0]
+            if df is None or df.empty or len(df) < 50:
+                continue
+
+            # Check Avoid List (Day 2 failed breakouts / bad results cooldown)
+            display_symbol = symbol.replace(".NS", "").replace(".BO", "")
+            if display_symbol in cls._avoid_registry and now < cls._avoid_registry[display_symbol]:
+                print(f"[Screener] Skipping {display_symbol}: Marked AVOID until {cls._avoid_registry[display_symbol].isoformat()}")
+                continue
+            candidates.append((symbol, df))
+
+        fundamentals = cls._prefetch_fundamentals([symbol for symbol, _ in candidates])
+        tasks = [
+            (symbol, df, fundamentals.get(symbol), ConstituentService.get_sector_for_ticker(symbol) or "UNKNOWN")
+            for symbol, df in candidates
+            if not isinstance(fundamentals.get(symbol), Exception)
+        ]
+        for symbol, funda in fundamentals.items():
+            if isinstance(funda, Exception):
+                print(f"[Screener] Warning: Processing failed for symbol {symbol}: {funda}")
+
+        # Stage 2: CPU-bound scoring of the symbols whose inputs changed since the last cycle,
+        # fanned out across worker processes for large universes
+        fingerprints = [cls._score_fingerprint(task, timeframe, regime_data, active_sector_names) for task in tasks]
+        with cls._score_memo_lock:
+            memo = [cls._score_memo.get((task[0], timeframe)) for task in tasks]
+        stale = [i for i, (fp, entry) in enumerate(zip(fingerprints, memo)) if entry is None or entry[0] != fp]
+
+        outcomes = [entry[1] if entry is not None else None for entry in memo]
+        rescored = cls._score_tasks([tasks[i] for i in stale], regime_data, active_sector_names)
+        with cls._score_memo_lock:
+            for i, outcome in zip(stale, rescored):
+                outcomes[i] = outcome
+                key = (tasks[i][0], timeframe)
+                if outcome is not None and outcome[0] == "error":
+                    cls._score_memo.pop(key, None)
+                else:
+                    cls._score_memo[key] = (fingerprints[i], outcome)
+        print(f"DEBUG: [Screener] Rescored {len(stale)}/{len(tasks)} symbols", flush=True)
+
+        # Stage 3: merge in input order so ranking ties resolve exactly as in a serial run
+        for (symbol, _, _, _), outcome in zip(tasks, outcomes):
+            if outcome is None:
+                continue
+            kind, payload = outcome
+            display_symbol = symbol.replace(".NS", "").replace(".BO", "")
+            if kind == "hit":
+                hits.append(payload)
+            elif kind == "avoid":
+                cls._avoid_registry[display_symbol] = datetime.now() + timedelta(days=10)
+                cls._avoid_reasons[display_symbol] = payload
+            else:
+                print(payload, end="")
+                print(f"[Screener] Warning: Processing failed for symbol {symbol}")
 
-                # Downgrade Hard Gate: if R:R < 1:3 or expected move < 15%, downgrade
-                if risk_res["status"] == "REJECT" and not is_earnings_exit:
-                    signal_status = "WATCHLIST"
-
-                entry_tag = "STRONG_ENTRY" if signal_status == "FRESH BREAKOUT" else ("ENTRY_READY" if signal_status == "CONFIRMED BREAKOUT" else ("AVOID" if ("EXIT" in signal_status or "AVOID" in signal_status) else "WATCHLIST"))
-
-                # Standardize outputs
-                hits.append({
-                    "symbol": display_symbol,
-                    "price": float(round(close_prices.iloc[-1], 2)),
-                    "change": float(round(close_prices.pct_change().iloc[-1] * 100, 2)),
-                    "volRatio": float(round(vol_ratio, 2)),
-                    "sector": clean_sector_name.replace("_", " "),
-                    "sectorKey": sector_key,
-                    "sectorState": sector_state,
-                    "signal": signal_status,
-                    "entryTag": entry_tag,
-                    "score": composite_score,
-                    "confidence": ai_conf,
-                    "stop_loss": float(round(stop_loss, 2)),
-                    "target_price": float(round(close_prices.iloc[-1] * 1.18, 2)),
-                    "risk_reward": "1:3.6",
-                    "upside": "18%",
-                    "tag": "Confirmed Breakout" if signal_status == "CONFIRMED BREAKOUT" else ("Fresh Breakout" if signal_status == "FRESH BREAKOUT" else "Compression base"),
-                    "mtf_alignment": mtf_res["status"],
-                    "story_status": story_res["status"],
-                    "story_score": story_res["score"],
-                    "position_size_pct": risk_res.get("allocation_pct", 5.0) if risk_res["status"] == "APPROVED" else 0.0,
-                    "mktCap": funda.get("market_cap", "—") if funda else "—",
-                    "rsi": 71 if signal_status == "CONFIRMED BREAKOUT" else 64
-                })
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                print(f"[Screener] Warning: Processing failed for symbol {symbol}: {e}")
+        if timeframe == "1D":
+            cls._seed_live_buffers(tasks, fingerprints, regime_data, active_sector_names)
 
         # Rank all hits by composite score descending
         hits.sort(key=lambda x: x["score"], reverse=True)
         return hits
 
+    @classmethod
+    def _seed_live_buffers(cls, tasks: List[tuple], fingerprints: List[tuple], regime_data: Dict[str, Any],
+                           active_sector_names: List[str]) -> None:
+        """(Re)seeds live bar buffers for symbols whose daily inputs changed since they were last seeded."""
+        buffers: Dict[str, LiveBarBuffer] = {}
+        context: Dict[str, tuple] = {}
+        for (symbol, df, funda, sector_key), fingerprint in zip(tasks, fingerprints):
+            display_symbol = symbol.replace(".NS", "").replace(".BO", "")
+            buffer = cls._realtime_buffers.get(display_symbol)
+            if buffer is None or buffer.fingerprint != fingerprint:
+                try:
+                    buffer = LiveBarBuffer(df, fingerprint=fingerprint)
+                except Exception as e:
+                    print(f"[Screener] Warning: Live buffer seed failed for {symbol}: {e}", flush=True)
+                    continue
+            buffers[display_symbol] = buffer
+            context[display_symbol] = (symbol, funda, sector_key)
+        cls._realtime_buffers = buffers
+        cls._live_context = context
+        cls._live_regime = dict(regime_data)
+        cls._live_active_sectors = list(active_sector_names)
+
+    @classmethod
+    def _prefetch_fundamentals(cls, symbols: List[str]) -> Dict[str, Any]:
+        """Fetches fundamentals for ``symbols`` concurrently; failures are returned as the exception."""
+        results: Dict[str, Any] = {}
+        if not symbols:
+            return results
+
+        def fetch(symbol):
+            try:
+                return symbol, FundamentalService.get_fundamentals(symbol)
+            except Exception as e:
+                return symbol, e
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(cls.FUNDAMENTALS_WORKERS, len(symbols))) as executor:
+            for symbol, funda in executor.map(fetch, symbols):
+                results[symbol] = funda
+        return results
+
+    @classmethod
+    def _get_scoring_pool(cls) -> concurrent.futures.ProcessPoolExecutor:
+        with cls._scoring_pool_lock:
+            if cls._scoring_pool is None:
+                # spawn, not fork: the API process runs background threads that fork would copy mid-lock
+                ctx = multiprocessing.get_context("spawn")
+                cls._scoring_pool = concurrent.futures.ProcessPoolExecutor(max_workers=cls.SCORING_WORKERS, mp_context=ctx)
+                print(f"DEBUG: [Screener] Started scoring pool with {cls.SCORING_WORKERS} workers", flush=True)
+            return cls._scoring_pool
+
+    @classmethod
+    def _reset_scoring_pool(cls) -> None:
+        with cls._scoring_pool_lock:
+            pool, cls._scoring_pool = cls._scoring_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def _score_tasks(cls, tasks: List[tuple], regime_data: Dict[str, Any], active_sector_names: List[str]) -> List[Optional[tuple]]:
+        """
+        Scores ``tasks`` and returns one outcome per task, in task order. Universes smaller than
+        ``PARALLEL_MIN_SYMBOLS`` (or ``SCREENER_WORKERS`` <= 1) are scored inline; larger ones
+        are split into chunks and mapped over a persistent process pool.
+        """
+        workers = cls.SCORING_WORKERS
+        if workers <= 1 or len(tasks) < cls.PARALLEL_MIN_SYMBOLS:
+            return cls._score_chunk(tasks, regime_data, active_sector_names)
+
+        # ~4 chunks per worker keeps stragglers short without paying per-symbol IPC
+        chunk_size = max(1, -(-len(tasks) // (workers * 4)))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        try:
+            pool = cls._get_scoring_pool()
+            futures = [pool.submit(ScreenerService._score_chunk, chunk, regime_data, active_sector_names) for chunk in chunks]
+            outcomes: List[Optional[tuple]] = []
+            for future in futures:
+                outcomes.extend(future.result(timeout=cls.SCORING_TIMEOUT))
+            return outcomes
+        except Exception as e:
+            print(f"WARNING: [Screener] Parallel scoring failed ({e!r}); scoring {len(tasks)} symbols inline.", flush=True)
+            cls._reset_scoring_pool()
+            return cls._score_chunk(tasks, regime_data, active_sector_names)
+
+    @staticmethod
+    def _score_chunk(tasks: List[tuple], regime_data: Dict[str, Any], active_sector_names: List[str]) -> List[Optional[tuple]]:
+        outcomes = []
+        for symbol, df, funda, sector_key in tasks:
+            try:
+                outcomes.append(ScreenerService._score_symbol(symbol, df, funda, sector_key, regime_data, active_sector_names))
+            except Exception:
+                import traceback
+                outcomes.append(("error", traceback.format_exc()))
+        return outcomes
+
+    @staticmethod
+    def _score_symbol(
+        symbol: str,
+        df: pd.DataFrame,
+        funda: Optional[Dict[str, Any]],
+        sector_key: str,
+        regime_data: Dict[str, Any],
+        active_sector_names: List[str]
+    ) -> Optional[tuple]:
+        """
+        Pure per-symbol scoring (runs inside worker processes). Returns ("hit", row),
+        ("avoid", reason) for a failed Day 2 breakout, or None if the symbol is filtered out.
+        """
+        return ScreenerService._compose_outcome(
+            symbol, ScreenerService._symbol_features(df), funda, sector_key, regime_data, active_sector_names
+        )
+
+    @staticmethod
+    def _symbol_features(df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Every price/volume input the scoring rules read, taken from the last bar of ``df``.
+        ``LiveBarBuffer.features`` produces the same keys from streaming state.
+        """
+        close_prices = df["Close" if "Close" in df.columns else "close"]
+        volumes = df["Volume" if "Volume" in df.columns else "volume"]
+        highs = df["High" if "High" in df.columns else "high"]
+        lows = df["Low" if "Low" in df.columns else "low"]
+        n_bars = len(df)
+        return {
+            "n_bars": n_bars,
+            "close": close_prices.iloc[-1],
+            "prev_close": close_prices.iloc[-2] if n_bars > 1 else np.nan,
+            "high": highs.iloc[-1],
+            "low": lows.iloc[-1],
+            "volume": volumes.iloc[-1],
+            "prev_low": lows.iloc[-2] if n_bars > 1 else np.nan,
+            "avg_vol_20d": float(volumes.rolling(20).mean().iloc[-1]),
+            "dma_20": close_prices.rolling(20).mean().iloc[-1],
+            "dma_50": close_prices.rolling(50).mean().iloc[-1],
+            "dma_200": close_prices.rolling(200).mean().iloc[-1],
+            "resistance": highs.iloc[-60:-1].max(),
+            "ema_20": close_prices.ewm(span=20, adjust=False).mean().iloc[-1],
+            "ema_50": close_prices.ewm(span=50, adjust=False).mean().iloc[-1],
+        }
+
+    @staticmethod
+    def _compose_outcome(
+        symbol: str,
+        features: Dict[str, Any],
+        funda: Optional[Dict[str, Any]],
+        sector_key: str,
+        regime_data: Dict[str, Any],
+        active_sector_names: List[str]
+    ) -> Optional[tuple]:
+        """Applies the screening rules to precomputed ``features`` (shared by batch scoring and live ticks)."""
+        display_symbol = symbol.replace(".NS", "").replace(".BO", "")
+
+        # Enforce Governance & Quality Hard Gates (Golden Rule 5)
+        if funda:
+            roe = funda.get("roe", 0.0) or 0.0
+            mcap_str = funda.get("market_cap", "—")
+
+            # Estimate Cap in Crores
+            mcap_cr = 0.0
+            if "Cr" in mcap_str:
+                mcap_cr = float(mcap_str.replace("Cr", ""))
+            elif "B" in mcap_str:
+                mcap_cr = float(mcap_str.replace("B", "")) * 80.0 # Convert USD B to Cr approx
+
+            # Golden Rule 4 & 5 Hard Filters
+            if mcap_cr > 0 and mcap_cr < 3000.0:
+                return None # MCAP too small
+            if roe > 0 and roe < 15.0:
+                return None # Failed quality bar
+
+        # Identify Sector & active state
+        clean_sector_name = sector_key.replace("NIFTY_", "")
+        is_active_sector = clean_sector_name in active_sector_names
+        sector_state = "LEADING" if is_active_sector else "NEUTRAL"
+
+        # Calculate Technical Variables
+        last_close = features["close"]
+        avg_vol_20d = features["avg_vol_20d"]
+        vol_ratio = float(features["volume"] / avg_vol_20d) if avg_vol_20d > 0 else 1.0
+
+        # Day 1 Breakout Engine Check (Module 7)
+        breakout_res = BreakoutEngine.classify_day1(
+            n_bars=features["n_bars"],
+            close=float(last_close),
+            high=float(features["high"]),
+            low=float(features["low"]),
+            volume=float(features["volume"]),
+            avg_vol_20d=avg_vol_20d,
+            dma_20=features["dma_20"],
+            dma_50=features["dma_50"],
+            dma_200=features["dma_200"],
+            resistance=features["resistance"],
+            prev_low=features["prev_low"],
+            active_sector=is_active_sector
+        )
+
+        signal_status = breakout_res.get("status", "WATCHLIST")
+
+        # If fresh breakout is detected, check if we need to simulate Day 2 confirmation
+        if signal_status == "FRESH BREAKOUT":
+            # Check if day 2 confirmation holds
+            day2_res = BreakoutEngine.classify_day2(
+                close_day2=float(last_close),
+                breakout_zone=breakout_res["trigger_price"],
+                day1_sl=breakout_res["stop_loss"]
+            )
+
+            if day2_res["status"] == "FAILED BREAKOUT":
+                # Record Avoid list (Rule 3); applied by the caller so workers stay side-effect free
+                return ("avoid", "Failed breakout on Day 2") # Skip entirely, liquidate signal
+
+            signal_status = day2_res["status"]
+
+        # Enforce Earnings Events Protection (Golden Rule 6)
+        # Auto-exit 2 days before results, reject entries 3 days before
+        upcoming_results_days = 5 # Mock: TCS has results in 5 days, Dixon in 2 days
+        if display_symbol == "DIXON":
+            upcoming_results_days = 2
+        elif display_symbol == "INFY":
+            upcoming_results_days = 3
+
+        is_earnings_exit = False
+        if upcoming_results_days <= 2:
+            signal_status = "EXIT NOW"
+            is_earnings_exit = True
+        elif upcoming_results_days <= 3 and signal_status in ["FRESH BREAKOUT", "CONFIRMED BREAKOUT"]:
+            signal_status = "WATCHLIST" # Deny new entries
+
+        # Enforce Story Sentiment Exit checks (Golden Rule 7 & 13)
+        story_res = StorySentimentEngine.calculate_story_score(
+            policy_tailwind=90.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 60.0,
+            macro_alignment=85.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 55.0,
+            sentiment_score=80.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 50.0,
+            theme_momentum=85.0 if clean_sector_name in ["AI", "Pharma", "Defence"] else 55.0
+        )
+
+        if story_res["status"] == "Dead Story":
+            signal_status = "EXIT NOW" # Force auto-exit
+
+        # Run Multi-Timeframe Alignment (Module 16)
+        # Simulated 3-TF: the daily bias stands in for weekly and monthly
+        d_bias = MultiTimeframeEngine.trend_bias_from_emas(float(last_close), features["ema_20"], features["ema_50"]) if features["n_bars"] >= 50 else 0
+        mtf_res = MultiTimeframeEngine.classify_alignment(d_bias, d_bias, d_bias)
+
+        # Master Composite Score formulation (25% Fund, 25% Breakout, 20% Sector, 15% RS, 15% Vol)
+        fund_points = 20 if funda and (funda.get("roe", 0) or 0) > 20 else 12
+        breakout_points = 22 if signal_status == "CONFIRMED BREAKOUT" else 15
+        sector_points = 18 if is_active_sector else 10
+        rs_points = 12 if vol_ratio > 1.8 else 8
+        vol_points = 13 if vol_ratio > 2.0 else 7
+
+        composite_score = int(fund_points + breakout_points + sector_points + rs_points + vol_points)
+
+        # AI Confidence score layer (Module 17)
+        ai_conf = int((composite_score + 15 + mtf_res["bullish_count"]*5 + (30 if is_active_sector else 0)) / 1.5)
+        ai_conf = min(max(ai_conf, 0), 100)
+
+        # Risk & Sizing calculations (Module 14/15)
+        stop_loss = breakout_res.get("stop_loss", float(last_close * 0.95))
+        risk_res = RiskManager.calculate_position_size(
+            portfolio_val=1000000.0, # 10 Lakh portfolio default
+            price=float(last_close),
+            stop_loss=stop_loss,
+            regime=regime_data["regime"],
+            active_sector_exposure_pct=22.0, # Active sector current exposure
+            expected_upside_pct=18.0 # Default expected target move
+        )
+
+        # Downgrade Hard Gate: if R:R < 1:3 or expected move < 15%, downgrade
+        if risk_res["status"] == "REJECT" and not is_earnings_exit:
+            signal_status = "WATCHLIST"
+
+        entry_tag = "STRONG_ENTRY" if signal_status == "FRESH BREAKOUT" else ("ENTRY_READY" if signal_status == "CONFIRMED BREAKOUT" else ("AVOID" if ("EXIT" in signal_status or "AVOID" in signal_status) else "WATCHLIST"))
+
+        # Standardize outputs
+        return ("hit", {
+            "symbol": display_symbol,
+            "price": float(round(last_close, 2)),
+            "change": float(round((last_close / features["prev_close"] - 1) * 100, 2)),
+            "volRatio": float(round(vol_ratio, 2)),
+            "sector": clean_sector_name.replace("_", " "),
+            "sectorKey": sector_key,
+            "sectorState": sector_state,
+            "signal": signal_status,
+            "entryTag": entry_tag,
+            "score": composite_score,
+            "confidence": ai_conf,
+            "stop_loss": float(round(stop_loss, 2)),
+            "target_price": float(round(last_close * 1.18, 2)),
+            "risk_reward": "1:3.6",
+            "upside": "18%",
+            "tag": "Confirmed Breakout" if signal_status == "CONFIRMED BREAKOUT" else ("Fresh Breakout" if signal_status == "FRESH BREAKOUT" else "Compression base"),
+            "mtf_alignment": mtf_res["status"],
+            "story_status": story_res["status"],
+            "story_score": story_res["score"],
+            "position_size_pct": risk_res.get("allocation_pct", 5.0) if risk_res["status"] == "APPROVED" else 0.0,
+            "mktCap": funda.get("market_cap", "—") if funda else "—",
+            "rsi": 71 if signal_status == "CONFIRMED BREAKOUT" else 64
+        })
 
 
     @classmethod
@@ -419,13 +652,76 @@ class ScreenerService:
         for h in hits:
             s = h["sector"]
             counts[s] = counts.get(s, 0) + 1
-            
-        total = len(hits) if hits else 1
+        return cls._format_sector_concentration(counts, len(hits))
+
+    @staticmethod
+    def _format_sector_concentration(counts: Dict[str, int], total_hits: int) -> List[Dict]:
+        total = total_hits if total_hits else 1
         return [
             {"sector": sector, "count": count, "percentage": round((count / total) * 100, 1)}
-            for sector, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)
+            for sector, count in sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+            if count > 0
         ]
 
+    @classmethod
+    def _merge_intelligence(cls, hits: List[Dict]) -> List[Dict]:
+        """
+        Patches ``_intelligence_dict`` and ``_intelligence_cache`` in place with this cycle's hits
+        and returns the sector concentration. Hits reused from the scoring memo are the same
+        objects as last cycle, so only added, removed or rescored symbols touch the sector counts.
+        """
+        with cls._score_memo_lock:
+            current = cls._intelligence_dict
+            if sum(cls._sector_counts.values()) != len(current):
+                # Someone replaced the dict wholesale; rebuild the counts from it
+                cls._sector_counts = {}
+                for hit in current.values():
+                    cls._sector_counts[hit["sector"]] = cls._sector_counts.get(hit["sector"], 0) + 1
+
+            counts = cls._sector_counts
+            # Live-patched copies are replaced by this cycle's hits below
+            cls._live_copies = set()
+            seen = set()
+            changed = 0
+            for hit in hits:
+                symbol = hit["symbol"]
+                seen.add(symbol)
+                previous = current.get(symbol)
+                if previous is hit:
+                    continue
+                if previous is not None:
+                    counts[previous["sector"]] -= 1
+                counts[hit["sector"]] = counts.get(hit["sector"], 0) + 1
+                current[symbol] = hit
+                changed += 1
+            for symbol in [sym for sym in current if sym not in seen]:
+                counts[current.pop(symbol)["sector"]] -= 1
+                changed += 1
+
+            cls._intelligence_cache.update({
+                "data": hits,
+                "last_updated": datetime.now(),
+                "status": "ready"
+            })
+            print(f"DEBUG: [Screener] Intelligence merge: {changed} changed, {len(hits)} total", flush=True)
+            return cls._format_sector_concentration(counts, len(hits))
+
+    @staticmethod
+    def _score_fingerprint(task: tuple, timeframe: str, regime_data: Dict[str, Any], active_sector_names: List[str]) -> tuple:
+        """Everything ``_score_symbol`` reads for one symbol; equal fingerprints give equal outcomes."""
+        symbol, df, funda, sector_key = task
+        close = df["Close" if "Close" in df.columns else "close"]
+        volume = df["Volume" if "Volume" in df.columns else "volume"]
+        return (
+            timeframe,
+            len(df), df.index[0], df.index[-1],
+            float(close.iloc[-1]), float(volume.iloc[-1]),
+            regime_data.get("regime"),
+            sector_key,
+            sector_key.replace("NIFTY_", "") in active_sector_names,
+            (funda.get("roe"), funda.get("market_cap")) if funda else None,
+        )
+
     @classmethod
     def get_early_breakout_setups(cls, timeframe: str = "1D", limit: int = 5) -> List[Dict]:
         """Detects tight price compression bases (Module 5) as additive watchlist data for both India and US."""
@@ -824,16 +1120,64 @@ class ScreenerService:
 
     @classmethod
     async def update_symbol_realtime(cls, symbol: str, price: float, volume: int) -> Dict[str, Any]:
-        """Updates the real-time buffer for a streaming symbol tick."""
+        """Streaming entry point used by the Fyers socket batch loop."""
+        return cls.apply_live_tick(symbol, price, volume)
+
+    @classmethod
+    def apply_live_tick(cls, symbol: str, price: float, volume: int) -> Dict[str, Any]:
+        """
+        Folds a streaming tick into the symbol's live bar buffer and re-applies the scoring rules
+        to it, patching that symbol's entry in ``_intelligence_cache`` in place.
+        """
         clean_symbol = symbol.replace(".NS", "").replace(".BO", "").split(":")[-1].split("-")[0]
-        # We store the latest price and volume in _realtime_buffers for on-the-fly technical indicator scoring
+        buffer = cls._realtime_buffers.get(clean_symbol)
+        if buffer is None:
+            return {"symbol": clean_symbol, "price": price, "volume": volume, "status": "untracked"}
         try:
-            df = cls._realtime_buffers.get(clean_symbol)
-            if df is not None and not df.empty:
-                # Update the last row or append a live tick row
-                cls._realtime_buffers[clean_symbol].iloc[-1, df.columns.get_loc("Close" if "Close" in df.columns else "close")] = price
-                cls._realtime_buffers[clean_symbol].iloc[-1, df.columns.get_loc("Volume" if "Volume" in df.columns else "volume")] = volume
-        except Exception:
-            pass
-        return {"symbol": clean_symbol, "price": price, "volume": volume, "status": "updated"}
+            buffer.apply_tick(price, volume)
+            patched = cls._patch_live_hit(clean_symbol, buffer)
+        except Exception as e:
+            cls._last_metrics["live_errors"] = cls._last_metrics.get("live_errors", 0) + 1
+            print(f"[Screener] Warning: Live update failed for {clean_symbol}: {e}", flush=True)
+            return {"symbol": clean_symbol, "price": price, "volume": volume, "status": "error", "error": str(e)}
+        return {"symbol": clean_symbol, "price": price, "volume": volume, "status": "updated" if patched else "buffered"}
 
+    @classmethod
+    def _patch_live_hit(cls, clean_symbol: str, buffer: LiveBarBuffer) -> bool:
+        hit = cls._intelligence_dict.get(clean_symbol)
+        context = cls._live_context.get(clean_symbol)
+        if hit is None or context is None:
+            return False
+        symbol, funda, sector_key = context
+        outcome = cls._compose_outcome(
+            symbol, buffer.features(), funda, sector_key, cls._live_regime, cls._live_active_sectors
+        )
+        if outcome is None or outcome[0] != "hit":
+            # Live rules only move price-driven fields; drops and avoid-listing wait for the next cycle
+            return False
+        if clean_symbol not in cls._live_copies:
+            # The cycle's hit is the scoring memo's payload: patch a private copy so an unchanged
+            # fingerprint next cycle still yields the scored values
+            with cls._score_memo_lock:
+                patched = dict(hit)
+                data = cls._intelligence_cache.get("data", [])
+                for i, entry in enumerate(data):
+                    if entry is hit:
+                        data[i] = patched
+                        break
+                cls._intelligence_dict[clean_symbol] = patched
+                cls._live_copies.add(clean_symbol)
+            hit = patched
+        hit.update(outcome[1])
+        cls._live_dirty = True
+        cls._last_metrics["live_patched"] = cls._last_metrics.get("live_patched", 0) + 1
+        return True
+
+    @classmethod
+    def commit_live_batch(cls) -> None:
+        """Re-ranks the intelligence list once per tick batch if any entry was patched."""
+        if not cls._live_dirty:
+            return
+        cls._live_dirty = False
+        data = sorted(cls._intelligence_cache.get("data", []), key=lambda h: h["score"], reverse=True)
+        cls._intelligence_cache.update({"data": data, "live_updated": datetime.now()})
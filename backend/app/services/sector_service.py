@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import concurrent.futures
 import math
+import threading
 import time
+import warnings
 import sys
 """
 Sector Logic v1.0 (LOCKED)
@@ -23,6 +25,7 @@ import json
 from pathlib import Path
 from app.services.rotation_alerts import RotationAlertService
 from app.services.constituent_service import ConstituentService
+from app.services.shared_cache_service import SharedCacheService
 from app.ai.commentary import AICommentaryService
 
 class SectorService:
@@ -65,6 +68,13 @@ class SectorService:
         "timeframe": None
     }
     CACHE_TTL = 600 # 10 minutes
+    STALE_GRACE = 3600 # serve an expired result this long past its TTL while refreshing in the background
+    FLIGHT_TIMEOUT = 240 # matches MarketDataService.BATCH_TIMEOUT
+
+    # Results keyed by (timeframe, include_constituents); in-flight computations by the same key
+    _cache_lock = threading.Lock()
+    _cache_by_tf = {}
+    _inflight = {}
 
     @classmethod
     def calculate_state(cls, sector_return: float, benchmark_return: float, prev_rs: float) -> str:
@@ -92,12 +102,111 @@ class SectorService:
             
         return state
 
+    @classmethod
+    def _lookup(cls, key, ttl, now):
+        """Returns (entry, is_fresh) for ``key``; a fresh with-constituents result also satisfies a lighter request."""
+        entry = cls._cache_by_tf.get(key)
+        timeframe, include_constituents = key
+        if not include_constituents:
+            richer = cls._cache_by_tf.get((timeframe, True))
+            if richer is not None and (entry is None or richer["timestamp"] > entry["timestamp"]):
+                entry = richer
+        if entry is None or not entry.get("data"):
+            return None, False
+        return entry, (now - float(entry["timestamp"])) < ttl
+
+    @classmethod
+    def _compute_shared(cls, key, days):
+        """
+        Computes rotation data for ``key`` unless another worker process already published a
+        fresh result to the shared cache tier; only one process computes a key at a time.
+        """
+        shared_key = f"sector:{key[0]}:{int(key[1])}"
+        with SharedCacheService.single_flight(shared_key, timeout=cls.FLIGHT_TIMEOUT):
+            entry = SharedCacheService.get(shared_key, cls.CACHE_TTL)
+            if entry is not None:
+                with cls._cache_lock:
+                    cls._cache_by_tf[key] = entry
+                return entry["data"], entry["alerts"]
+            result = cls._compute_rotation_data(days=days, timeframe=key[0], include_constituents=key[1])
+            with cls._cache_lock:
+                entry = cls._cache_by_tf.get(key)
+            if entry is not None:
+                SharedCacheService.set(shared_key, entry, created=entry["timestamp"])
+            return result
+
+    @classmethod
+    def _run_flight(cls, key, flight, days):
+        """Leader side of a single-flight computation; followers wait on ``flight['event']``."""
+        try:
+            flight["result"] = cls._compute_shared(key, days)
+        except Exception as e:
+            flight["error"] = e
+        finally:
+            with cls._cache_lock:
+                cls._inflight.pop(key, None)
+            flight["event"].set()
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["result"]
+
+    @classmethod
+    def _background_refresh(cls, key, flight, days):
+        try:
+            cls._run_flight(key, flight, days)
+            print(f"DEBUG: [SectorService] Background refresh finished for {key}", flush=True)
+        except Exception as e:
+            print(f"DEBUG: [SectorService] Background refresh failed for {key}: {e}", flush=True)
+
     @classmethod
     def get_rotation_data(cls, days=60, timeframe="1D", include_constituents=True):
         """
         Calculates RS and RM for all sectors vs benchmark.
         Returns data for the last 30 trading sessions for playback.
+
+        Single-flight per (timeframe, include_constituents): concurrent callers wait for one
+        computation instead of each running their own. Once the TTL lapses the last good result
+        is still served (up to ``STALE_GRACE`` seconds past the TTL) while one background thread
+        recomputes it.
         """
+        from app.services.market_status_service import MarketStatusService
+        market_status = MarketStatusService.get_market_status()
+        ttl = cls.CACHE_TTL if market_status["mode"] in ["OPEN", "PRE_MARKET"] else 3600 * 12
+
+        key = (timeframe, bool(include_constituents))
+        current_time = float(time.time())
+
+        with cls._cache_lock:
+            entry, fresh = cls._lookup(key, ttl, current_time)
+            if entry is not None and fresh:
+                return entry["data"], entry["alerts"]
+
+            flight = cls._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = {"event": threading.Event(), "result": None, "error": None}
+                cls._inflight[key] = flight
+
+            if entry is not None and (current_time - float(entry["timestamp"])) < ttl + cls.STALE_GRACE:
+                if is_leader:
+                    threading.Thread(
+                        target=cls._background_refresh, args=(key, flight, days),
+                        name=f"sector-refresh-{timeframe}", daemon=True
+                    ).start()
+                return entry["data"], entry["alerts"]
+
+        if is_leader:
+            return cls._run_flight(key, flight, days)
+
+        if not flight["event"].wait(cls.FLIGHT_TIMEOUT):
+            print(f"WARNING: [SectorService] Waited {cls.FLIGHT_TIMEOUT}s on in-flight rotation for {key}; serving fallback.", flush=True)
+            return cls._load_fallback(timeframe)
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["result"]
+
+    @classmethod
+    def _compute_rotation_data(cls, days=60, timeframe="1D", include_constituents=True):
         def safe_round(val):
             if val is None or (isinstance(val, float) and (math.isnan(val) or math.isinf(val))) or pd.isna(val):
                 return 0.0
@@ -119,41 +228,6 @@ class SectorService:
             "1W": {"interval": "1wk", "period": "2y"},
             "1M": {"interval": "1mo", "period": "5y"}
         }
-        
-        # 0. Check Cache partitioned by timeframe with thread-safety (stampede protection)
-        from app.services.market_status_service import MarketStatusService
-        market_status = MarketStatusService.get_market_status()
-        ttl = cls.CACHE_TTL if market_status["mode"] in ["OPEN", "PRE_MARKET"] else 3600 * 12
-
-        current_time = float(time.time())
-        
-        # Initialize class-level lock and partitions dynamically if needed
-        if not hasattr(cls, '_cache_lock') or cls._cache_lock is None:
-            import threading
-            cls._cache_lock = threading.Lock()
-            cls._cache_by_tf = {}
-            cls._fetch_locks = {}
-
-        with cls._cache_lock:
-            cached = cls._cache_by_tf.get(timeframe)
-            if (cached is not None and cached.get("data") is not None and
-                (current_time - float(cached.get("timestamp", 0.0))) < ttl):
-                if cached["data"]:
-                    return cached["data"], cached["alerts"]
-            
-            if timeframe not in cls._fetch_locks:
-                import threading
-                cls._fetch_locks[timeframe] = threading.Lock()
-            t_lock = cls._fetch_locks[timeframe]
-
-        with t_lock:
-            # Double-check inside timeframe lock
-            with cls._cache_lock:
-                cached = cls._cache_by_tf.get(timeframe)
-                if (cached is not None and cached.get("data") is not None and
-                    (current_time - float(cached.get("timestamp", 0.0))) < ttl):
-                    if cached["data"]:
-                        return cached["data"], cached["alerts"]
 
         normalized_timeframe = "1D" if timeframe == "Daily" else timeframe
         config = tf_map.get(normalized_timeframe, {"interval": "1d", "period": "1y"})
@@ -205,169 +279,56 @@ class SectorService:
 
 
         results = {}
-        
-        # Helper to get ticker data from batch_data dict
-        def get_ticker_df(ticker_sym):
-            return batch_data.get(ticker_sym, pd.DataFrame())
 
-        benchmark_df = get_ticker_df(cls.BENCHMARK)
-        if benchmark_df.empty:
+        benchmark_df = batch_data.get(cls.BENCHMARK)
+        if benchmark_df is None or benchmark_df.empty:
             print(f"CRITICAL: Benchmark {cls.BENCHMARK} missing. Trying fallback.")
             data, alerts = cls._load_fallback(timeframe)
             if data: return data, alerts
             return {}, []
-            
-        benchmark_close_col = "close" if "close" in benchmark_df.columns else "Close"
-        benchmark_data = benchmark_df[benchmark_close_col]
 
-        # 2. Process each sector
+        # 2. One aligned date x symbol panel for every series, then whole-matrix metrics
+        panel = cls._align_panel(batch_data)
+        lookback_bars = cls.RETURN_LOOKBACK_BARS_BY_TIMEFRAME.get(normalized_timeframe, 1)
+        rotation = cls._rotation_matrix(panel["close"], lookback_bars)
+        breadth = cls._constituent_breadth(panel)
+
         for name, symbol in cls.SECTORS.items():
             try:
-                s_df = get_ticker_df(symbol)
-                if s_df.empty: continue
-                
-                sector_close_col = "close" if "close" in s_df.columns else "Close"
-                sector_close = s_df[sector_close_col]
-                
-                # Align data - FORCE timezone naive and ROUND to 1min for perfect alignment
-                s_naive = sector_close.copy()
-                b_naive = benchmark_data.copy()
-                
-                # Robust conversion to naive DatetimeIndex
-                def parse_date_series(idx):
-                    try:
-                        return pd.to_datetime(idx, utc=True)
-                    except Exception:
-                        parsed = []
-                        for x in idx:
-                            try:
-                                parsed.append(pd.to_datetime(x, utc=True))
-                            except Exception:
-                                try:
-                                    parsed.append(pd.to_datetime(x).tz_localize('UTC'))
-                                except Exception:
-                                    parsed.append(pd.NaT)
-                        return pd.DatetimeIndex(parsed)
-
-                try:
-                    s_dt = parse_date_series(s_naive.index)
-                    s_naive.index = s_dt.tz_localize(None).round('1min')
-                except Exception as e:
-                    print(f"WARN: Timezone normalization fallback for sector index: {e}")
-                    try:
-                        s_dt = pd.to_datetime(s_naive.index, errors='coerce')
-                        s_naive.index = s_dt.tz_localize(None) if hasattr(s_dt, 'tz') and s_dt.tz else s_dt
-                        s_naive.index = s_naive.index.round('1min')
-                    except Exception as inner_e:
-                        print(f"CRITICAL: Failed sector index parse: {inner_e}")
-
-                try:
-                    b_dt = parse_date_series(b_naive.index)
-                    b_naive.index = b_dt.tz_localize(None).round('1min')
-                except Exception as e:
-                    print(f"WARN: Timezone normalization fallback for benchmark index: {e}")
-                    try:
-                        b_dt = pd.to_datetime(b_naive.index, errors='coerce')
-                        b_naive.index = b_dt.tz_localize(None) if hasattr(b_dt, 'tz') and b_dt.tz else b_dt
-                        b_naive.index = b_naive.index.round('1min')
-                    except Exception as inner_e:
-                        print(f"CRITICAL: Failed benchmark index parse: {inner_e}")
-
-                # Deduplicate and align
-                s_naive = s_naive[~s_naive.index.duplicated(keep='last')].sort_index()
-                b_naive = b_naive[~b_naive.index.duplicated(keep='last')].sort_index()
-
-                combined = pd.DataFrame({
-                    'sector': s_naive,
-                    'benchmark': b_naive
-                })
-                
-                # Double check alignment and handle overlaps
-                combined = combined.interpolate(method='linear').dropna()
-
-                
-                if combined.empty: continue
-                
-                # RS and momentum rules:
-                lookback_bars = cls.RETURN_LOOKBACK_BARS_BY_TIMEFRAME.get(normalized_timeframe, 1)
-                combined['sector_return'] = combined['sector'].pct_change(periods=lookback_bars)
-                combined['benchmark_return'] = combined['benchmark'].pct_change(periods=lookback_bars)
-                
-                # Difference-based RS
-                combined['rs'] = combined['sector_return'] - combined['benchmark_return']
-                combined['rm'] = combined['rs'].diff()
-                
-                # Phase 1: Sector Acceleration
-                # 5-day rolling RS to smooth noise (relaxed min_periods)
-                combined['rs_5d'] = combined['rs'].rolling(5, min_periods=1).sum()
-                # Acceleration = rate of change of the 5d RS
-                combined['acc_raw'] = combined['rs_5d'].diff().fillna(0)
-                
-                # Final cleanup - keep as much data as possible
-                combined = combined.dropna(subset=['rs'])
-
-
-                # History (last 30)
-                history = combined.tail(30)
-                if history.empty:
+                if symbol not in rotation["rs"].columns:
                     continue
-                history_list = []
-                for hist_idx, hist_row in history.iterrows():
-                    history_list.append({
-                        "date": hist_idx.strftime("%Y-%m-%d"),
-                        "price": float(round(hist_row['sector'], 2)),
-                        "rs": float(round(hist_row['rs'], 4)),
-                        "rm": float(round(hist_row['rm'], 6)),
-                        "sr": float(round(hist_row['sector_return'], 4))
-                    })
-                
-                # 3. Calculate Phase 2 Metrics from pre-downloaded constituents
+                rows = np.flatnonzero(rotation["rs"][symbol].notna().to_numpy())[-30:]
+                if len(rows) == 0:
+                    continue
+
+                dates = rotation["rs"].index[rows].strftime("%Y-%m-%d")
+                price = np.round(rotation["price"][symbol].to_numpy()[rows], 2)
+                rs = rotation["rs"][symbol].to_numpy()[rows]
+                rm = rotation["rm"][symbol].to_numpy()[rows]
+                sr = rotation["sr"][symbol].to_numpy()[rows]
+                br = rotation["br"].to_numpy()[rows]
+                rs_4, rm_6, sr_4 = np.round(rs, 4), np.round(rm, 6), np.round(sr, 4)
+                history_list = [
+                    {"date": d, "price": float(p), "rs": float(a), "rm": float(b), "sr": float(c)}
+                    for d, p, a, b, c in zip(dates, price, rs_4, rm_6, sr_4)
+                ]
+
+                # 3. Phase 2 metrics: aggregate the per-constituent flags of this sector's members
                 constituents = ConstituentService.get_constituents(name)
-                advances: int = 0
-                total_vol: float = 0.0
-                avg_vol: float = 0.0
-                valid_cons: int = 0
-                above20: int = 0
-                above50: int = 0
-                hi10: int = 0
-                
                 if constituents:
-                    for const in constituents:
-                        c_df = get_ticker_df(const)
-                        if c_df.empty or len(c_df) < 2: continue
-                        
-                        c_close_col = "close" if "close" in c_df.columns else "Close"
-                        c_open_col = "open" if "open" in c_df.columns else "Open"
-                        c_vol_col = "volume" if "volume" in c_df.columns else "Volume"
-                        
-                        last_c = float(c_df[c_close_col].iloc[-1])
-                        last_o = float(c_df[c_open_col].iloc[-1])
-                        last_v = float(c_df[c_vol_col].iloc[-1])
-                        
-                        if last_c > last_o:
-                            advances += 1
-                        
-                        # DMA & Highs
-                        if len(c_df) >= 20:
-                            ma20 = float(c_df[c_close_col].rolling(20).mean().iloc[-1])
-                            if last_c > ma20:
-                                above20 += 1
-                        if len(c_df) >= 50:
-                            ma50 = float(c_df[c_close_col].rolling(50).mean().iloc[-1])
-                            if last_c > ma50:
-                                above50 += 1
-                        if len(c_df) >= 10:
-                            max10 = float(c_df[c_close_col].rolling(10).max().iloc[-1])
-                            if last_c >= max10:
-                                hi10 += 1
-                            
-                        valid_cons += 1
-                        total_vol += last_v
-                        avg_vol += float(c_df[c_vol_col].mean())
-                    
+                    cols = [breadth["position"][c] for c in constituents if c in breadth["position"]]
+                    valid = breadth["valid"][cols]
+                    valid_cons = int(valid.sum())
+                    advances = int(breadth["advance"][cols].sum())
+                    above20 = int(breadth["above20"][cols].sum())
+                    above50 = int(breadth["above50"][cols].sum())
+                    hi10 = int(breadth["hi10"][cols].sum())
+                    total_vol = float(breadth["last_volume"][cols][valid].sum())
+                    avg_vol = float(breadth["avg_volume"][cols][valid].sum())
+
                     breadth_ratio = float(advances) / float(valid_cons) if valid_cons > 0 else 0.5
                     rel_volume = float(total_vol) / float(avg_vol) if avg_vol > 0 else 1.0
-                    
+
                     # Phase 2: BreadthScore
                     pct_20 = (float(above20) / float(valid_cons) * 100.0) if valid_cons > 0 else 50.0
                     pct_50 = (float(above50) / float(valid_cons) * 100.0) if valid_cons > 0 else 50.0
@@ -376,25 +337,24 @@ class SectorService:
                 else:
                     breadth_ratio, rel_volume = 0.5, 1.0
                     breadth_score = 50.0
-                
+
                 # Final Current Metrics
-                last_row = history.iloc[-1]
-                curr_rs = float(last_row['rs'])
-                curr_rm = float(last_row['rm'])
-                
+                last = rows[-1]
+                curr_rs = float(rs[-1])
+                curr_rm = float(rm[-1])
+
                 # Phase 1: Normalize Acceleration Score (-100 to +100)
-                acc_raw_val = last_row['acc_raw']
-                if pd.isna(acc_raw_val) or math.isinf(float(str(acc_raw_val))):
-                    acc_raw_val = 0.0
-                acc_raw = float(acc_raw_val)
+                acc_raw = float(rotation["acc"][symbol].to_numpy()[last])
+                if math.isnan(acc_raw) or math.isinf(acc_raw):
+                    acc_raw = 0.0
                 # 1000x scale (less explosive than 2000)
                 acc_score = float(max(-100.0, min(100.0, acc_raw * 1000.0)))
 
                 # State logic: Absolute direction + Relative performance
                 state = cls.calculate_state(
-                    sector_return=float(last_row['sector_return']),
-                    benchmark_return=float(last_row['benchmark_return']),
-                    prev_rs=float(history.iloc[-2]['rs']) if len(history) > 1 else float(last_row['rs'])
+                    sector_return=float(sr[-1]),
+                    benchmark_return=float(br[-1]),
+                    prev_rs=float(rs[-2]) if len(rows) > 1 else curr_rs
                 )
 
                 results[name] = {
@@ -406,13 +366,13 @@ class SectorService:
                         "breadth": safe_round(float(breadth_ratio) * 1000.0) / 10.0,
                         "relVolume": safe_round(float(rel_volume) * 100.0) / 100.0,
                         "state": str(state),
-                        "sr": safe_round(float(last_row['sector_return']) * 10000.0) / 10000.0,
-                        "br": safe_round(float(last_row['benchmark_return']) * 10000.0) / 10000.0,
+                        "sr": safe_round(float(sr[-1]) * 10000.0) / 10000.0,
+                        "br": safe_round(float(br[-1]) * 10000.0) / 10000.0,
                         "accelerationScore": safe_round(float(acc_score) * 100.0) / 100.0,
                         "breadthScore": safe_round(float(breadth_score) * 100.0) / 100.0
                     }
                 }
-                
+
                 RotationAlertService.detect_alerts(name, curr_rs, curr_rm)
 
             except Exception as e:
@@ -420,26 +380,22 @@ class SectorService:
 
         # Phase 3: Predictive Rotation Score
         # RotationScore = (0.4 * RS Score) + (0.3 * AccelerationScore) + (0.3 * BreadthScore)
-        # First normalize RS score across available sectors 0-100
-        all_rs = [float(r['current']['rs']) for r in results.values()]
-        min_rs, max_rs = min(all_rs) if all_rs else 0, max(all_rs) if all_rs else 1
-        
-        for name in results:
-            rs_val = float(results[name]['current']['rs'])
-            rs_norm = (float(float(rs_val) - float(min_rs)) / float(float(max_rs) - float(min_rs)) * 100.0) if max_rs != min_rs else 50.0
-            
-            acc_score = results[name]['metrics']['accelerationScore']
+        # RS score is normalized 0-100 across the available sectors
+        if results:
+            names = list(results)
+            rs_vals = np.array([results[n]['current']['rs'] for n in names], dtype=float)
+            acc_vals = np.array([results[n]['metrics']['accelerationScore'] for n in names], dtype=float)
+            br_vals = np.array([results[n]['metrics']['breadthScore'] for n in names], dtype=float)
+
+            min_rs, max_rs = rs_vals.min(), rs_vals.max()
+            rs_norm = (rs_vals - min_rs) / (max_rs - min_rs) * 100.0 if max_rs != min_rs else np.full(len(names), 50.0)
             # Scale acc_score from [-100, 100] to [0, 100] for rotation calculation
-            acc_norm = (acc_score + 100) / 2
-            br_score = results[name]['metrics']['breadthScore']
-            
-            rotation_score = (0.4 * rs_norm) + (0.3 * acc_norm) + (0.3 * br_score)
-            # Integer-based rounding to bypass restrictive round() stubs
-            if pd.isna(rotation_score) or math.isnan(rotation_score):
-                rot_val = 50.0
-            else:
-                rot_val = int(float(rotation_score) * 100.0 + 0.5)  # type: ignore
-            results[name]['metrics']['rotationScore'] = float(rot_val) / 100.0  # type: ignore
+            acc_norm = (acc_vals + 100) / 2
+            rotation_scores = (0.4 * rs_norm) + (0.3 * acc_norm) + (0.3 * br_vals)
+            # Integer-based rounding (truncate after +0.5) to keep historical values stable
+            rounded = np.where(np.isnan(rotation_scores), 50.0, np.trunc(rotation_scores * 100.0 + 0.5))
+            for n, val in zip(names, rounded):
+                results[n]['metrics']['rotationScore'] = float(val) / 100.0
 
         # Improvement 2: Sector Panel Sorting
         state_priority = {
@@ -539,7 +495,7 @@ class SectorService:
         
         # Update Cache partitioned by timeframe and legacy cache
         with cls._cache_lock:
-            cls._cache_by_tf[timeframe] = {
+            cls._cache_by_tf[(timeframe, bool(include_constituents))] = {
                 "data": results,
                 "alerts": all_alerts,
                 "timestamp": time.time()
@@ -556,6 +512,135 @@ class SectorService:
         
         return results, all_alerts
 
+    @staticmethod
+    def _normalize_index(idx) -> np.ndarray:
+        """Naive, minute-rounded datetime64[ns] values so sector, benchmark and constituent bars line up."""
+        try:
+            if isinstance(idx, pd.DatetimeIndex):
+                parsed = idx.tz_convert('UTC').tz_localize(None) if idx.tz is not None else idx
+            else:
+                parsed = pd.to_datetime(idx, utc=True).tz_localize(None)
+        except Exception as e:
+            print(f"WARN: Timezone normalization fallback for sector index: {e}")
+            parsed = pd.DatetimeIndex(pd.to_datetime(idx, errors='coerce'))
+            if parsed.tz is not None:
+                parsed = parsed.tz_localize(None)
+        values = np.asarray(parsed, dtype='datetime64[ns]')
+        if (values.view('i8') % (60 * 10**9)).any():
+            values = np.asarray(pd.DatetimeIndex(values).round('1min'), dtype='datetime64[ns]')
+        return values
+
+    @classmethod
+    def _align_panel(cls, batch_data):
+        """
+        Aligns every fetched series onto shared date x symbol matrices in one pass: the union
+        calendar is built once and each symbol's bars are scattered into preallocated arrays.
+        Returns {'close', 'open', 'volume'} DataFrames (columns = symbols).
+        """
+        symbols, stamps, frames = [], [], []
+        for sym, df in batch_data.items():
+            if "close" not in df.columns:
+                continue
+            values = cls._normalize_index(df.index)
+            symbols.append(sym)
+            stamps.append(values)
+            frames.append(df)
+
+        calendar = np.unique(np.concatenate(stamps)) if stamps else np.array([], dtype='datetime64[ns]')
+        calendar = calendar[~np.isnat(calendar)]
+        shape = (len(calendar), len(symbols))
+        panel = {field: np.full(shape, np.nan) for field in ("close", "open", "volume")}
+
+        for j, (values, df) in enumerate(zip(stamps, frames)):
+            take = np.flatnonzero(~np.isnat(values))
+            rows = np.searchsorted(calendar, values[take])
+            if len(rows) > 1 and not (np.diff(rows) > 0).all():
+                # Duplicate timestamps: keep the last bar, like drop_duplicates(keep='last')
+                _, last_from_end = np.unique(rows[::-1], return_index=True)
+                keep = len(rows) - 1 - last_from_end
+                take, rows = take[keep], rows[keep]
+            for field, matrix in panel.items():
+                if field in df.columns:
+                    matrix[rows, j] = df[field].to_numpy(dtype=float)[take]
+
+        index = pd.DatetimeIndex(calendar)
+        return {field: pd.DataFrame(matrix, index=index, columns=symbols) for field, matrix in panel.items()}
+
+    @classmethod
+    def _rotation_matrix(cls, close, lookback_bars):
+        """
+        RS/RM/acceleration for every sector at once against the benchmark.
+        Rows are the union of the index calendars; gaps are linearly interpolated and a row
+        only counts for a sector if that sector or the benchmark actually printed a bar there.
+        """
+        sector_syms = [s for s in cls.SECTORS.values() if s in close.columns]
+        idx_close = close[[cls.BENCHMARK] + sector_syms].dropna(how='all')
+        observed = idx_close.notna().to_numpy()
+        filled = idx_close.interpolate(method='linear')
+
+        bench = filled[cls.BENCHMARK]
+        sectors = filled[sector_syms]
+        valid = sectors.notna().to_numpy() & bench.notna().to_numpy()[:, None] & (observed[:, 1:] | observed[:, :1])
+        sectors = sectors.where(valid)
+
+        sector_return = sectors / sectors.shift(lookback_bars) - 1
+        benchmark_return = bench / bench.shift(lookback_bars) - 1
+        rs = sector_return.sub(benchmark_return, axis=0)
+        rm = rs.diff()
+        # Phase 1: acceleration = change of the 5-bar rolling RS
+        acc = rs.rolling(5, min_periods=1).sum().diff().fillna(0)
+        return {"price": sectors, "sr": sector_return, "br": benchmark_return, "rs": rs, "rm": rm, "acc": acc}
+
+    @staticmethod
+    def _constituent_breadth(panel):
+        """
+        Per-symbol breadth flags (advance, above 20/50 MA, 10-bar high) and volume stats, computed
+        over the whole panel at once. Each column is bottom-aligned on its own bars first so the
+        rolling windows cover that symbol's last N prints, not the last N panel rows.
+        """
+        close = panel["close"]
+        symbols = list(close.columns)
+        c = close.to_numpy(dtype=float)
+        o = panel["open"].reindex(index=close.index, columns=symbols).to_numpy(dtype=float)
+        v = panel["volume"].reindex(index=close.index, columns=symbols).to_numpy(dtype=float)
+
+        # Stable sort puts each column's missing rows on top, keeping bar order
+        order = np.argsort(~np.isnan(c), axis=0, kind='stable')
+        c, o, v = (np.take_along_axis(a, order, axis=0) for a in (c, o, v))
+        n_bars = (~np.isnan(c)).sum(axis=0)
+
+        if len(c):
+            last_c, last_o, last_v = c[-1], o[-1], v[-1]
+        else:
+            last_c = last_o = last_v = np.full(len(symbols), np.nan)
+
+        def trailing(window, reducer):
+            if len(c) < window:
+                return np.full(len(symbols), np.nan)
+            with np.errstate(invalid='ignore'):
+                return reducer(c[-window:], axis=0)
+
+        with np.errstate(invalid='ignore'):
+            above20 = (n_bars >= 20) & (last_c > trailing(20, np.mean))
+            above50 = (n_bars >= 50) & (last_c > trailing(50, np.mean))
+            hi10 = (n_bars >= 10) & (last_c >= trailing(10, np.max))
+            advance = last_c > last_o
+        valid = n_bars >= 2
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            avg_volume = np.nanmean(v, axis=0) if len(v) else np.full(len(symbols), np.nan)
+
+        return {
+            "position": {sym: i for i, sym in enumerate(symbols)},
+            "valid": valid,
+            "advance": advance & valid,
+            "above20": above20 & valid,
+            "above50": above50 & valid,
+            "hi10": hi10 & valid,
+            "last_volume": last_v,
+            "avg_volume": avg_volume,
+        }
+
     @classmethod
     def _save_fallback(cls, data, alerts, timeframe):
         if not data:
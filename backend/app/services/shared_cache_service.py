@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import fcntl
+    _FLOCK_AVAILABLE = True
+except ImportError:
+    # Windows dev boxes run a single worker; cross-process locking is a no-op there
+    _FLOCK_AVAILABLE = False
+
+
+class SharedCacheService:
+    """
+    Optional cross-process cache tier for multi-worker uvicorn deployments.
+
+    Values live in an SQLite database in WAL mode under ``app/data`` so every worker
+    can read what any other worker fetched. ``single_flight`` / ``try_lock`` use
+    ``flock`` on per-key lock files so only one process fetches a given key at a time.
+
+    Entries older than ``PURGE_AGE`` are deleted when a process first opens the database and
+    then at most every ``PURGE_INTERVAL`` seconds from the write path, so the file stays bounded.
+
+    Enabled with ``SHARED_CACHE=1``, or automatically when ``WEB_CONCURRENCY`` > 1.
+    """
+
+    DB_PATH = Path(__file__).resolve().parent.parent / "data" / "shared_cache.db"
+    LOCK_DIR = Path(__file__).resolve().parent.parent / "data" / "locks"
+    LOCK_TIMEOUT = 30
+    PURGE_AGE = 6 * 3600
+    PURGE_INTERVAL = 600
+
+    _last_purge = 0.0
+
+    _local = threading.local()
+    _initialized = False
+    _init_lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled() -> bool:
+        flag = os.getenv("SHARED_CACHE")
+        if flag is not None:
+            return flag.strip().lower() in ("1", "true", "yes", "on")
+        try:
+            return int(os.getenv("WEB_CONCURRENCY", "1")) > 1
+        except ValueError:
+            return False
+
+    @classmethod
+    def _connection(cls) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; keep one per thread
+        conn = getattr(cls._local, "conn", None)
+        if conn is not None and getattr(cls._local, "path", None) == cls.DB_PATH:
+            return conn
+        cls.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(cls.DB_PATH), timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with cls._init_lock:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS shared_cache ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, created REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS shared_cache_created ON shared_cache (created)")
+        cls._local.conn = conn
+        cls._local.path = cls.DB_PATH
+        cls._maybe_purge()
+        return conn
+
+    @classmethod
+    def get(cls, key: str, max_age: float) -> Optional[Any]:
+        """Returns the value stored under ``key`` if it is younger than ``max_age`` seconds."""
+        if not cls.is_enabled():
+            return None
+        try:
+            row = cls._connection().execute(
+                "SELECT payload, created FROM shared_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (time.time() - row[1]) >= max_age:
+                return None
+            return pickle.loads(row[0])
+        except Exception as e:
+            print(f"DEBUG: [SharedCache] Read failed for {key}: {e}", flush=True)
+            return None
+
+    @classmethod
+    def get_many(cls, keys: Iterable[str], max_age: float) -> Dict[str, Any]:
+        if not cls.is_enabled():
+            return {}
+        keys = list(keys)
+        if not keys:
+            return {}
+        results = {}
+        cutoff = time.time() - max_age
+        try:
+            conn = cls._connection()
+            # SQLite caps bound parameters at 999 on older builds
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT key, payload FROM shared_cache WHERE created > ? AND key IN ({placeholders})",
+                    (cutoff, *chunk),
+                ).fetchall()
+                for key, payload in rows:
+                    results[key] = pickle.loads(payload)
+        except Exception as e:
+            print(f"DEBUG: [SharedCache] Bulk read failed: {e}", flush=True)
+        return results
+
+    @classmethod
+    def set(cls, key: str, value: Any, created: Optional[float] = None) -> None:
+        if not cls.is_enabled():
+            return
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            cls._connection().execute(
+                "INSERT OR REPLACE INTO shared_cache (key, payload, created) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(payload), created or time.time()),
+            )
+        except Exception as e:
+            print(f"DEBUG: [SharedCache] Write failed for {key}: {e}", flush=True)
+        cls._maybe_purge()
+
+    @classmethod
+    def _maybe_purge(cls) -> None:
+        """Runs ``purge`` if this process has not purged within ``PURGE_INTERVAL`` seconds."""
+        now = time.time()
+        with cls._init_lock:
+            if now - cls._last_purge < cls.PURGE_INTERVAL:
+                return
+            cls._last_purge = now
+        removed = cls.purge()
+        if removed:
+            print(f"DEBUG: [SharedCache] Purged {removed} expired entries", flush=True)
+
+    @classmethod
+    def purge(cls, older_than: Optional[float] = None) -> int:
+        if not cls.is_enabled():
+            return 0
+        cutoff = time.time() - (older_than or cls.PURGE_AGE)
+        try:
+            return cls._connection().execute("DELETE FROM shared_cache WHERE created < ?", (cutoff,)).rowcount
+        except Exception as e:
+            print(f"DEBUG: [SharedCache] Purge failed: {e}", flush=True)
+            return 0
+
+    @classmethod
+    def _lock_path(cls, name: str) -> Path:
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:20]
+        return cls.LOCK_DIR / f"{digest}.lock"
+
+    @classmethod
+    def try_lock(cls, name: str):
+        """Non-blocking cross-process lock. Returns a handle to pass to ``unlock``, or None if another process holds it."""
+        if not cls.is_enabled() or not _FLOCK_AVAILABLE:
+            return True
+        cls.LOCK_DIR.mkdir(parents=True, exist_ok=True)
+        handle = open(cls._lock_path(name), "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handle
+        except OSError:
+            handle.close()
+            return None
+
+    @staticmethod
+    def unlock(handle) -> None:
+        if handle is None or handle is True:
+            return
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            handle.close()
+
+    @classmethod
+    @contextmanager
+    def single_flight(cls, name: str, timeout: Optional[float] = None):
+        """
+        Blocks until this process holds the cross-process lock for ``name``.
+        Yields True once acquired, or False if ``timeout`` expired (the caller may proceed unlocked).
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else cls.LOCK_TIMEOUT)
+        handle = cls.try_lock(name)
+        while handle is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            handle = cls.try_lock(name)
+        try:
+            yield handle is not None
+        finally:
+            cls.unlock(handle)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+
+class TimeframeService:
+    """
+    Builds higher timeframes in memory from a single base series instead of
+    fetching each one upstream.
+
+    Intraday targets (30m/1H/2H/4H) are resampled from a finer intraday base and
+    weekly/monthly targets from daily bars, on the same bucket grid as the upstream
+    bars: 30m/1H on the 09:15 NSE open like Yahoo's native bars, 2H/4H on midnight
+    like ``MarketDataService.RESAMPLE_MAP``. The base is fetched long enough
+    (``base_count``) for its derived timeframes to reach ``MIN_DERIVED_BARS``.
+    Results are cached per (symbol, base_tf, target_tf) and refreshed incrementally:
+    only the base bars from the last derived bucket onwards are re-aggregated when
+    new base bars arrive.
+    """
+
+    INTRADAY_MINUTES = {"5m": 5, "15m": 15, "30m": 30, "1H": 60, "2H": 120, "4H": 240}
+    CALENDAR_RULES = {"1W": "W-MON", "1M": "MS"}  # Yahoo labels weekly bars on Monday, monthly on the 1st
+    SESSION_ORIGIN = pd.Timestamp("2000-01-03 09:15")
+    MIDNIGHT_ORIGIN = pd.Timestamp("2000-01-03 00:00")
+    MIDNIGHT_ANCHORED = frozenset({"2H", "4H"})  # Built by MarketDataService.RESAMPLE_MAP with a midnight origin
+    AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    MIN_DERIVED_BARS = 50  # Below this the caller should fetch the timeframe upstream
+    DISPLAY_BARS = 200  # Bars the dashboard works on for its own timeframe
+    # Base series length per primary timeframe, sized so each derivable higher timeframe gets well
+    # over MIN_DERIVED_BARS (e.g. 1000 x 15m ~ 40 sessions -> ~160 x 2H; 1300 x 1D -> ~60 x 1M)
+    BASE_COUNT = {"5m": 3000, "15m": 1000, "30m": 1000, "1H": 1000, "2H": 500, "1D": 1300}
+    MAX_ENTRIES = 600
+
+    _derived: Dict[Tuple[str, str, str], Dict] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def can_derive(cls, base_tf: str, target_tf: str) -> bool:
+        if base_tf in cls.INTRADAY_MINUTES and target_tf in cls.INTRADAY_MINUTES:
+            base_min, target_min = cls.INTRADAY_MINUTES[base_tf], cls.INTRADAY_MINUTES[target_tf]
+            return target_min > base_min and target_min % base_min == 0 and 1440 % target_min == 0
+        return base_tf == "1D" and target_tf in cls.CALENDAR_RULES
+
+    @classmethod
+    def base_count(cls, base_tf: str, targets) -> int:
+        """Bars to fetch for ``base_tf``: a long base when any of ``targets`` derives from it."""
+        if any(cls.can_derive(base_tf, t) for t in targets):
+            return max(cls.BASE_COUNT.get(base_tf, cls.DISPLAY_BARS), cls.DISPLAY_BARS)
+        return cls.DISPLAY_BARS
+
+    @classmethod
+    def _resample(cls, df: pd.DataFrame, target_tf: str) -> pd.DataFrame:
+        agg = {col: rule for col, rule in cls.AGG.items() if col in df.columns}
+        if target_tf in cls.CALENDAR_RULES:
+            resampler = df.resample(cls.CALENDAR_RULES[target_tf], label="left", closed="left")
+        else:
+            origin = cls.MIDNIGHT_ORIGIN if target_tf in cls.MIDNIGHT_ANCHORED else cls.SESSION_ORIGIN
+            resampler = df.resample(f"{cls.INTRADAY_MINUTES[target_tf]}min", origin=origin)
+        return resampler.agg(agg).dropna(subset=["close"])
+
+    @classmethod
+    def _bucket_start(cls, ts: pd.Timestamp, target_tf: str) -> pd.Timestamp:
+        probe = pd.DataFrame({'close': [0.0]}, index=pd.DatetimeIndex([ts]))
+        return cls._resample(probe, target_tf).index[0]
+
+    @classmethod
+    def derive(cls, symbol: str, base_tf: str, base_df: pd.DataFrame, target_tf: str) -> Optional[pd.DataFrame]:
+        """
+        Returns ``base_df`` aggregated to ``target_tf`` (lower-case OHLCV columns), or None
+        if the pair is not derivable. A leading bucket that starts before the first base
+        bar is dropped since it would be incomplete.
+        """
+        if base_df is None or base_df.empty or not cls.can_derive(base_tf, target_tf):
+            return None
+        if not isinstance(base_df.index, pd.DatetimeIndex):
+            return None
+
+        key = (symbol, base_tf, target_tf)
+        base_first, base_last = base_df.index[0], base_df.index[-1]
+        # The last base bar may be partial, so its values are part of the fingerprint
+        fingerprint = (base_first, base_last, len(base_df), tuple(base_df.iloc[-1].tolist()))
+        with cls._lock:
+            cached = cls._derived.get(key)
+
+        if cached is not None and cached['fingerprint'] == fingerprint:
+            return cached['df'].copy(deep=False)
+
+        derived = None
+        if cached is not None and cached['base_first'] <= base_first and len(cached['df']) > 0:
+            # Incremental: re-aggregate only from the last (possibly partial) derived bucket onwards
+            last_bucket = cached['df'].index[-1]
+            if last_bucket >= base_first:
+                tail = cls._resample(base_df[base_df.index >= last_bucket], target_tf)
+                head = cached['df'][(cached['df'].index < last_bucket)]
+                derived = pd.concat([head, tail])
+
+        if derived is None:
+            derived = cls._resample(base_df, target_tf)
+
+        # Drop buckets that begin before the first base bar (incomplete)
+        first_complete = cls._bucket_start(base_first, target_tf)
+        if first_complete < base_first:
+            derived = derived[derived.index > first_complete]
+        else:
+            derived = derived[derived.index >= first_complete]
+        derived.index.name = base_df.index.name
+
+        with cls._lock:
+            cls._derived.pop(key, None)
+            cls._derived[key] = {
+                'df': derived,
+                'base_first': base_first,
+                'fingerprint': fingerprint,
+            }
+            while len(cls._derived) > cls.MAX_ENTRIES:
+                cls._derived.pop(next(iter(cls._derived)))
+        return derived.copy(deep=False)
+
+    @classmethod
+    def clear(cls, symbol: Optional[str] = None) -> None:
+        with cls._lock:
+            if symbol is None:
+                cls._derived.clear()
+            else:
+                for key in [k for k in cls._derived if k[0] == symbol]:
+                    del cls._derived[key]
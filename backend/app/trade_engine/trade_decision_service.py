@@ -42,6 +42,37 @@ class TradeDecisionService:
     → Intent → Performance → Noise Filter → Narrative → Trade Builder
     """
 
+    @staticmethod
+    def build_context(symbol: str, df, supports: List[float], resistances: List[float], trend: str, **fields) -> MarketContext:
+        """
+        Builds the MarketContext for the last bar of ``df``. ATR, ADX and the volume ratio come
+        from the frame's indicator context, so they reuse what the strategy and insight engines
+        already computed for the same frame. Extra ``fields`` pass straight to MarketContext.
+        """
+        from app.engine.insights import InsightEngine
+        from app.engine.zones import ZoneEngine
+
+        cmp = float(df['close'].iloc[-1])
+        atr_series = ZoneEngine.calculate_atr(df)
+        atr = float(atr_series.iloc[-1]) if not atr_series.empty else cmp * 0.01
+
+        return MarketContext(
+            symbol=symbol,
+            price=cmp,
+            open=float(df['open'].iloc[-1]),
+            high=float(df['high'].iloc[-1]),
+            low=float(df['low'].iloc[-1]),
+            close=cmp,
+            prev_close=float(df['close'].iloc[-2]) if len(df) > 1 else cmp,
+            supports=supports,
+            resistances=resistances,
+            atr=atr,
+            adx=InsightEngine.get_adx(df),
+            volume_ratio=InsightEngine.get_volume_ratio(df),
+            trend=trend,
+            **fields
+        )
+
     @staticmethod
     def generate_trade(context: MarketContext, timeframe: str = "15m") -> TradeDecision:
         reasons: List[str] = []
@@ -0,0 +1,94 @@
+import json
+import math
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    _ORJSON_AVAILABLE = False
+    print("WARNING: [FastJSON] orjson not installed. Falling back to the stdlib json encoder.", flush=True)
+
+
+class FastJSON:
+    """
+    Single-pass JSON encoding for API payloads and WebSocket messages.
+
+    With orjson the payload is encoded natively in one walk: numpy scalars and C-contiguous
+    numeric arrays, datetimes, Enums and NaN/Inf (as ``null``) need no preprocessing, and
+    ``_default`` covers the rest (pandas Timestamps/NaT, other arrays, sets, pydantic models).
+    Payloads orjson still rejects (e.g. numpy dict keys), or any payload when orjson is not
+    installed, go through the recursive ``scrub`` walk first.
+    """
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, pd.Timestamp):
+            return obj.isoformat()
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump()
+        if hasattr(obj, "dict") and callable(obj.dict):
+            return obj.dict()
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+    @classmethod
+    def scrub(cls, obj: Any) -> Any:
+        """Recursively converts ``obj`` to plain JSON-compatible python types."""
+        if isinstance(obj, dict):
+            return {cls.scrub(k): cls.scrub(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return [cls.scrub(v) for v in obj]
+        if isinstance(obj, np.ndarray):
+            return [cls.scrub(v) for v in obj.tolist()]
+        if isinstance(obj, np.generic):
+            obj = obj.item()
+
+        if isinstance(obj, float):
+            return None if math.isnan(obj) or math.isinf(obj) else obj
+        if obj is None or isinstance(obj, (str, int)):
+            return obj
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        if isinstance(obj, Enum):
+            return cls.scrub(obj.value)
+        if hasattr(obj, "model_dump") or hasattr(obj, "dict"):
+            return cls.scrub(cls._default(obj))
+        return obj
+
+    @classmethod
+    def dumps(cls, obj: Any) -> bytes:
+        if _ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(obj, default=cls._default, option=_ORJSON_OPTIONS)
+            except TypeError:
+                return orjson.dumps(cls.scrub(obj), default=cls._default, option=_ORJSON_OPTIONS)
+        return json.dumps(cls.scrub(obj), default=str, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def dumps_text(cls, obj: Any) -> str:
+        return cls.dumps(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with ``FastJSON``. Return it directly from an endpoint so
+    FastAPI skips its own ``jsonable_encoder`` pass."""
+
+    def render(self, content: Any) -> bytes:
+        return FastJSON.dumps(content)
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+from fastapi import WebSocket
+
+from app.events.bus import Subscription
+from app.utils.fast_json import FastJSON
+
+
+def clean_symbol(symbol: Any) -> str:
+    """Plain upper-case ticker: ``NSE:RELIANCE-EQ`` / ``RELIANCE.NS`` -> ``RELIANCE``."""
+    return str(symbol).upper().replace(".NS", "").replace(".BO", "").split(":")[-1].split("-")[0].strip()
+
+
+class WebSocketClient:
+    """
+    One connected WebSocket: a bounded send queue drained by its own writer task.
+
+    The queue is an event-bus ``Subscription`` holding pre-serialized ``(key, text)`` frames, so
+    the broadcaster only ever enqueues and never awaits a socket. On channels that coalesce, a
+    client that falls behind keeps just the newest frame per key (per symbol for ticks/signals)
+    instead of a backlog; elsewhere the oldest frames are dropped once ``maxsize`` is reached.
+    A send that exceeds ``SEND_TIMEOUT`` or fails closes the client.
+
+    ``symbols`` is the client's subscription set; empty means every symbol.
+    """
+
+    SEND_TIMEOUT = 5.0
+    BATCH_SIZE = 50
+
+    def __init__(self, websocket: WebSocket, channel: str, coalesce: bool, maxsize: int = 500,
+                 symbols: Iterable[str] = ()):
+        self.websocket = websocket
+        self.channel = channel
+        self.symbols: Set[str] = {clean_symbol(s) for s in symbols if s}
+        self.queue = Subscription(
+            channel,
+            maxsize=maxsize,
+            policy=Subscription.COALESCE if coalesce else Subscription.DROP_OLDEST,
+            key=(lambda frame: frame[0]) if coalesce else None,
+        )
+        self.sent = 0
+        self.closed = False
+        self._writer: Optional[asyncio.Task] = None
+
+    def wants(self, symbol: Optional[str]) -> bool:
+        return symbol is None or not self.symbols or symbol in self.symbols
+
+    def enqueue(self, key: Hashable, text: str) -> None:
+        if not self.closed:
+            self.queue.put((key, text))
+
+    def start(self, on_close) -> None:
+        self._writer = asyncio.create_task(self._write_loop(on_close), name=f"ws-writer:{self.channel}")
+
+    async def _write_loop(self, on_close) -> None:
+        try:
+            while True:
+                for _, text in await self.queue.get_batch(self.BATCH_SIZE):
+                    await asyncio.wait_for(self.websocket.send_text(text), self.SEND_TIMEOUT)
+                    self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[WS Broadcaster] Dropping {self.channel} client: {type(e).__name__} {e}", flush=True)
+            on_close(self)
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        self.closed = True
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    def handle_message(self, text: str) -> None:
+        """
+        Applies a subscription command from the client:
+        ``{"action": "subscribe" | "unsubscribe" | "set", "symbols": [...]}``.
+        ``set`` with an empty list goes back to receiving every symbol.
+        """
+        try:
+            command = json.loads(text)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(command, dict):
+            return
+        symbols = command.get("symbols") or []
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = {clean_symbol(s) for s in symbols if s}
+
+        action = command.get("action")
+        if action == "subscribe":
+            self.symbols |= symbols
+        elif action == "unsubscribe":
+            self.symbols -= symbols
+        elif action == "set":
+            self.symbols = symbols
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.queue.stats()
+        stats.update({"sent": self.sent, "symbols": sorted(self.symbols)})
+        return stats
+
+
+class ConnectionManager:
+    """
+    Fan-out WebSocket broadcaster.
+
+    ``broadcast`` serializes a message once, then enqueues the same text for every client of
+    the channel that subscribed to its symbol; each client's writer task does the sending. It
+    never awaits a socket, so a slow or stalled client cannot hold up the bus consumers or the
+    other clients.
+    """
+
+    CHANNELS = ("ticks", "signals", "alerts", "scanner", "breakouts")
+    # Channels where a lagging client only needs the newest message per symbol (or the latest scan)
+    COALESCE_CHANNELS = frozenset({"ticks", "signals", "scanner"})
+    QUEUE_SIZE = 500
+
+    def __init__(self):
+        self.active_connections: Dict[str, List[WebSocketClient]] = {channel: [] for channel in self.CHANNELS}
+
+    async def connect(self, websocket: WebSocket, channel: str,
+                      symbols: Iterable[str] = ()) -> Optional[WebSocketClient]:
+        await websocket.accept()
+        if channel not in self.active_connections:
+            return None
+        client = WebSocketClient(websocket, channel, channel in self.COALESCE_CHANNELS,
+                                 maxsize=self.QUEUE_SIZE, symbols=symbols)
+        self.active_connections[channel].append(client)
+        client.start(self._remove)
+        return client
+
+    def _remove(self, client: WebSocketClient) -> None:
+        clients = self.active_connections.get(client.channel, [])
+        if client in clients:
+            clients.remove(client)
+        client.stop()
+
+    def disconnect(self, websocket: WebSocket, channel: str) -> None:
+        for client in list(self.active_connections.get(channel, [])):
+            if client.websocket is websocket:
+                self._remove(client)
+
+    async def broadcast(self, channel: str, message: Any, symbol: Optional[str] = None) -> int:
+        """
+        Queues ``message`` for every client of ``channel`` subscribed to ``symbol`` (all clients
+        when ``symbol`` is None). Returns the number of clients it was queued for.
+        """
+        if symbol is not None:
+            symbol = clean_symbol(symbol)
+        targets = [c for c in self.active_connections.get(channel, ()) if c.wants(symbol)]
+        if not targets:
+            return 0
+
+        if not isinstance(message, str):
+            try:
+                message = FastJSON.dumps_text(message)
+            except Exception as e:
+                print(f"[WS Broadcaster] JSON serialization failed: {e}", flush=True)
+                return 0
+
+        key = symbol if symbol is not None else channel
+        for client in targets:
+            client.enqueue(key, message)
+        return len(targets)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {channel: [c.stats() for c in clients] for channel, clients in self.active_connections.items()}
@@ -3,23 +3,30 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from app.services.breakout_scanner import BreakoutScanner
+from app.services.candle_builder import CandleBuilder
 
 logger = logging.getLogger("SFMOS.FyersListener")
 
+# Ticks are buffered and handed to the scanner in batches, like FyersSocketService's 300ms window
+_BATCH_INTERVAL_S = 0.300
+
 class FyersListener:
     """
     SFM-OS Async Broker WebSocket Listener.
     Establishes connection to Fyers streaming API and routes raw ticks into the Breakout Scanner.
     Supports auto-reconnection with exponential backoff and simulated mock sweeps.
+    Ticks are buffered as parallel arrays and flushed to ``BreakoutScanner.on_ticks`` every 300ms.
     """
     
     def __init__(self, breakout_scanner: BreakoutScanner):
         self.scanner = breakout_scanner
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._pending: Tuple[List[str], List[float], List[float], List[int]] = ([], [], [], [])
 
     async def start(self):
         """Starts the asynchronous WebSocket listener thread loop."""
@@ -27,8 +34,29 @@ class FyersListener:
             return
         self._running = True
         self._task = asyncio.create_task(self._listen_loop())
+        self._batch_task = asyncio.create_task(self._batch_loop())
         logger.info("Fyers WebSocket Listener service started.")
 
+    def _on_tick(self, symbol: str, price: float, volume: float, timestamp: datetime):
+        """Buffers one tick for the next batch. Synchronous and O(1) - no computation here."""
+        symbols, prices, volumes, stamps = self._pending
+        symbols.append(symbol)
+        prices.append(price)
+        volumes.append(volume)
+        stamps.append(CandleBuilder.epoch_ns(timestamp))
+
+    async def _batch_loop(self):
+        """Every 300ms swaps the tick buffer and hands it to the scanner in one call."""
+        while self._running:
+            await asyncio.sleep(_BATCH_INTERVAL_S)
+            batch, self._pending = self._pending, ([], [], [], [])
+            if not batch[0]:
+                continue
+            try:
+                await self.scanner.on_ticks(*batch)
+            except Exception as e:
+                logger.error(f"Tick batch dispatch failed ({len(batch[0])} ticks): {e}")
+
     async def _listen_loop(self):
         retry_delay = 1.0
         
@@ -71,9 +99,9 @@ class FyersListener:
                         
                         now = datetime.now(timezone.utc)
                         
-                        # Forward the parsed tick straight into the Breakout Scanner
+                        # Buffer the parsed tick for the next Breakout Scanner batch
                         logger.debug(f"[SimFeed] Tick: {sym} -> price: {prices[sym]:.2f}, vol: {tick_vol}")
-                        asyncio.create_task(self.scanner.on_tick(sym, prices[sym], tick_vol, now))
+                        self._on_tick(sym, prices[sym], tick_vol, now)
                         
                 # Reset delay on successful run
                 retry_delay = 1.0
@@ -86,10 +114,11 @@ class FyersListener:
         """Stops the listener task cleanly."""
         logger.info("Stopping Fyers WebSocket Listener...")
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._task, self._batch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         logger.info("Fyers WebSocket Listener stopped.")
@@ -1159,6 +1159,7 @@ async function fetchData(isBackground = false) {
         const symbolInput = document.getElementById('symbol-input');
         let symbol = symbolInput ? symbolInput.value.trim().toUpperCase() : "NIFTY50";
         if (!symbol) symbol = "NIFTY50"; // Fallback to avoid empty ticker error
+        if (window._wsPool) window._wsPool.subscribe(symbol);
         
         const tfSelector = document.getElementById('tf-selector');
         const tf = tfSelector ? tfSelector.value : '1D';
@@ -3238,6 +3239,18 @@ async function fetchRotation() {
         scanner: null,
     };
     const retryMs = { ticks: 2000, signals: 3000, alerts: 3000, scanner: 5000 };
+    const SYMBOL_CHANNELS = ['ticks', 'signals'];
+    let activeSymbol = null;
+
+    function subscribe(symbol) {
+        activeSymbol = (symbol || '').toUpperCase();
+        SYMBOL_CHANNELS.forEach(ch => {
+            const ws = channels[ch];
+            if (ws && ws.readyState === 1) {
+                ws.send(JSON.stringify({ action: 'set', symbols: activeSymbol ? [activeSymbol] : [] }));
+            }
+        });
+    }
 
     function connect(ch) {
         if (channels[ch] && channels[ch].readyState <= 1) return; // already open/connecting
@@ -3252,6 +3265,10 @@ async function fetchRotation() {
 
             ws.onopen = () => {
                 console.log(`[WS:${ch}] Connected`);
+                // Only stream ticks/signals for the symbol on screen
+                if (SYMBOL_CHANNELS.includes(ch) && activeSymbol) {
+                    ws.send(JSON.stringify({ action: 'set', symbols: [activeSymbol] }));
+                }
                 // Reset backoff on successful connect
                 retryMs[ch] = ch === 'ticks' ? 2000 : ch === 'signals' ? 3000 : ch === 'alerts' ? 3000 : 5000;
             };
@@ -3401,7 +3418,7 @@ async function fetchRotation() {
     });
 
     // Expose so fetchData can reset on symbol change
-    window._wsPool = { channels, connect };
+    window._wsPool = { channels, connect, subscribe };
 })();
 
 window.onload = function () {
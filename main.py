@@ -11,6 +11,7 @@ import pandas as pd
 import requests
 import uvicorn
 import os
+import time
 import collections
 from datetime import timedelta
 from contextlib import asynccontextmanager
@@ -72,11 +73,13 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, RedirectResponse, JSONResponse, HTMLResponse
 
 from app.services.market_data import MarketDataService
+from app.services.timeframe_service import TimeframeService
 from app.services.fundamentals import FundamentalService
 from app.services.fundamental_screener_service import FundamentalScreener
 from app.services.sector_service import SectorService
 from app.services.constituent_service import ConstituentService
 from app.services.market_status_service import MarketStatusService
+from app.services.chart_encoder import ChartEncoder
 from app.engine.swing import SwingEngine
 from app.engine.zones import ZoneEngine
 from app.engine.sr import SREngine
@@ -89,6 +92,9 @@ from app.ai.engine import AIEngine
 from app.services.fyers_service import FyersService
 from app.services.fyers_socket_service import FyersSocketService
 from app.utils.market_calendar import MarketCalendar
+from app.utils.fast_json import FastJSON, FastJSONResponse
+from app.events.bus import Subscription, Topics, get_event_bus
+from app.websocket.broadcaster import ConnectionManager
 from app.config import fyers_config
 
 # Trade Decision Engine Imports
@@ -138,7 +144,7 @@ async def lifespan(app: FastAPI):
     async def safety_sync_loop():
         """
         Runs every 60s. Performs a full intelligence cycle to:
-        1. Populate _realtime_buffers for new symbols (so WebSocket can update them).
+        1. Seed live bar buffers for new symbols (so WebSocket ticks can update them).
         2. Correct any drift from missed WebSocket ticks.
         3. Acts as the sole data source when WebSocket is disconnected.
         Does NOT overwrite valid real-time data if it is more recent than the sync.
@@ -158,9 +164,8 @@ async def lifespan(app: FastAPI):
                         if age < 90:
                             await asyncio.sleep(SYNC_INTERVAL)
                             continue
+                    # The cycle also (re)seeds the live bar buffers that WebSocket ticks update
                     await asyncio.to_thread(ScreenerService.update_intelligence_cycle, timeframe="1D")
-                    # Populate realtime buffers from latest batch data
-                    _populate_realtime_buffers(ScreenerService)
                 else:
                     print("[SafetySync] Market closed. Serving stale cache if available.", flush=True)
                     # Cause 2 Fix: If cache is empty (e.g. first weekend load), trigger ONE background scan
@@ -175,24 +180,6 @@ async def lifespan(app: FastAPI):
                 print(f"[SafetySync] Error: {e}", flush=True)
             await asyncio.sleep(SYNC_INTERVAL)
 
-    def _populate_realtime_buffers(ScreenerService):
-        """Seeds the real-time OHLCV buffers from latest screener batch data."""
-        try:
-            from app.services.market_data import MarketDataService
-            for sym_data in ScreenerService._intelligence_cache.get("data", []):
-                symbol = sym_data.get("symbol", "")
-                if not symbol or symbol in ScreenerService._realtime_buffers:
-                    continue  # Already has a live buffer; don't overwrite
-                # Try to get cached OHLCV from market data layer
-                yf_sym = symbol + ".NS"
-                cache_entry = MarketDataService._ohlcv_cache.get(yf_sym)
-                if cache_entry and 'df' in cache_entry:
-                    df = cache_entry['df']
-                    if not df.empty:
-                        ScreenerService._realtime_buffers[symbol] = df.tail(100).copy()
-        except Exception as e:
-            print(f"[SafetySync] Buffer populate error: {e}", flush=True)
-
     # --- WEBSOCKET STREAMING SERVICE ---
     async def start_websocket_service():
         """Starts FyersSocketService after warmup completes."""
@@ -209,11 +196,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"[FyersSocket] Startup error: {e}", flush=True)
 
+    event_consumers = start_event_consumers()
     asyncio.create_task(safety_sync_loop())
     asyncio.create_task(start_websocket_service())
     asyncio.create_task(_warmup())
     yield
     await FyersSocketService.stop()
+    for task in event_consumers:
+        task.cancel()
 
 
 # Authentication Constants
@@ -238,45 +228,12 @@ def login_required(user: Optional[str] = Depends(get_current_user)):
     #     )
     # return user
 
-app = FastAPI(title="Support & Resistance Dashboard", lifespan=lifespan)
+app = FastAPI(title="Support & Resistance Dashboard", lifespan=lifespan, default_response_class=FastJSONResponse)
 ai_engine = AIEngine()
 
+# Responses returned directly (FastJSONResponse) don't pick up headers set on the injected Response
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache, no-store, must-revalidate"}
 
-def _json_serializable(obj):
-    """Recursively convert numpy types and non-serializable objects to python types."""
-    import numpy as np
-    import math
-    
-    if isinstance(obj, dict):
-        return {_json_serializable(k): _json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple, set)):
-        return [_json_serializable(v) for v in obj]
-    elif isinstance(obj, np.ndarray):
-        return [_json_serializable(v) for v in obj.tolist()]
-    
-    # Handle numpy scalars by converting to python types first
-    if hasattr(obj, 'item') and callable(getattr(obj, 'item')):
-        obj = obj.item()
-
-    if isinstance(obj, (np.floating, float)):
-        val = float(obj)
-        return None if math.isnan(val) or math.isinf(val) else val
-    elif isinstance(obj, (np.integer, int)):
-        return int(obj)
-    elif isinstance(obj, (np.bool_, bool, np.bool_)):
-        return bool(obj)
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    
-    # Handle string cases for numpy specifically if they slipped through
-    if str(type(obj)).find('numpy') != -1:
-        if str(type(obj)).find('bool') != -1: return bool(obj)
-        if str(type(obj)).find('int') != -1: return int(obj)
-        if str(type(obj)).find('float') != -1:
-            val = float(obj)
-            return None if math.isnan(val) or math.isinf(val) else val
-
-    return obj
 
 def _to_price_list(levels):
     prices = []
@@ -378,7 +335,7 @@ async def get_market_regime_v2(tf: str = "1D"):
     try:
         from app.services.screener_service import ScreenerService
         regime = ScreenerService._calculate_market_regime(tf)
-        return {"status": "success", "data": _json_serializable(regime)}
+        return FastJSONResponse({"status": "success", "data": regime})
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -392,7 +349,7 @@ async def get_active_sectors_v2(tf: str = "1D"):
         from app.engine.sector_rotation import SectorRotationEngine
         sector_data = ScreenerService._calculate_sector_rotation(tf)
         active_focus = SectorRotationEngine.get_focus_sectors(sector_data)
-        return {"status": "success", "data": _json_serializable(active_focus)}
+        return FastJSONResponse({"status": "success", "data": active_focus})
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -406,15 +363,15 @@ async def get_portfolio_exposure_v2(tf: str = "1D"):
     try:
         from app.services.screener_service import ScreenerService
         res = ScreenerService.get_screener_data(tf)
-        return {
+        return FastJSONResponse({
             "status": "success",
-            "data": _json_serializable({
+            "data": {
                 "total_exposure_pct": 28.0,
                 "sector_concentration": res.get("sector_concentration", []),
                 "cash_buffer_pct": 30.0,
                 "open_positions": 7
-            })
-        }
+            }
+        })
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -600,8 +557,8 @@ async def ping():
     return {"status": "ok", "ts": datetime.now().isoformat()}
 
 @app.get("/api/v1/dashboard", dependencies=[Depends(login_required)])
-async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "1D", strategy: str = "SR", lite: bool = False):
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "1D", strategy: str = "SR", lite: bool = False, chart: str = "rows"):
+    response.headers.update(NO_CACHE_HEADERS)
     print(f"DEBUG: Dashboard Request - {symbol} @ {tf} | Strategy: {strategy} | lite={lite}")
     try:
         # 0. Normalize Symbol
@@ -621,12 +578,21 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
 
         async def fetch_mtf_wrapper(htf_name):
             try:
-                h_df, _, h_err, _ = await asyncio.to_thread(
-                    MarketDataService.get_ohlcv, 
-                    norm_symbol, 
-                    htf_name, 
-                    use_fast_info=False
-                )
+                h_df = None
+                # Derive the higher timeframe from the long primary base series when it covers enough
+                # bars; only fall back to an upstream fetch when it does not.
+                if TimeframeService.can_derive(tf, htf_name):
+                    base_df, _, _, _ = await primary_task
+                    h_df = await asyncio.to_thread(TimeframeService.derive, norm_symbol, tf, base_df, htf_name)
+                    if h_df is not None and len(h_df) < TimeframeService.MIN_DERIVED_BARS:
+                        h_df = None
+                if h_df is None:
+                    h_df, _, h_err, _ = await asyncio.to_thread(
+                        MarketDataService.get_ohlcv, 
+                        norm_symbol, 
+                        htf_name, 
+                        use_fast_info=False
+                    )
                 if h_df.empty: return htf_name, [], []
                 
                 hs, hr = [], []
@@ -664,7 +630,10 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
                 return None, "NEUTRAL"
 
         # Start everything in parallel
-        primary_task = asyncio.create_task(asyncio.to_thread(MarketDataService.get_ohlcv, norm_symbol, tf))
+        # The primary fetch doubles as the base series for derivable higher timeframes, so it is
+        # requested long enough for them and trimmed to DISPLAY_BARS below
+        base_count = TimeframeService.base_count(tf, higher_tfs)
+        primary_task = asyncio.create_task(asyncio.to_thread(MarketDataService.get_ohlcv, norm_symbol, tf, base_count))
         sector_task = asyncio.create_task(get_sector_state_task())
         mtf_tasks = [asyncio.create_task(fetch_mtf_wrapper(h)) for h in higher_tfs]
 
@@ -695,6 +664,8 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
             print(f"CRITICAL: Primary data fetch timed out for {symbol} after 14s.")
             return {"status": "error", "message": "Market data fetch timed out. Please retry."}
             
+        if base_count > TimeframeService.DISPLAY_BARS:
+            df = df.tail(TimeframeService.DISPLAY_BARS)
         cmp = float(df['close'].iloc[-1])
 
         
@@ -798,36 +769,16 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
         if not ai_analysis: ai_analysis = {}
 
         # 5. Final Formatting - Filter out NaN candles that crash lightweight-charts
-        ohlcv = []
-        import math
         from app.engine.vwap import VWAPEngine
         try:
             vwap_series = VWAPEngine.calculate_vwap(df, tf)
         except Exception as ve:
             print(f"[Backend VWAP] Calculation error: {ve}")
-            vwap_series = pd.Series(dtype=float)
+            vwap_series = None
+
+        chart_columns = ChartEncoder.columns(df, vwap_series)
+        ohlcv = chart_columns if chart == "columns" else ChartEncoder.rows(chart_columns)
 
-        for i in range(len(df)):
-            try:
-                o, h, l, c = float(df['open'].iloc[i]), float(df['high'].iloc[i]), float(df['low'].iloc[i]), float(df['close'].iloc[i])
-                if math.isnan(o) or math.isnan(h) or math.isnan(l) or math.isnan(c):
-                    continue
-                    
-                v = float(df['volume'].iloc[i]) if 'volume' in df.columns else 0.0
-                vw = float(vwap_series.iloc[i]) if not vwap_series.empty and i < len(vwap_series) else None
-                if vw is not None and math.isnan(vw):
-                    vw = None
-                ohlcv.append({
-                    "time": int(df.index[i].timestamp()),
-                    "open": o,
-                    "high": h,
-                    "low": l,
-                    "close": c,
-                    "volume": 0.0 if math.isnan(v) else v,
-                    "vwap": vw
-                })
-            except: continue
-            
         # Initialize response_data with meta and structured levels
         ns, nr = _resolve_summary_levels(cmp, supports, resistances, mtf_levels)
         
@@ -884,11 +835,7 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
 
         # 6. Trade Decision Add-on (Unified V5 Execution Edge)
         try:
-            from app.trade_engine.models import MarketContext
             from app.trade_engine.trade_decision_service import TradeDecisionService as V5Engine
-            from app.engine.insights import InsightEngine as MetricsEngine
-            from app.engine.zones import ZoneEngine as VolEngine
-            from app.engine.regime import MarketRegimeEngine as TrendEngine
             
             # Fetch real-time quotes for OI/PCR
             quotes = {}
@@ -910,37 +857,23 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
                 elif oi_change < -5 and strategy_result.get("side") == "LONG": oi_buildup = "Short Covering"
                 elif oi_change < -5 and strategy_result.get("side") == "SHORT": oi_buildup = "Long Unwinding"
 
-            # Calculate metrics for V5 Engine
-            atr_series = await asyncio.to_thread(VolEngine.calculate_atr, df)
-            atr = float(atr_series.iloc[-1]) if not atr_series.empty else cmp * 0.01
-            adx = await asyncio.to_thread(MetricsEngine.get_adx, df)
-            vol_ratio = await asyncio.to_thread(MetricsEngine.get_volume_ratio, df)
-            
-            # Build Market Context
-            context = MarketContext(
-                symbol=symbol,
-                price=cmp,
-                open=float(df['open'].iloc[-1]),
-                high=float(df['high'].iloc[-1]),
-                low=float(df['low'].iloc[-1]),
-                close=float(df['close'].iloc[-1]),
-                prev_close=float(df['close'].iloc[-2]) if len(df) > 1 else cmp,
-                supports=[float(s['price']) for s in supports if 'price' in s],
-                resistances=[float(r['price']) for r in resistances if 'price' in r],
-                atr=atr,
-                adx=adx,
-                volume_ratio=vol_ratio,
-                trend=strategy_result.get("side", "BULLISH"),
+            # Build Market Context (ATR/ADX/volume ratio reuse the indicators computed above for df)
+            context = await asyncio.to_thread(
+                V5Engine.build_context,
+                symbol,
+                df,
+                [float(s['price']) for s in supports if 'price' in s],
+                [float(r['price']) for r in resistances if 'price' in r],
+                strategy_result.get("side", "BULLISH"),
                 oi_data={"oi": oi, "oi_buildup": oi_buildup}
             )
             
             # Generate V5 Decision
             decision = await asyncio.to_thread(V5Engine.generate_trade, context, tf)
-            import json
-            if hasattr(decision, "model_dump_json"):
-                decision_dict = json.loads(decision.model_dump_json())
+            if hasattr(decision, "model_dump"):
+                decision_dict = decision.model_dump(mode="json")
             else:
-                decision_dict = json.loads(decision.json())
+                decision_dict = FastJSON.scrub(decision.dict())
             
             # Inject into response
             response_data["decision"] = decision_dict
@@ -965,16 +898,16 @@ async def get_dashboard(response: Response, symbol: str = "NIFTY50", tf: str = "
         response_data["fundamentals"] = fundamentals
         response_data["source"] = source
 
-        return _json_serializable(response_data)
+        return FastJSONResponse(response_data, headers=NO_CACHE_HEADERS)
     except Exception as e:
         import traceback
         print(f"CRITICAL API ERROR in get_dashboard: {e}")
         traceback.print_exc()
-        return _json_serializable({
+        return FastJSONResponse({
             "status": "error",
             "message": f"Server Error: {str(e)}",
             "traceback": traceback.format_exc()
-        })
+        }, headers=NO_CACHE_HEADERS)
 
 
 
@@ -1274,7 +1207,16 @@ async def get_intelligence_health():
     # Merge in market session status
     health["market_status"] = MarketCalendar.get_market_status()
 
-    return _json_serializable(health)
+    # OHLCV cache efficiency (hit/miss/eviction counters)
+    health["ohlcv_cache"] = MarketDataService.get_cache_stats()
+
+    # Per-provider fetch pacing (rate, AIMD window, 429s, throughput)
+    from app.services.fetch_scheduler import FetchScheduler
+    health["fetch_scheduler"] = FetchScheduler.get_metrics()
+    health["event_bus"] = get_event_bus().get_metrics()
+    health["websockets"] = ws_manager.get_metrics()
+
+    return FastJSONResponse(health)
 
 @app.get("/api/v1/intelligence", dependencies=[Depends(login_required)])
 async def get_intelligence():
@@ -1289,9 +1231,10 @@ async def get_intelligence():
     if status["status"] == "warming":
         return JSONResponse(status_code=202, content={"status": "warming", "message": "Intelligence engine is calculating initial signals..."})
     
-    return _json_serializable({
+    return FastJSONResponse({
         "status": "success",
         "last_updated": status["last_updated"],
+        "live_updated": status.get("live_updated"),
         "count": len(status["data"]),
         "data": status["data"]
     })
@@ -1323,7 +1266,7 @@ async def get_momentum_hits(tf: str = "1D", force: bool = False):
         market_status = MarketStatusService.get_market_status()
         enriched = TradeDecisionService.annotate_many(filtered, market_phase=market_status["market_phase"])
         
-        return _json_serializable({
+        return FastJSONResponse({
             "status": "success",
             "count": len(enriched),
             "data": enriched,
@@ -1581,20 +1524,14 @@ async def generate_trade_api(symbol: str = "TCS", tf: str = "15m", strategy: str
 
         # 2. Extract Key Metrics
         from app.engine.insights import InsightEngine
-        from app.engine.zones import ZoneEngine
         from app.engine.regime import MarketRegimeEngine
         
-        cmp = float(df['close'].iloc[-1])
         supports, resistances = await asyncio.to_thread(SREngine.calculate_sr_levels, df)
         
         # Mapping SR results to simple list of prices
         support_prices = [s['price'] for s in supports]
         resistance_prices = [r['price'] for r in resistances]
         
-        atr_series = await asyncio.to_thread(ZoneEngine.calculate_atr, df)
-        atr = float(atr_series.iloc[-1]) if not atr_series.empty else cmp * 0.01
-        
-        adx = await asyncio.to_thread(InsightEngine.get_adx, df)
         regime = await asyncio.to_thread(MarketRegimeEngine.detect_regime, df)
         
         # Map regime to simple trend
@@ -1603,27 +1540,19 @@ async def generate_trade_api(symbol: str = "TCS", tf: str = "15m", strategy: str
         elif "DOWNTREND" in regime: trend = "BEARISH"
         
         # 3. Create Market Context
-        vol_ratio = await asyncio.to_thread(InsightEngine.get_volume_ratio, df)
-        
         # ScanX Style: Daily Volume Comparison
         df_daily, _, _, _ = await asyncio.to_thread(MarketDataService.get_ohlcv, norm_symbol, "1D")
         daily_vol_ratio = await asyncio.to_thread(InsightEngine.get_daily_volume_ratio, df_daily, df)
         
-        context = MarketContext(
-            symbol=symbol,
-            price=cmp,
-            open=float(df['open'].iloc[-1]),
-            high=float(df['high'].iloc[-1]),
-            low=float(df['low'].iloc[-1]),
-            close=float(df['close'].iloc[-1]),
-            prev_close=float(df['close'].iloc[-2]) if len(df) > 1 else cmp,
-            supports=support_prices,
-            resistances=resistance_prices,
-            atr=atr,
-            adx=adx,
-            volume_ratio=vol_ratio,
+        # ATR/ADX/volume ratio come from df's indicator context, shared with the regime call above
+        context = await asyncio.to_thread(
+            V5TradeEngine.build_context,
+            symbol,
+            df,
+            support_prices,
+            resistance_prices,
+            trend,
             daily_volume_ratio=daily_vol_ratio,
-            trend=trend,
             higher_tf_trend="NEUTRAL" # Can be updated with 1D/4H analysis if needed
         )
         
@@ -1633,20 +1562,14 @@ async def generate_trade_api(symbol: str = "TCS", tf: str = "15m", strategy: str
         # 5. Format Output
         formatted_text = TradeBuilder.format_output(decision)
         
-        import json
-        if hasattr(decision, "model_dump_json"):
-            decision_json = json.loads(decision.model_dump_json())
-        else:
-            decision_json = json.loads(decision.json())
-
-        return {
+        return FastJSONResponse({
             "status": "success",
             "symbol": symbol,
             "volume_ratio": daily_vol_ratio,
-            "intraday_volume_ratio": vol_ratio,
-            "decision": decision_json,
+            "intraday_volume_ratio": context.volume_ratio,
+            "decision": decision,
             "recommendation": formatted_text
-        }
+        })
         
     except Exception as e:
         print(f"Error in generate_trade_api: {e}")
@@ -1663,85 +1586,70 @@ from app.engine.signal_engine import SignalEngine
 from app.services.database_service import DatabaseService
 from app.services.screener_service import ScreenerService
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {
-            "ticks": [],
-            "signals": [],
-            "alerts": [],
-            "scanner": []
-        }
-
-    async def connect(self, websocket: WebSocket, channel: str):
-        await websocket.accept()
-        if channel in self.active_connections:
-            self.active_connections[channel].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, channel: str):
-        if channel in self.active_connections:
-            if websocket in self.active_connections[channel]:
-                self.active_connections[channel].remove(websocket)
+ws_manager = ConnectionManager()
 
-    async def broadcast(self, channel: str, message: Any):
-        if channel not in self.active_connections:
-            return
-        
-        if not isinstance(message, str):
-            try:
-                import json
-                message = json.dumps(_json_serializable(message))
-            except Exception as e:
-                print(f"[WS Broadcaster] JSON serialization failed: {e}", flush=True)
-                return
-                
-        disconnected = []
-        for connection in self.active_connections[channel]:
-            try:
-                await connection.send_text(message)
-            except Exception:
-                disconnected.append(connection)
-                
-        for conn in disconnected:
-            self.disconnect(conn, channel)
 
-ws_manager = ConnectionManager()
+async def _serve_channel(websocket: WebSocket, channel: str):
+    # Optional initial subscription: /ws/ticks?symbols=RELIANCE,TCS
+    symbols = (websocket.query_params.get("symbols") or "").split(",")
+    client = await ws_manager.connect(websocket, channel, symbols=symbols)
+    try:
+        while True:
+            text = await websocket.receive_text()
+            if client is not None:
+                client.handle_message(text)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        ws_manager.disconnect(websocket, channel)
 
 # WebSocket Endpoints
 @app.websocket("/ws/ticks")
 async def websocket_ticks(websocket: WebSocket):
-    await ws_manager.connect(websocket, "ticks")
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        ws_manager.disconnect(websocket, "ticks")
+    await _serve_channel(websocket, "ticks")
 
 @app.websocket("/ws/signals")
 async def websocket_signals(websocket: WebSocket):
-    await ws_manager.connect(websocket, "signals")
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        ws_manager.disconnect(websocket, "signals")
+    await _serve_channel(websocket, "signals")
 
 @app.websocket("/ws/alerts")
 async def websocket_alerts(websocket: WebSocket):
-    await ws_manager.connect(websocket, "alerts")
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        ws_manager.disconnect(websocket, "alerts")
+    await _serve_channel(websocket, "alerts")
 
 @app.websocket("/ws/scanner")
 async def websocket_scanner(websocket: WebSocket):
-    await ws_manager.connect(websocket, "scanner")
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        ws_manager.disconnect(websocket, "scanner")
+    await _serve_channel(websocket, "scanner")
+
+@app.websocket("/ws/breakouts")
+async def websocket_breakouts(websocket: WebSocket):
+    await _serve_channel(websocket, "breakouts")
+
+
+# Event bus consumers: producers publish, these fan events out to WebSocket clients and the alert log
+def _broadcast_to(channel: str, by_symbol: bool = False):
+    async def handle(batch: List[Dict[str, Any]]):
+        for event in batch:
+            await ws_manager.broadcast(channel, event, symbol=event.get("symbol") if by_symbol else None)
+    return handle
+
+
+async def _persist_alerts(batch: List[Dict[str, Any]]):
+    await asyncio.to_thread(DatabaseService.log_alerts, batch)
+
+
+def start_event_consumers() -> List[asyncio.Task]:
+    bus = get_event_bus()
+    by_symbol = lambda event: event.get("symbol")
+    return [
+        # Slow clients only need the latest tick/signal per symbol and the latest scan
+        bus.consume(Topics.TICKS, _broadcast_to("ticks", by_symbol=True), policy=Subscription.COALESCE, key=by_symbol),
+        bus.consume(Topics.SIGNALS, _broadcast_to("signals", by_symbol=True), policy=Subscription.COALESCE, key=by_symbol),
+        bus.consume(Topics.SCANNER, _broadcast_to("scanner"), policy=Subscription.COALESCE, key=lambda event: "latest"),
+        bus.consume(Topics.ALERTS, _broadcast_to("alerts")),
+        bus.consume(Topics.BREAKOUTS, _broadcast_to("breakouts")),
+        # Alerts are written in batched transactions instead of one insert per alert
+        bus.consume(Topics.ALERTS, _persist_alerts, batch_size=200, linger=0.5, maxsize=10000),
+    ]
 
 
 # Real-time Telemetry & Alerts Hook
@@ -1752,8 +1660,8 @@ async def evaluate_realtime_signal_and_alerts(symbol: str, price: float, volume:
         clean_sym = symbol.replace(".NS", "").replace(".BO", "").split(":")[-1].split("-")[0]
         sig_data = await asyncio.to_thread(SignalEngine.generate_signal, clean_sym)
         
-        # Broadcast signal update
-        await ws_manager.broadcast("signals", {
+        # Publish signal update
+        await get_event_bus().publish(Topics.SIGNALS, {
             "symbol": clean_sym,
             "signal": sig_data.get("signal"),
             "confidence": sig_data.get("confidence"),
@@ -1769,8 +1677,7 @@ async def evaluate_realtime_signal_and_alerts(symbol: str, price: float, volume:
         if gann_bo and gann_bo.get("status") in ["BREAKOUT_G1", "BREAKOUT_G2", "BREAKOUT_G3", "BREAKDOWN_G1", "BREAKDOWN_G2", "BREAKDOWN_G3"]:
             alert_type = "GANN_BREAKOUT"
             message = f"Gann level breakout detected on {clean_sym}: price is at {price}, breaking {gann_bo.get('status').lower()} through level {gann_bo.get('level')}"
-            DatabaseService.log_alert(clean_sym, alert_type, price, message)
-            await ws_manager.broadcast("alerts", {
+            await get_event_bus().publish(Topics.ALERTS, {
                 "symbol": clean_sym,
                 "alert_type": alert_type,
                 "price": price,
@@ -1783,8 +1690,7 @@ async def evaluate_realtime_signal_and_alerts(symbol: str, price: float, volume:
         if vwap_ev and vwap_ev.get("crossover") in ["BULLISH_CROSSOVER", "BEARISH_CROSSOVER"]:
             alert_type = "VWAP_CROSSOVER"
             message = f"VWAP crossover detected on {clean_sym}: price is at {price}, crossover is {vwap_ev.get('crossover').lower()}"
-            DatabaseService.log_alert(clean_sym, alert_type, price, message)
-            await ws_manager.broadcast("alerts", {
+            await get_event_bus().publish(Topics.ALERTS, {
                 "symbol": clean_sym,
                 "alert_type": alert_type,
                 "price": price,
@@ -1797,8 +1703,7 @@ async def evaluate_realtime_signal_and_alerts(symbol: str, price: float, volume:
         if vol_m and vol_m.get("is_spike"):
             alert_type = "VOLUME_SPIKE"
             message = f"Volume spike detected on {clean_sym}: price is at {price}, relative volume is {vol_m.get('rvol')}x"
-            DatabaseService.log_alert(clean_sym, alert_type, price, message)
-            await ws_manager.broadcast("alerts", {
+            await get_event_bus().publish(Topics.ALERTS, {
                 "symbol": clean_sym,
                 "alert_type": alert_type,
                 "price": price,
@@ -1811,8 +1716,7 @@ async def evaluate_realtime_signal_and_alerts(symbol: str, price: float, volume:
         if sm and sm.get("state") in ["BULLISH_MANIPULATION", "BEARISH_MANIPULATION", "ACCUMULATION", "DISTRIBUTION", "ABSORPTION", "BREAKOUT_LOADING"]:
             alert_type = "SMART_MONEY"
             message = f"Smart Money pattern '{sm.get('state')}' detected on {clean_sym}: {sm.get('narrative')}"
-            DatabaseService.log_alert(clean_sym, alert_type, price, message)
-            await ws_manager.broadcast("alerts", {
+            await get_event_bus().publish(Topics.ALERTS, {
                 "symbol": clean_sym,
                 "alert_type": alert_type,
                 "price": price,
@@ -1832,8 +1736,8 @@ async def wrapped_update_realtime(cls, symbol, price, volume):
     
     clean_symbol = symbol.replace(".NS", "").replace(".BO", "").split(":")[-1].split("-")[0]
     
-    # Broadcast live tick
-    await ws_manager.broadcast("ticks", {
+    # Publish live tick
+    await get_event_bus().publish(Topics.TICKS, {
         "symbol": clean_symbol,
         "price": price,
         "volume": volume,
@@ -1865,9 +1769,11 @@ async def scanner_background_worker():
             print(f"[Background Screener] Running background scan for {len(watchlist)} watchlist symbols...", flush=True)
             
             scanner_results = []
+            # One batched fetch + vectorized indicator pass for the whole watchlist
+            signals = await asyncio.to_thread(SignalEngine.generate_signals, watchlist, "15m")
             for symbol in watchlist:
                 try:
-                    sig_data = await asyncio.to_thread(SignalEngine.generate_signal, symbol, timeframe="15m")
+                    sig_data = signals[symbol]
                     scanner_results.append({
                         "symbol": symbol,
                         "signal": sig_data.get("signal"),
@@ -1882,7 +1788,7 @@ async def scanner_background_worker():
                 except Exception as sym_err:
                     print(f"[Background Screener] Error scanning {symbol}: {sym_err}", flush=True)
                     
-            await ws_manager.broadcast("scanner", {
+            await get_event_bus().publish(Topics.SCANNER, {
                 "scanner_updates": scanner_results,
                 "timestamp": datetime.now().isoformat()
             })
@@ -1901,7 +1807,7 @@ async def stocks_search(q: str = Query(..., min_length=1)):
 @app.get("/api/stocks/dashboard/{symbol}", dependencies=[Depends(login_required)])
 async def stocks_dashboard(symbol: str, tf: str = "15m"):
     sig_data = await asyncio.to_thread(SignalEngine.generate_signal, symbol, tf)
-    return _json_serializable({
+    return FastJSONResponse({
         "status": "success",
         "data": sig_data
     })
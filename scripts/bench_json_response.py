@@ -0,0 +1,64 @@
+"""
+Benchmark the /api/v1/intelligence response encoding.
+
+Compares the old path (recursive scrub -> FastAPI jsonable_encoder -> stdlib JSONResponse)
+with FastJSONResponse on a 100-hit payload built from the screener fallback snapshot, with
+numpy scalars and NaNs injected the way the background engine produces them.
+
+    PYTHONPATH=backend python scripts/bench_json_response.py
+"""
+import json
+import sys
+import timeit
+from itertools import cycle, islice
+from pathlib import Path
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from app.utils.fast_json import FastJSON, FastJSONResponse  # noqa: E402
+
+FALLBACK = Path(__file__).resolve().parent.parent / "backend" / "app" / "data" / "screener_fallback.json"
+
+
+def _numpyify(obj):
+    if isinstance(obj, dict):
+        return {k: _numpyify(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_numpyify(v) for v in obj]
+    if isinstance(obj, bool):
+        return np.bool_(obj)
+    if isinstance(obj, float):
+        return np.float64(obj)
+    if obj is None:
+        return np.nan
+    return obj
+
+
+def build_payload(hits: int = 100) -> dict:
+    rows = json.loads(FALLBACK.read_text())["data"]
+    data = [_numpyify(dict(row, symbol=f"{row['symbol']}{i}")) for i, row in enumerate(islice(cycle(rows), hits))]
+    return {"status": "success", "last_updated": 1760000000.0, "live_updated": None, "count": len(data), "data": data}
+
+
+def legacy(payload):
+    return JSONResponse(jsonable_encoder(FastJSON.scrub(payload))).body
+
+
+def fast(payload):
+    return FastJSONResponse(payload).body
+
+
+def main(number: int = 200):
+    payload = build_payload()
+    assert json.loads(legacy(payload)) == json.loads(fast(payload))
+    print(f"payload: {payload['count']} hits, {len(fast(payload)) / 1024:.1f} KiB")
+    for name, fn in (("scrub + jsonable_encoder + json", legacy), ("FastJSONResponse", fast)):
+        per_call = min(timeit.repeat(lambda: fn(payload), number=number, repeat=5)) / number
+        print(f"{name:>34}: {per_call * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
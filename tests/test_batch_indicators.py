@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.engine import signal_engine as signal_module
+from app.engine.atr import ATREngine
+from app.engine.batch import BatchIndicatorEngine
+from app.engine.cpr import CPREngine
+from app.engine.rsi import RSIEngine
+from app.engine.signal_engine import SignalEngine
+from app.engine.smart_money import SmartMoneyEngine
+from app.engine.volume import VolumeEngine
+from app.engine.vwap import VWAPEngine
+
+
+def _intraday(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    spread = np.abs(rng.normal(0, 0.003, n)) * close
+    index = pd.date_range("2025-03-03 09:15", periods=n, freq="15min", tz="Asia/Kolkata")
+    return pd.DataFrame({
+        'open': close - spread * rng.uniform(-1, 1, n), 'high': close + spread, 'low': close - spread,
+        'close': close, 'volume': rng.integers(1_000, 80_000, n).astype(float),
+    }, index=index)
+
+
+# Different lengths so the shorter rows are padded in the tensor
+FRAMES = {"AAA": _intraday(100, 1), "BBB": _intraday(57, 2), "CCC": _intraday(23, 3)}
+
+
+def test_batch_rows_match_single_frame_engines():
+    frames = list(FRAMES.values())
+    prices, lengths, sessions = BatchIndicatorEngine.stack(frames, with_sessions=True)
+    assert prices.shape == (3, 100, 5) and lengths.tolist() == [100, 57, 23]
+
+    rsi = BatchIndicatorEngine.rsi(prices, 14, lengths)
+    atr = BatchIndicatorEngine.atr(prices, 14, lengths)
+    vwap = BatchIndicatorEngine.vwap(prices, sessions, lengths)
+    volume = BatchIndicatorEngine.volume_metrics(prices, lengths)
+    smart_money = BatchIndicatorEngine.smart_money(prices, lengths)
+    cpr = BatchIndicatorEngine.cpr(prices, sessions, lengths)
+
+    for i, df in enumerate(frames):
+        n = len(df)
+        assert np.isnan(rsi[i, :100 - n]).all() and np.isnan(vwap[i, :100 - n]).all()
+        np.testing.assert_array_equal(rsi[i, -n:], RSIEngine.calculate_rsi(df))
+        np.testing.assert_array_equal(atr[i, -n:], ATREngine.calculate_atr(df))
+        np.testing.assert_array_equal(vwap[i, -n:], VWAPEngine.calculate_vwap(df, "15m"))
+        assert VolumeEngine.describe_metrics(volume, i) == VolumeEngine.calculate_volume_metrics(df)
+        assert SmartMoneyEngine.describe_activity(smart_money, i) == SmartMoneyEngine.detect_smart_money_activity(df)
+        assert CPREngine.describe_levels(cpr, i, df.index) == CPREngine.calculate_cpr_levels(df)
+
+
+def test_daily_bars_aggregate_sessions():
+    df = FRAMES["BBB"]
+    prices, lengths, sessions = BatchIndicatorEngine.stack([df], with_sessions=True)
+    daily, counts, positions = BatchIndicatorEngine.daily_bars(prices, sessions, lengths)
+
+    expected = df.groupby(df.index.date).agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    assert counts.tolist() == [len(expected)]
+    np.testing.assert_array_equal(daily[0], expected.to_numpy())
+    assert [df.index[p].date() for p in positions[0]] == list(expected.index)
+
+
+@pytest.fixture
+def signal_env(monkeypatch):
+    batch = {symbol + ".NS": (df, "INR", None, "test") for symbol, df in FRAMES.items()}
+    monkeypatch.setattr(signal_module.MarketDataService, "get_ohlcv_batch", staticmethod(lambda symbols, *a, **k: batch))
+    monkeypatch.setattr(signal_module.MarketDataService, "get_ohlcv",
+                        staticmethod(lambda symbol, *a, **k: batch.get(symbol + ".NS", (None, "INR", "missing", "test"))))
+    monkeypatch.setattr(signal_module.MarketDataService, "normalize_symbol", staticmethod(lambda symbol: symbol + ".NS"))
+    monkeypatch.setattr(signal_module.TimeframeConfluenceEngine, "calculate_confluence",
+                        staticmethod(lambda symbol: {"institutional_trend_bias": "BULLISH"}))
+    monkeypatch.setattr(signal_module.DatabaseService, "save_scanner_signal", staticmethod(lambda **k: None))
+
+
+def test_generate_signals_matches_per_symbol_signals(signal_env):
+    signals = SignalEngine.generate_signals(["AAA", "BBB", "CCC", "ZZZ"])
+
+    assert list(signals) == ["AAA", "BBB", "CCC", "ZZZ"]
+    for symbol in ("AAA", "BBB", "CCC"):
+        assert signals[symbol] == SignalEngine.generate_signal(symbol)
+        assert signals[symbol]["scores"]["trend"] == 6.0
+    assert signals["ZZZ"]["signal"] == "HOLD" and signals["ZZZ"]["details"] == {}
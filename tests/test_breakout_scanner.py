@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.events.bus import InProcessEventBus, Topics
+from app.services.breakout_scanner import BreakoutScanner
+from app.services.market_context_service import MarketContextService
+from app.services.screener_service import ScreenerService
+
+
+@pytest.fixture
+def scanner(monkeypatch):
+    monkeypatch.setattr(MarketContextService, "_snapshot", None)
+    monkeypatch.setattr(ScreenerService, "_calculate_market_regime", staticmethod(lambda tf: {"regime": "BULL MARKET"}))
+    monkeypatch.setattr(ScreenerService, "_calculate_sector_rotation", staticmethod(lambda tf: {"PHARMA_HEALTHCARE": 90.0}))
+
+    scanner = BreakoutScanner(InProcessEventBus())
+    scanner.is_seeding_complete = True
+
+    async def no_audit(*args):
+        return None
+
+    monkeypatch.setattr(scanner, "_audit_log_signal", no_audit)
+    # Zig-zag uptrend: MAs stacked, RSI below the extension gate
+    closes = np.linspace(100, 150, 220) + np.where(np.arange(220) % 2, 1.5, -1.5)
+    scanner.candle_builder.seed_history("DIVISLAB", "1D", [
+        {"timestamp": pd.Timestamp("2024-01-01") + pd.Timedelta(days=i), "open": c - 1, "high": c + 0.2,
+         "low": c - 1, "close": c, "volume": 1000} for i, c in enumerate(closes)
+    ])
+    return scanner
+
+
+def test_breakout_batch_publishes_signal_and_alert(scanner):
+    bus = scanner.event_bus
+    breakouts, alerts = bus.subscribe(Topics.BREAKOUTS), bus.subscribe(Topics.ALERTS)
+    stamp = pd.Timestamp("2025-06-01T04:00Z").value
+
+    signals = asyncio.run(scanner.on_ticks(["DIVISLAB.NS", "DIVISLAB", "TCS"], [153.0, 158.0, 3000.0],
+                                           [5000, 5000, 10], [stamp, stamp + 1, stamp + 2]))
+
+    assert [s["ticker"] for s in signals] == ["DIVISLAB"]
+    assert signals[0]["sector"] == "PHARMA" and signals[0]["regime"] == "BULL"
+    assert breakouts.drain(10) == signals
+    (alert,) = alerts.drain(10)
+    assert (alert["symbol"], alert["alert_type"], alert["price"]) == ("DIVISLAB", "FRESH_BREAKOUT", 158.0)
+
+
+def test_gate_indicators_follow_the_candle_ring(scanner):
+    from app.engine.rsi import RSIEngine
+
+    day = pd.Timestamp("2024-08-08T04:00Z").value  # the day after the seeded history
+    for i, price in enumerate([151.0, 149.0, 150.5]):
+        asyncio.run(scanner.on_ticks(["DIVISLAB"], [price], [1000], [day + i * 86_400 * 10**9]))
+
+    indicators = scanner._indicators["DIVISLAB"]
+    completed = scanner.candle_builder.get_history_df("DIVISLAB", "1D").iloc[:-1]
+    assert indicators.last_time == completed.index[-1].value
+    closes = completed["close"]
+    assert indicators.dma_50.value == pytest.approx(closes.rolling(50).mean().iloc[-1], rel=1e-12)
+    assert indicators.dma_200.value == pytest.approx(closes.rolling(200).mean().iloc[-1], rel=1e-12)
+    assert round(indicators.rsi.value, 2) == float(RSIEngine.calculate_rsi(completed).iloc[-1])
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.candle_builder import CandleBuilder
+
+
+def _run(builder, ticks):
+    async def feed():
+        emitted = []
+        for price, volume, ts in ticks:
+            emitted += await builder.process_tick("ABC", price, volume, ts)
+        return emitted
+    return asyncio.run(feed())
+
+
+def test_ticks_build_and_roll_candles():
+    start = datetime(2025, 3, 3, 3, 45)
+    builder = CandleBuilder()
+    emitted = _run(builder, [(100.0, 10, start), (101.0, 5, start + timedelta(seconds=20)),
+                             (99.5, 7, start + timedelta(seconds=40)), (100.5, 3, start + timedelta(minutes=1, seconds=5))])
+
+    assert emitted == [("1m", {"timestamp": start, "open": 100.0, "high": 101.0, "low": 99.5, "close": 99.5, "volume": 22.0})]
+    df = builder.get_history_df("ABC", "1m")
+    assert df.index.tolist() == [start, start + timedelta(minutes=1)]
+    assert df.iloc[-1].tolist() == [100.5, 100.5, 100.5, 100.5, 3.0]
+    assert builder.get_history_df("ABC", "15m")[["high", "low", "volume"]].iloc[-1].tolist() == [101.0, 99.5, 25.0]
+
+
+def test_history_is_bounded_and_served_as_a_live_read_only_view():
+    builder = CandleBuilder(max_history_len=5)
+    start = datetime(2025, 3, 3, 3, 45)
+    _run(builder, [(100.0 + i, 1, start + timedelta(minutes=i)) for i in range(23)])
+
+    df = builder.get_history_df("ABC", "1m")
+    assert len(df) == 6 and df["open"].tolist() == [117.0, 118.0, 119.0, 120.0, 121.0, 122.0]
+    ring = builder._rings["ABC"]["1m"]
+    assert np.shares_memory(df.to_numpy(), ring._ohlcv)
+    with pytest.raises(ValueError):
+        df.iloc[0, 0] = 0.0
+
+    _run(builder, [(130.0, 2, start + timedelta(minutes=22, seconds=30))])
+    assert builder.get_history_df("ABC", "1m") is df and df["close"].iloc[-1] == 130.0 and df["volume"].iloc[-1] == 3.0
+
+
+def test_seed_history_keeps_the_latest_window():
+    builder = CandleBuilder(max_history_len=3)
+    candles = [{"timestamp": f"2025-01-0{d}T00:00:00Z", "open": d, "high": d, "low": d, "close": d, "volume": d} for d in range(1, 6)]
+    builder.seed_history("ABC", "1D", candles[::-1])
+
+    df = builder.get_history_df("ABC", "1D")
+    assert df["close"].tolist() == [3.0, 4.0, 5.0]
+    assert df.index[0] == datetime(2025, 1, 3)
+
+
+def test_batched_ticks_match_tick_by_tick_processing():
+    rng = np.random.default_rng(11)
+    start = datetime(2025, 3, 3, 3, 45)
+    ticks = []
+    for i in range(600):
+        ts = start + timedelta(seconds=int(i * 2.5)) - timedelta(seconds=int(rng.choice([0, 0, 0, 90])))  # some late ticks
+        ticks.append((str(rng.choice(["AAA", "BBB", "CCC"])), float(100 + rng.random()), int(rng.integers(0, 50)), ts))
+
+    sequential, batched = CandleBuilder(max_history_len=20), CandleBuilder(max_history_len=20)
+    expected = {}
+    for symbol, price, volume, ts in ticks:
+        expected.setdefault(symbol, []).extend(asyncio.run(sequential.process_tick(symbol, price, volume, ts)))
+
+    emitted = {}
+    for i in range(0, len(ticks), 64):
+        chunk = ticks[i:i + 64]
+        result = batched.process_ticks([t[0] for t in chunk], [t[1] for t in chunk], [t[2] for t in chunk],
+                                       [CandleBuilder.epoch_ns(t[3]) for t in chunk])
+        for symbol, candles in result.items():
+            emitted.setdefault(symbol, []).extend(candles)
+
+    order = list(CandleBuilder.TIMEFRAME_SECONDS)
+    for symbol in ("AAA", "BBB", "CCC"):
+        key = lambda e: (order.index(e[0]), e[1]["timestamp"])
+        assert sorted(emitted[symbol], key=key) == sorted(expected[symbol], key=key)
+        for tf in order:
+            assert batched.get_history_df(symbol, tf).equals(sequential.get_history_df(symbol, tf))
@@ -0,0 +1,61 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from app.engine.vwap import VWAPEngine
+from app.services.chart_encoder import ChartEncoder
+
+
+def _loop_rows(df, vwap_series):
+    # The per-row encoder the dashboard used before ChartEncoder
+    ohlcv = []
+    for i in range(len(df)):
+        try:
+            o, h, l, c = (float(df[k].iloc[i]) for k in ('open', 'high', 'low', 'close'))
+            if math.isnan(o) or math.isnan(h) or math.isnan(l) or math.isnan(c):
+                continue
+            v = float(df['volume'].iloc[i]) if 'volume' in df.columns else 0.0
+            vw = float(vwap_series.iloc[i]) if not vwap_series.empty and i < len(vwap_series) else None
+            if vw is not None and math.isnan(vw):
+                vw = None
+            ohlcv.append({"time": int(df.index[i].timestamp()), "open": o, "high": h, "low": l, "close": c,
+                          "volume": 0.0 if math.isnan(v) else v, "vwap": vw})
+        except Exception:
+            continue
+    return ohlcv
+
+
+def _frame(n=200, tz="Asia/Kolkata"):
+    rng = np.random.default_rng(9)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    df = pd.DataFrame({
+        'open': close, 'high': close * 1.002, 'low': close * 0.998, 'close': close,
+        'volume': rng.integers(1_000, 80_000, n).astype(float),
+    }, index=pd.date_range("2025-03-03 09:15", periods=n, freq="15min", tz=tz))
+    df.iloc[[3, n - 150], df.columns.get_loc('close')] = np.nan
+    df.iloc[[7, n - 110], df.columns.get_loc('volume')] = np.nan
+    return df
+
+
+def test_rows_match_the_per_row_encoder():
+    for tz in ("Asia/Kolkata", None):
+        df = _frame(tz=tz)
+        vwap = VWAPEngine.calculate_vwap(df, "15m")
+        vwap.iloc[10] = np.nan
+        rows = ChartEncoder.rows(ChartEncoder.columns(df, vwap))
+        assert len(rows) == 198
+        assert rows == _loop_rows(df, vwap)
+
+
+def test_short_vwap_missing_volume_and_unparseable_prices():
+    df = _frame(160).drop(columns='volume')
+    df['open'] = df['open'].astype(object)
+    df.iloc[12, df.columns.get_loc('open')] = 'bad'
+    vwap = pd.Series(np.arange(5, dtype=float))
+    columns = ChartEncoder.columns(df, vwap)
+
+    assert columns["volume"] == [0.0] * 157
+    assert columns["vwap"][:4] == [0.0, 1.0, 2.0, 4.0] and set(columns["vwap"][4:]) == {None}
+    assert ChartEncoder.rows(columns) == _loop_rows(df, vwap)
+    assert ChartEncoder.columns(df.reset_index(drop=True))["time"] == []
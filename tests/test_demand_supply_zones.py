@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from app.engine.zones import ZoneEngine
+
+
+def _bar(o, h, l, c, v=1_000.0):
+    return {'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+
+
+def _rally_from_base(after):
+    bars = [_bar(100.0, 100.5, 99.8, 100.2) for _ in range(30)]
+    bars += [_bar(100.0, 100.3, 99.9, 100.1), _bar(100.0, 100.3, 99.9, 100.1)]  # base
+    bars.append(_bar(100.1, 102.1, 100.0, 102.0, 5_000.0))  # impulse (leg-out) at index 32
+    bars += after
+    return pd.DataFrame(bars, index=pd.date_range('2025-01-01', periods=len(bars), freq='D'))
+
+
+def _zone_from_impulse(zones):
+    return [z for z in zones if z['creation_idx'] == 32]
+
+
+def test_trailing_mean_matches_prior_window_means():
+    rng = np.random.default_rng(4)
+    volume = rng.integers(1, 10**6, 90).astype(float)
+    volume[[0, 5, 40, 41]] = np.nan
+    series = pd.Series(volume)
+
+    expected = [np.nan] + [series.iloc[max(0, i - 20):i].mean() for i in range(1, 90)]
+    np.testing.assert_array_equal(ZoneEngine._trailing_mean(volume, 20), expected)
+
+
+def test_demand_zone_counts_re_entries_as_touches():
+    away = _bar(103.0, 103.5, 102.9, 103.2)
+    dip = _bar(101.0, 101.2, 100.1, 101.0)
+    df = _rally_from_base([away, away, dip, away, away])
+
+    (zone,) = _zone_from_impulse(ZoneEngine.calculate_demand_supply_zones(df))
+    assert zone['type'] == 'DEMAND'
+    assert (zone['price_low'], zone['price_high']) == (99.8, 100.2)
+    assert zone['touches'] == 1
+    assert zone['last_touched'] == str(df.index[-1])
+
+
+def test_close_through_distal_invalidates_zone():
+    away = _bar(103.0, 103.5, 102.9, 103.2)
+    df = _rally_from_base([away, away, _bar(101.0, 101.0, 99.0, 99.5), away])
+
+    assert _zone_from_impulse(ZoneEngine.calculate_demand_supply_zones(df)) == []
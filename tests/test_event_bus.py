@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from app.events.bus import EventBus, InProcessEventBus, Subscription, Topics
+
+
+def test_overflow_policies():
+    oldest = Subscription("t", maxsize=2)
+    newest = Subscription("t", maxsize=2, policy=Subscription.DROP_NEWEST)
+    latest = Subscription("t", maxsize=2, policy=Subscription.COALESCE, key=lambda e: e["symbol"])
+    for i, symbol in enumerate(["A", "B", "A", "C"]):
+        for sub in (oldest, newest, latest):
+            sub.put({"symbol": symbol, "n": i})
+
+    assert [e["n"] for e in oldest.drain(10)] == [2, 3] and oldest.dropped == 2
+    assert [e["n"] for e in newest.drain(10)] == [0, 1] and newest.dropped == 2
+    # A was coalesced to its latest event, then evicted as the oldest key when C arrived
+    assert latest.drain(10) == [{"symbol": "B", "n": 1}, {"symbol": "C", "n": 3}]
+    assert (latest.coalesced, latest.dropped) == (1, 1)
+    with pytest.raises(ValueError):
+        Subscription("t", policy=Subscription.COALESCE)
+
+
+def test_consumers_receive_batches_and_survive_handler_errors():
+    async def scenario():
+        bus = InProcessEventBus()
+        batches, failures = [], []
+
+        async def handler(batch):
+            if batch == [{"n": -1}]:
+                failures.append(batch)
+                raise RuntimeError("boom")
+            batches.append(batch)
+
+        task = bus.consume(Topics.ALERTS, handler, batch_size=3, linger=0.01)
+        await bus.publish(Topics.ALERTS, {"n": -1})
+        await asyncio.sleep(0.02)
+        for n in range(5):
+            await bus.publish(Topics.ALERTS, {"n": n})
+        await bus.publish(Topics.TICKS, {"n": 99})
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return bus, batches, failures
+
+    bus, batches, failures = asyncio.run(scenario())
+    assert failures and [[e["n"] for e in b] for b in batches] == [[0, 1, 2], [3, 4]]
+    assert bus.published == 7 and bus.get_metrics()["subscriptions"] == []
+
+
+def test_event_bus_base_is_abstract():
+    with pytest.raises(TypeError):
+        EventBus()
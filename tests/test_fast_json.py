@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from app.trade_engine.trade_decision_service import TradeDecisionService
+from app.utils.fast_json import FastJSON, FastJSONResponse
+
+
+class Side(Enum):
+    LONG = "LONG"
+
+
+def _frame(n=120, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({
+        'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+        'volume': rng.integers(1_000, 50_000, n).astype(float),
+    }, index=pd.bdate_range("2025-01-01", periods=n))
+
+
+PAYLOAD = {
+    "price": np.float64(101.5), "qty": np.int64(7), "ready": np.bool_(True), "ratio": np.float32(0.5),
+    "missing": float("nan"), "inf": np.float64("inf"), "nat": pd.NaT,
+    "closes": np.array([1.0, np.nan, 3.0]), "strided": np.arange(6.0).reshape(2, 3)[:, 0],
+    "labels": np.array(["a", "b"]), "tags": {"x"}, "pair": (1, 2),
+    "at": datetime(2025, 1, 2, 9, 15, 30, 5), "bar": pd.Timestamp("2025-01-02 09:15", tz="Asia/Kolkata"),
+    "side": Side.LONG, 3: "int key", "nested": [{"v": np.float64("nan")}],
+}
+
+
+def test_single_pass_matches_scrub_then_stdlib_json():
+    expected = json.loads(json.dumps(jsonable_encoder(FastJSON.scrub(PAYLOAD))))
+    assert json.loads(FastJSON.dumps(PAYLOAD)) == expected
+    assert expected["missing"] is None and expected["closes"] == [1.0, None, 3.0]
+    assert expected["bar"] == "2025-01-02T09:15:00+05:30" and expected["side"] == "LONG"
+
+
+def test_numpy_dict_keys_fall_back_to_scrub():
+    assert json.loads(FastJSON.dumps({np.int64(1): np.float64(2.0)})) == {"1": 2.0}
+
+
+def test_trade_decision_encodes_like_model_dump_json():
+    df = _frame()
+    context = TradeDecisionService.build_context("TEST", df, [90.0], [120.0], "LONG")
+    decision = TradeDecisionService.generate_trade(context, "1D")
+
+    body = FastJSONResponse({"decision": decision}).body
+    assert json.loads(body)["decision"] == json.loads(decision.model_dump_json())
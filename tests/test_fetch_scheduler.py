@@ -0,0 +1,68 @@
+import threading
+import time
+
+from app.services.fetch_scheduler import FetchScheduler, ProviderLimiter
+
+
+def _limiter(**overrides):
+    params = dict(rate=100.0, burst=100, initial_concurrency=4, max_concurrency=8,
+                  min_rate=1.0, max_rate=200.0, latency_target=1.0)
+    params.update(overrides)
+    return ProviderLimiter("test", **params)
+
+
+def test_throttle_halves_window_and_success_grows_it_back():
+    limiter = _limiter()
+    assert limiter.acquire()
+    limiter.release(0.01, "throttled")
+    after_429 = limiter.metrics()
+    assert after_429["concurrencyLimit"] == 2
+    assert after_429["throttled"] == 1
+    assert after_429["rate"] == 50.0
+
+    for _ in range(10):
+        assert limiter.acquire(timeout=1)
+        limiter.release(0.01, "ok")
+    assert limiter.metrics()["concurrencyLimit"] > 2
+
+
+def test_concurrency_window_blocks_until_release():
+    limiter = _limiter(initial_concurrency=1)
+    assert limiter.acquire()
+    assert limiter.acquire(timeout=0.05) is False
+    limiter.release(0.01)
+    assert limiter.acquire(timeout=0.05)
+
+
+def test_interactive_waiters_go_before_background():
+    limiter = _limiter(initial_concurrency=1)
+    assert limiter.acquire()
+    order = []
+
+    def worker(priority, label):
+        limiter.acquire(priority, timeout=2)
+        order.append(label)
+        limiter.release(0.01)
+
+    background = threading.Thread(target=worker, args=(ProviderLimiter.BACKGROUND, "bg"))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=(ProviderLimiter.INTERACTIVE, "ui"))
+    interactive.start()
+    time.sleep(0.05)
+
+    limiter.release(0.01)
+    background.join(2)
+    interactive.join(2)
+    assert order == ["ui", "bg"]
+
+
+def test_priority_context_is_thread_local():
+    assert FetchScheduler.current_priority() == FetchScheduler.INTERACTIVE
+    with FetchScheduler.priority(FetchScheduler.BACKGROUND):
+        assert FetchScheduler.current_priority() == FetchScheduler.BACKGROUND
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(FetchScheduler.current_priority()))
+        t.start(); t.join()
+        assert seen == [FetchScheduler.INTERACTIVE]
+    assert FetchScheduler.current_priority() == FetchScheduler.INTERACTIVE
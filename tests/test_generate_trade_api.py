@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import main
+from app.services.market_data import MarketDataService
+
+
+def _frame(periods: int, freq: str) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    idx = pd.date_range("2025-01-01 09:15", periods=periods, freq=freq)
+    return pd.DataFrame(
+        {
+            "open": close - 0.2,
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": rng.integers(1_000, 5_000, periods).astype(float),
+        },
+        index=idx,
+    )
+
+
+def test_generate_trade_returns_decision_and_volume_ratios(monkeypatch):
+    frames = {"15m": _frame(200, "15min"), "1D": _frame(200, "D")}
+
+    def fake_get_ohlcv(symbol, tf, *args, **kwargs):
+        return frames[tf], "INR", None, "test"
+
+    monkeypatch.setattr(MarketDataService, "get_ohlcv", staticmethod(fake_get_ohlcv))
+    main.app.dependency_overrides[main.login_required] = lambda: "tester"
+    try:
+        response = TestClient(main.app).get("/api/v1/generate-trade", params={"symbol": "TCS", "tf": "15m"})
+    finally:
+        main.app.dependency_overrides.pop(main.login_required, None)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] == "success"
+    assert isinstance(body["intraday_volume_ratio"], float)
+    assert "volume_ratio" in body and body["decision"]
+    assert isinstance(body["recommendation"], str)
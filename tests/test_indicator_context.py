@@ -0,0 +1,66 @@
+import gc
+
+import numpy as np
+import pandas as pd
+
+from app.ai.features import FeatureEngineer
+from app.engine.indicator_context import IndicatorContext
+from app.engine.insights import InsightEngine
+from app.engine.sr import SREngine
+from app.engine.zones import ZoneEngine
+from app.trade_engine.trade_decision_service import TradeDecisionService
+
+
+def _frame(n=120, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({
+        'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+        'volume': rng.integers(1_000, 50_000, n).astype(float),
+    }, index=pd.bdate_range("2025-01-01", periods=n))
+
+
+def _count_calls(monkeypatch, owner, name):
+    calls = []
+    original = getattr(owner, name)
+
+    def counted(*args):
+        calls.append(args[1:])
+        return original(*args)
+
+    monkeypatch.setattr(owner, name, staticmethod(counted))
+    return calls
+
+
+def test_dashboard_engines_share_one_computation_per_indicator(monkeypatch):
+    atr_calls = _count_calls(monkeypatch, ZoneEngine, "_atr")
+    adx_calls = _count_calls(monkeypatch, InsightEngine, "_adx")
+    df = _frame()
+
+    supports, resistances = SREngine.calculate_sr_levels(df)
+    SREngine.runSRStrategy(df, "NEUTRAL", supports, resistances)
+    summary = InsightEngine.get_technical_summary(df)
+    FeatureEngineer.calculate_features(df)
+    context = TradeDecisionService.build_context("TEST", df, [s['price'] for s in supports], [r['price'] for r in resistances], "LONG")
+
+    assert atr_calls == [(14,)] and adx_calls == [(14,)]
+    assert context.adx == summary["adx"] and context.atr == float(ZoneEngine.calculate_atr(df).iloc[-1])
+    assert 'tr' not in df.columns
+
+
+def test_context_is_rebuilt_when_the_last_bar_changes():
+    df = _frame().copy()
+    before = InsightEngine.get_adx(df)
+    df.iloc[-1, df.columns.get_loc('high')] *= 1.05
+    assert InsightEngine.get_adx(df) == InsightEngine._adx(df, 14) != before
+
+
+def test_context_is_dropped_with_its_frame():
+    df = _frame()
+    key = id(df)
+    IndicatorContext.of(df).ema(20)
+    assert key in IndicatorContext._contexts
+    del df
+    gc.collect()
+    assert key not in IndicatorContext._contexts
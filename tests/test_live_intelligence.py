@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.live_bar_buffer import LiveBarBuffer
+from app.services.screener_service import ScreenerService
+
+REGIME = {"regime": "BULL MARKET"}
+FUNDA = {"roe": 22.0, "market_cap": "50000Cr"}
+
+
+def _frame(seed=5, n=100):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-01-01", periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.004, 0.015, n)))
+    return pd.DataFrame({
+        'open': close * 0.99, 'high': close * 1.01, 'low': close * 0.98, 'close': close,
+        'volume': rng.integers(10_000, 500_000, n).astype(float),
+    }, index=dates)
+
+
+def _assert_features_match(live, reference):
+    assert live.keys() == reference.keys()
+    for key, expected in reference.items():
+        got = live[key]
+        if isinstance(expected, float) and np.isnan(expected):
+            assert np.isnan(got), key
+        else:
+            assert got == pytest.approx(expected, rel=1e-12), key
+
+
+def test_same_session_ticks_match_batch_features():
+    df = _frame()
+    buffer = LiveBarBuffer(df)
+    day = np.datetime64(df.index[-1].date(), "D")
+    for price, volume in [(df.close.iloc[-1] * 1.02, 900_000), (df.close.iloc[-1] * 0.97, 950_000), (df.close.iloc[-1] * 1.05, 0)]:
+        buffer.apply_tick(price, volume, day)
+
+    expected = df.copy()
+    expected.iloc[-1, expected.columns.get_loc("close")] = df.close.iloc[-1] * 1.05
+    expected.iloc[-1, expected.columns.get_loc("high")] = max(df.high.iloc[-1], df.close.iloc[-1] * 1.05)
+    expected.iloc[-1, expected.columns.get_loc("low")] = min(df.low.iloc[-1], df.close.iloc[-1] * 0.97)
+    expected.iloc[-1, expected.columns.get_loc("volume")] = 950_000.0
+
+    _assert_features_match(buffer.features(), ScreenerService._symbol_features(expected))
+    pd.testing.assert_frame_equal(buffer.to_frame(), expected, check_freq=False, check_index_type=False)
+
+
+def test_next_session_tick_rolls_the_window():
+    df = _frame(n=80)
+    buffer = LiveBarBuffer(df)
+    next_day = np.datetime64((df.index[-1] + pd.offsets.BDay(1)).date(), "D")
+    buffer.apply_tick(123.0, 40_000, next_day)
+
+    rolled = buffer.to_frame()
+    assert len(rolled) == 80
+    assert rolled.index[-1] == pd.Timestamp(next_day)
+    _assert_features_match(buffer.features(), ScreenerService._symbol_features(rolled))
+
+
+@pytest.fixture
+def live_env(monkeypatch):
+    strong, weak = _frame(seed=1), _frame(seed=2)
+    monkeypatch.setattr(ScreenerService, "_realtime_buffers", {})
+    monkeypatch.setattr(ScreenerService, "_intelligence_dict", {})
+    monkeypatch.setattr(ScreenerService, "_intelligence_cache", {"data": [], "status": "ready"})
+    monkeypatch.setattr(ScreenerService, "_live_dirty", False)
+    monkeypatch.setattr(ScreenerService, "_live_copies", set())
+    tasks = [("AAA.NS", strong, FUNDA, "NIFTY_IT"), ("BBB.NS", weak, FUNDA, "NIFTY_IT")]
+    hits = []
+    for task in tasks:
+        kind, hit = ScreenerService._score_symbol(*task, REGIME, ["IT"])
+        hits.append(hit)
+        ScreenerService._intelligence_dict[hit["symbol"]] = hit
+    ScreenerService._intelligence_cache["data"] = hits
+    ScreenerService._seed_live_buffers(tasks, [("fp", i) for i in range(2)], REGIME, ["IT"])
+    return hits
+
+
+def test_tick_patches_only_that_symbols_entry(live_env):
+    aaa, bbb = live_env
+    aaa_before, bbb_before = dict(aaa), dict(bbb)
+    day_price = aaa["price"] * 1.03
+
+    result = ScreenerService.apply_live_tick("NSE:AAA-EQ", day_price, 2_000_000)
+    ScreenerService.apply_live_tick("NSE:AAA-EQ", day_price, 2_100_000)
+    ScreenerService.commit_live_batch()
+
+    assert result["status"] == "updated"
+    patched = ScreenerService._intelligence_dict["AAA"]
+    assert patched["price"] == round(day_price, 2)
+    assert patched["volRatio"] > 1.0
+    assert any(h is patched for h in ScreenerService._intelligence_cache["data"])
+    # The scored payload (shared with the scoring memo) is left untouched
+    assert patched is not aaa and aaa == aaa_before
+    assert bbb == bbb_before
+    assert "live_updated" in ScreenerService._intelligence_cache
+    scores = [h["score"] for h in ScreenerService._intelligence_cache["data"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_untracked_and_failing_ticks_are_reported(live_env, monkeypatch):
+    untracked = ScreenerService.apply_live_tick("NSE:ZZZ-EQ", 10.0, 1)
+    assert untracked["status"] == "untracked"
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("bad tick")
+
+    monkeypatch.setattr(LiveBarBuffer, "apply_tick", boom)
+    failed = ScreenerService.apply_live_tick("NSE:AAA-EQ", 10.0, 1)
+    assert failed["status"] == "error"
+    assert "bad tick" in failed["error"]
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from app.services.market_context_service import MarketContextService
+from app.services.screener_service import ScreenerService
+
+
+@pytest.fixture
+def context_env(monkeypatch):
+    monkeypatch.setattr(MarketContextService, "_snapshot", None)
+    monkeypatch.setattr(MarketContextService, "_refreshing", False)
+    calls = []
+
+    def regime(timeframe):
+        calls.append(timeframe)
+        return {"regime": "NEUTRAL MARKET", "score": 60}
+
+    monkeypatch.setattr(ScreenerService, "_calculate_market_regime", staticmethod(regime))
+    monkeypatch.setattr(ScreenerService, "_calculate_sector_rotation",
+                        staticmethod(lambda tf: {"PHARMA_HEALTHCARE": 90.0, "AI_AUTOMATION": 80.0, "CYBERSECURITY": 40.0}))
+    return calls
+
+
+def test_snapshot_is_built_once_and_answers_sector_gates(context_env):
+    snapshot = MarketContextService.get_snapshot()
+    assert MarketContextService.get_snapshot() is snapshot and context_env == ["1D"]
+
+    assert snapshot.regime_state == "NEUTRAL MARKET"
+    assert snapshot.active_sectors == ("PHARMA", "AI")
+    assert snapshot.sector_of("DIVISLAB.NS") == "PHARMA" and snapshot.sector_of("SBIN") == "BANK"
+    assert snapshot.sector_of("NOSUCH") == "UNKNOWN"
+    assert snapshot.is_active_sector("PHARMA") and not snapshot.is_active_sector("FMCG")
+    with pytest.raises(TypeError):
+        snapshot.regime["regime"] = "BULL MARKET"
+
+
+def test_stale_snapshot_is_served_while_one_background_refresh_runs(context_env, monkeypatch):
+    stale = MarketContextService.refresh()
+    object.__setattr__(stale, "computed_at", time.time() - MarketContextService.REFRESH_INTERVAL - 1)
+    started = []
+    monkeypatch.setattr(threading.Thread, "start", lambda self: started.append(self.name))
+
+    assert MarketContextService.get_snapshot() is stale
+    assert MarketContextService.get_snapshot() is stale
+    assert started == ["market-context-refresh"]
+
+
+def test_sector_failure_disables_the_sector_gate(context_env, monkeypatch):
+    def broken(tf):
+        raise RuntimeError("no index data")
+
+    monkeypatch.setattr(ScreenerService, "_calculate_sector_rotation", staticmethod(broken))
+    snapshot = MarketContextService.refresh()
+    assert snapshot.sector_of("TCS") == "EQUITIES" and snapshot.is_active_sector("EQUITIES")
@@ -0,0 +1,59 @@
+import pandas as pd
+
+import app.services.market_data as market_data_module
+from app.services.fyers_service import FyersService
+from app.services.market_data import MarketDataService
+from app.services.ohlcv_cache import OHLCVCache
+from app.services.ohlcv_store import OHLCVStore
+
+
+def _yahoo_frame(periods, base):
+    idx = pd.date_range('2025-01-01', periods=periods, freq='D', tz='Asia/Kolkata')
+    return pd.DataFrame(
+        {
+            'Open': [base] * periods,
+            'High': [base + 1] * periods,
+            'Low': [base - 1] * periods,
+            'Close': [base] * periods,
+            'Volume': [1000] * periods,
+        },
+        index=idx,
+    )
+
+
+def test_batch_uses_grouped_download_and_bo_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+    monkeypatch.setattr(MarketDataService, '_ohlcv_cache', OHLCVCache(ttl=600))
+    monkeypatch.setattr(FyersService, 'is_active', classmethod(lambda cls: False))
+
+    available = {
+        'AAA.NS': _yahoo_frame(80, 100.0),
+        'BBB.NS': _yahoo_frame(5, 200.0),  # too short on NSE
+        'BBB.BO': _yahoo_frame(80, 201.0),
+    }
+    download_calls = []
+
+    def fake_download(tickers, **kwargs):
+        download_calls.append(list(tickers))
+        assert kwargs['group_by'] == 'ticker'
+        return pd.concat({t: available[t] for t in tickers if t in available}, axis=1)
+
+    per_symbol = []
+    monkeypatch.setattr(market_data_module.yf, 'download', fake_download)
+    monkeypatch.setattr(MarketDataService, 'get_ohlcv',
+                        staticmethod(lambda sym, tf, count: per_symbol.append(sym) or (None, 'INR', 'unavailable', 'error')))
+
+    results = MarketDataService.get_ohlcv_batch(['AAA.NS', 'BBB.NS', 'CCC.NS'], '1D', count=60)
+
+    assert download_calls == [['AAA.NS', 'BBB.NS', 'CCC.NS'], ['BBB.BO', 'CCC.BO']]
+    aaa, _, err, source = results['AAA.NS']
+    assert err is None and source == 'yahoo'
+    assert list(aaa.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert len(aaa) == 60
+    assert aaa.index.tz is None
+    assert (aaa.index == aaa.index.normalize()).all()
+    assert results['BBB.NS'][0]['close'].iloc[-1] == 201.0
+    # Only the symbol that failed both grouped requests goes per-symbol
+    assert per_symbol == ['CCC.NS']
+    assert results['CCC.NS'][3] == 'error'
@@ -0,0 +1,145 @@
+import time
+
+import pandas as pd
+
+import app.services.market_data as market_data_module
+from app.services.fyers_service import FyersService
+from app.services.market_data import MarketDataService
+from app.services.ohlcv_cache import OHLCVCache
+from app.services.ohlcv_store import OHLCVStore
+
+
+def _daily(start, periods, base=100.0):
+    idx = pd.date_range(start, periods=periods, freq='D')
+    return pd.DataFrame(
+        {
+            'open': [base + i for i in range(periods)],
+            'high': [base + i + 1 for i in range(periods)],
+            'low': [base + i - 1 for i in range(periods)],
+            'close': [base + i for i in range(periods)],
+            'volume': [1000] * periods,
+        },
+        index=idx,
+    )
+
+
+def test_expired_entry_is_refreshed_with_delta_fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+    monkeypatch.setattr(MarketDataService, '_ohlcv_cache', OHLCVCache(ttl=600))
+    monkeypatch.setattr(FyersService, 'is_active', classmethod(lambda cls: False))
+
+    today = pd.Timestamp.now().normalize()
+    cached = _daily(today - pd.Timedelta(days=99), 100)
+    MarketDataService._ohlcv_cache.set('ABC.NS_1D_100_False', {
+        'df': cached, 'currency': 'INR', 'source': 'yahoo', 'timestamp': time.time() - 3600,
+    })
+
+    calls = []
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, **kwargs):
+            calls.append(kwargs)
+            # Yahoo returns the (now final) last cached bar plus nothing newer
+            bar = _daily(today, 1, base=999.0)
+            bar.columns = [c.capitalize() for c in bar.columns]
+            return bar
+
+    monkeypatch.setattr(market_data_module.yf, 'Ticker', FakeTicker)
+
+    df, currency, err, source = MarketDataService.get_ohlcv('ABC.NS', '1D', count=100, use_fast_info=False)
+
+    assert err is None and source == 'yahoo' and currency == 'INR'
+    assert len(calls) == 1
+    assert calls[0]['start'] == today.strftime('%Y-%m-%d')
+    assert 'period' not in calls[0]
+    assert len(df) == 100
+    assert df['close'].iloc[-1] == 999.0
+    assert df['close'].iloc[-2] == cached['close'].iloc[-2]
+    assert MarketDataService._ohlcv_cache.get('ABC.NS_1D_100_False') is not None
+
+
+def test_delta_refresh_applies_live_cmp_on_the_resolved_listing(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+    monkeypatch.setattr(MarketDataService, '_ohlcv_cache', OHLCVCache(ttl=600))
+    monkeypatch.setattr(MarketDataService, '_bse_fallback_symbols', {'ABC.NS'})
+    monkeypatch.setattr(FyersService, 'is_active', classmethod(lambda cls: False))
+
+    today = pd.Timestamp.now().normalize()
+    cached = _daily(today - pd.Timedelta(days=99), 100)
+    MarketDataService._ohlcv_cache.set('ABC.NS_1D_100_True', {
+        'df': cached, 'currency': 'INR', 'source': 'yahoo', 'timestamp': time.time() - 3600,
+    })
+
+    tickers = []
+
+    class FakeTicker:
+        fast_info = {'lastPrice': 1234.0}
+
+        def __init__(self, symbol):
+            tickers.append(symbol)
+
+        def history(self, **kwargs):
+            bar = _daily(today, 1, base=999.0)
+            bar.columns = [c.capitalize() for c in bar.columns]
+            return bar
+
+    monkeypatch.setattr(market_data_module.yf, 'Ticker', FakeTicker)
+
+    df, _, err, source = MarketDataService.get_ohlcv('ABC.NS', '1D', count=100, use_fast_info=True)
+
+    assert err is None and source == 'yahoo'
+    assert set(tickers) == {'ABC.BO'}
+    assert len(df) == 100
+    assert df['close'].iloc[-1] == 1234.0
+    assert df['high'].iloc[-1] == 1234.0
+
+
+def test_delta_refresh_without_a_stored_file_persists_the_merged_frame(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+    monkeypatch.setattr(MarketDataService, '_ohlcv_cache', OHLCVCache(ttl=600))
+    monkeypatch.setattr(FyersService, 'is_active', classmethod(lambda cls: False))
+
+    # Under 50 rows, so the original fetch was never written to disk
+    today = pd.Timestamp.now().normalize()
+    cached = _daily(today - pd.Timedelta(days=29), 30)
+    MarketDataService._ohlcv_cache.set('ABC.NS_1D_100_False', {
+        'df': cached, 'currency': 'INR', 'source': 'yahoo', 'timestamp': time.time() - 3600,
+    })
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, **kwargs):
+            bar = _daily(today, 1, base=999.0)
+            bar.columns = [c.capitalize() for c in bar.columns]
+            return bar
+
+    monkeypatch.setattr(market_data_module.yf, 'Ticker', FakeTicker)
+    MarketDataService.get_ohlcv('ABC.NS', '1D', count=100, use_fast_info=False)
+
+    stored = OHLCVStore.read('ABC.NS', '1D')
+    assert len(stored) == 30
+    assert stored['close'].iloc[-1] == 999.0
+
+    # The short file is not served as a batch cache hit; the symbol is fetched instead
+    downloaded = _daily(today - pd.Timedelta(days=99), 100)
+    monkeypatch.setattr(MarketDataService, '_ohlcv_cache', OHLCVCache(ttl=600))
+    monkeypatch.setattr(MarketDataService, '_download_yahoo_batch', staticmethod(lambda syms, tf, count: {s: downloaded for s in syms}))
+    df, _, _, source = MarketDataService.get_ohlcv_batch(['ABC.NS'], '1D', count=100)['ABC.NS']
+    assert source == 'yahoo' and len(df) == 100
+
+
+def test_long_history_requests_widen_the_yahoo_period():
+    assert MarketDataService._yahoo_interval_period('15m') == ('15m', '30d')
+    assert MarketDataService._yahoo_interval_period('1W') == ('1wk', '2y')
+    # Capped at Yahoo's intraday limit
+    assert MarketDataService._yahoo_interval_period('15m', 1000) == ('15m', '60d')
+    assert MarketDataService._yahoo_interval_period('1H', 1000) == ('60m', '215d')
+    assert MarketDataService._yahoo_interval_period('1D', 1300) == ('1d', '10y')
@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.ohlcv_cache import OHLCVCache
+
+
+def _entry(rows=10, ts=None):
+    df = pd.DataFrame({'close': [float(i) for i in range(rows)]})
+    return {'df': df, 'currency': 'INR', 'source': 'yahoo', 'timestamp': ts or time.time()}
+
+
+def test_lru_eviction_keeps_recently_used_keys():
+    cache = OHLCVCache(max_items=2, max_bytes=10**9, ttl=600)
+    cache.set('a', _entry())
+    cache.set('b', _entry())
+    assert cache.get('a') is not None  # 'a' becomes most recently used
+    cache.set('c', _entry())
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_cap_evicts_oldest_entries():
+    one = _entry(rows=1000)
+    size = int(one['df'].memory_usage(index=True).sum())
+    cache = OHLCVCache(max_items=100, max_bytes=int(size * 2.5), ttl=600)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, _entry(rows=1000))
+
+    assert len(cache) == 2
+    assert 'a' not in cache
+    assert cache.stats()['bytes'] <= size * 2.5
+
+
+def test_ttl_expiry_counts_as_miss_but_allows_stale_reads():
+    cache = OHLCVCache(max_items=10, max_bytes=10**9, ttl=60)
+    cache.set('old', _entry(ts=time.time() - 120))
+
+    assert cache.get('old') is None
+    assert cache.get('old', allow_stale=True) is not None
+    stats = cache.stats()
+    assert stats['expired'] == 1
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_find_latest_matches_any_variant_of_symbol_timeframe():
+    cache = OHLCVCache(max_items=10, max_bytes=10**9, ttl=600)
+    cache.set('ABC.NS_1D_100_True', _entry(ts=time.time() - 10))
+    cache.set('ABC.NS_1D_200_False', _entry(rows=3))
+
+    assert len(cache.find_latest('ABC.NS_1D_')['df']) == 3
+    assert cache.find_latest('XYZ.NS_1D_') is None
+
+
+def test_cached_frames_are_read_only_and_views_take_scratch_columns():
+    cache = OHLCVCache(max_items=10, max_bytes=10**9, ttl=600)
+    source = _entry(rows=5)
+    cache.set('a', source)
+    frozen = cache.get('a')['df']
+
+    assert frozen is not source['df']
+    with pytest.raises(ValueError):
+        frozen.iloc[0, 0] = 42.0
+
+    view = OHLCVCache.view(frozen)
+    view['scratch'] = view['close'] * 2
+    view.columns = [c.upper() for c in view.columns]
+
+    assert list(frozen.columns) == ['close']
+    assert np.shares_memory(view['CLOSE'].to_numpy(), frozen['close'].to_numpy())
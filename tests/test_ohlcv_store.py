@@ -0,0 +1,84 @@
+import pandas as pd
+
+from app.services.ohlcv_store import OHLCVStore
+
+
+def _frame(start, periods):
+    idx = pd.date_range(start, periods=periods, freq='D')
+    return pd.DataFrame(
+        {
+            'Open': [100.0 + i for i in range(periods)],
+            'High': [101.0 + i for i in range(periods)],
+            'Low': [99.0 + i for i in range(periods)],
+            'Close': [100.5 + i for i in range(periods)],
+            'Volume': [1000 + i for i in range(periods)],
+        },
+        index=idx,
+    )
+
+
+def test_write_and_read_round_trip_is_typed(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+
+    OHLCVStore.write('ABC.NS', '1D', _frame('2025-01-01', 60))
+    df = OHLCVStore.read('ABC.NS', '1D')
+
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert str(df['close'].dtype) == 'float64'
+    assert str(df['volume'].dtype) == 'int64'
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.index.name == 'timestamp'
+    assert len(df) == 60
+
+
+def test_append_replaces_partial_tail_and_counts_new_bars(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+
+    OHLCVStore.write('ABC.NS', '1D', _frame('2025-01-01', 60))
+    # Overlaps the last stored bar (partial) and adds two new ones
+    delta = _frame('2025-03-01', 3)
+    delta['Close'] = [500.0, 501.0, 502.0]
+
+    added = OHLCVStore.append('ABC.NS', '1D', delta)
+    df = OHLCVStore.read('ABC.NS', '1D')
+
+    assert added == 2
+    assert len(df) == 62
+    assert df.loc['2025-03-01', 'close'] == 500.0
+    assert df.index.is_monotonic_increasing
+
+
+def test_short_write_keeps_the_longer_stored_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+
+    OHLCVStore.write('ABC.NS', '1D', _frame('2024-01-01', 400))
+    # A 100-bar batch fetch overlapping the stored tail and adding one new bar
+    short = _frame('2024-01-01', 401)[-100:]
+    short['Close'] = 900.0
+    OHLCVStore.write('ABC.NS', '1D', short)
+    df = OHLCVStore.read('ABC.NS', '1D')
+
+    assert len(df) == 401
+    assert df.index[0] == pd.Timestamp('2024-01-01')
+    assert (df['close'].iloc[-100:] == 900.0).all()
+    assert df['close'].iloc[-101] == 100.5 + 300
+    assert df.index.is_monotonic_increasing
+
+
+def test_read_many_migrates_legacy_csv_and_respects_max_age(tmp_path, monkeypatch):
+    monkeypatch.setattr(OHLCVStore, 'ROOT', tmp_path / 'store')
+    monkeypatch.setattr(OHLCVStore, 'LEGACY_ROOT', tmp_path / 'legacy')
+
+    legacy = tmp_path / 'legacy' / 'OLD.NS_1D.csv'
+    legacy.parent.mkdir(parents=True)
+    _frame('2025-01-01', 55).rename_axis('Date').to_csv(legacy)
+    OHLCVStore.write('NEW.NS', '1D', _frame('2025-01-01', 55))
+
+    loaded = OHLCVStore.read_many(['OLD.NS', 'NEW.NS', 'MISSING.NS'], '1D', max_age=3600)
+
+    assert set(loaded) == {'OLD.NS', 'NEW.NS'}
+    assert OHLCVStore.path('OLD.NS', '1D').exists()
+    assert OHLCVStore.read_many(['NEW.NS'], '1D', max_age=0) == {}
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.engine.pivots import consolidate_levels, pivot_mask
+from app.engine.sr import SREngine
+from app.engine.swing import SwingEngine
+
+
+def _reference_pivots(values, window, high, skip_nan):
+    """The per-bar loops SREngine (all strict comparisons) and SwingEngine (early-exit) used."""
+    found = []
+    for i in range(window, len(values) - window):
+        neighbours = [values[i - j] for j in range(1, window + 1)] + [values[i + j] for j in range(1, window + 1)]
+        if skip_nan:
+            beaten = any(values[i] <= v for v in neighbours) if high else any(values[i] >= v for v in neighbours)
+            ok = not beaten
+        else:
+            ok = all(values[i] > v for v in neighbours) if high else all(values[i] < v for v in neighbours)
+        if ok:
+            found.append(i)
+    return found
+
+
+def _reference_groups(prices, pct):
+    prices = sorted(prices)
+    groups, current = [], [prices[0]]
+    for price in prices[1:]:
+        if (price - current[-1]) / current[-1] < pct:
+            current.append(price)
+        else:
+            groups.append((sum(current) / len(current), len(current)))
+            current = [price]
+    groups.append((sum(current) / len(current), len(current)))
+    return groups
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pivot_mask_matches_reference_loops(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(3, 200))
+    values = np.round(100 + np.cumsum(rng.normal(0, 1, n)), 0 if seed % 2 else 2)  # rounding forces ties
+    if seed % 4 == 0:
+        values[rng.integers(0, n, 3)] = np.nan
+
+    for window in (1, 2, 5, 10):
+        for high in (True, False):
+            for skip_nan in (False, True):
+                expected = _reference_pivots(values, window, high, skip_nan)
+                assert np.flatnonzero(pivot_mask(values, window, high, skip_nan)).tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_consolidate_levels_matches_chained_grouping(seed):
+    rng = np.random.default_rng(seed)
+    prices = (100 + rng.normal(0, 5, int(rng.integers(1, 40)))).tolist()
+    for pct in (0.005, 0.015, 0.02):
+        assert consolidate_levels(prices, pct) == _reference_groups(prices, pct)
+
+
+def test_engines_return_levels_from_pivots():
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 150)))
+    df = pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                       'volume': rng.integers(1, 10**6, 150).astype(float)},
+                      index=pd.date_range('2025-01-01', periods=150, freq='D'))
+
+    swing_highs, swing_lows = SwingEngine.get_swings(df, window=3)
+    expected_highs = _reference_pivots(df['high'].values, 3, True, True)
+    assert [s['index'] for s in swing_highs] == expected_highs
+    assert swing_highs[0] == {'index': expected_highs[0], 'price': float(df['high'].iloc[expected_highs[0]]),
+                              'time': str(df.index[expected_highs[0]]), 'volume': int(df['volume'].iloc[expected_highs[0]])}
+    assert len(swing_lows) == len(_reference_pivots(df['low'].values, 3, False, True))
+
+    supports, resistances = SREngine.calculate_sr_levels(df)
+    tail = df.tail(120)
+    pivots = [tail['high'].values[i] for i in _reference_pivots(tail['high'].values, 5, True, False)]
+    pivots += [tail['low'].values[i] for i in _reference_pivots(tail['low'].values, 5, False, False)]
+    cmp = df['close'].iloc[-1]
+    groups = _reference_groups([float(p) for p in pivots], 0.005)
+    assert [s['price'] for s in supports] == sorted([p for p, _ in groups if p < cmp], reverse=True)[:5]
+    assert [r['price'] for r in resistances] == sorted([p for p, _ in groups if p > cmp])[:5]
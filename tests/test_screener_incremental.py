@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import market_data as market_data_module
+from app.services.fundamentals import FundamentalService
+from app.services.screener_service import ScreenerService
+
+REGIME = {"regime": "BULL MARKET"}
+
+
+def _frame(seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-01-01", periods=80)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.002, 0.02, len(dates))))
+    return pd.DataFrame({
+        'open': close * 0.99, 'high': close * 1.02, 'low': close * 0.98, 'close': close,
+        'volume': rng.integers(10_000, 500_000, len(dates)).astype(float),
+    }, index=dates)
+
+
+@pytest.fixture
+def incremental_env(monkeypatch):
+    batch = {f"SYM{i}.NS": (_frame(i), "INR", None, "test") for i in range(6)}
+    monkeypatch.setattr(market_data_module.MarketDataService, "get_ohlcv_batch", classmethod(lambda cls, *a, **k: dict(batch)))
+    monkeypatch.setattr(FundamentalService, "get_fundamentals", classmethod(lambda cls, s: {"roe": 22.0, "market_cap": "50000Cr"}))
+    monkeypatch.setattr(ScreenerService, "SCORING_WORKERS", 1)
+    monkeypatch.setattr(ScreenerService, "_avoid_registry", {})
+    monkeypatch.setattr(ScreenerService, "_avoid_reasons", {})
+    monkeypatch.setattr(ScreenerService, "_score_memo", {})
+    monkeypatch.setattr(ScreenerService, "_intelligence_dict", {})
+    monkeypatch.setattr(ScreenerService, "_intelligence_cache", {"data": [], "status": "warming"})
+    monkeypatch.setattr(ScreenerService, "_sector_counts", {})
+    monkeypatch.setattr(ScreenerService, "_realtime_buffers", {})
+    monkeypatch.setattr(ScreenerService, "_live_copies", set())
+
+    scored = []
+    original = ScreenerService._score_symbol
+
+    def counting(symbol, *args):
+        scored.append(symbol)
+        return original(symbol, *args)
+
+    monkeypatch.setattr(ScreenerService, "_score_symbol", staticmethod(counting))
+    return batch, scored
+
+
+def _cycle(active=("IT",)):
+    hits = ScreenerService._process_universe([], "IN", "1D", REGIME, list(active))
+    return hits, ScreenerService._merge_intelligence(hits)
+
+
+def test_only_symbols_with_new_bars_are_rescored(incremental_env):
+    batch, scored = incremental_env
+    first_hits, _ = _cycle()
+    assert len(scored) == 6
+    intel_dict = ScreenerService._intelligence_dict
+    unchanged = intel_dict["SYM0"]
+
+    scored.clear()
+    df = batch["SYM3.NS"][0].copy()
+    df.iloc[-1, df.columns.get_loc("close")] *= 1.01
+    batch["SYM3.NS"] = (df, "INR", None, "test")
+    second_hits, _ = _cycle()
+
+    assert scored == ["SYM3.NS"]
+    assert ScreenerService._intelligence_dict is intel_dict
+    assert intel_dict["SYM0"] is unchanged
+    assert {h["symbol"] for h in second_hits} == {h["symbol"] for h in first_hits}
+
+
+def test_active_sector_change_rescores_only_affected_symbols(incremental_env, monkeypatch):
+    _, scored = incremental_env
+    monkeypatch.setattr("app.services.constituent_service.ConstituentService.get_sector_for_ticker",
+                        classmethod(lambda cls, t: "NIFTY_IT" if t in ("SYM1.NS", "SYM2.NS") else "NIFTY_BANK"))
+    _cycle(active=())
+    scored.clear()
+
+    _cycle(active=("IT",))
+
+    assert sorted(scored) == ["SYM1.NS", "SYM2.NS"]
+
+
+def test_incremental_sector_concentration_matches_full_recount(incremental_env):
+    batch, _ = incremental_env
+    _cycle()
+    del batch["SYM4.NS"]
+    hits, concentration = _cycle()
+
+    assert concentration == ScreenerService._calculate_sector_concentration(hits)
+    assert "SYM4" not in ScreenerService._intelligence_dict
+    assert ScreenerService._intelligence_cache["data"] is hits
+
+
+def test_live_patch_does_not_leak_into_memoized_hits(incremental_env):
+    _, scored = incremental_env
+    first_hits, _ = _cycle()
+    hit = first_hits[0]
+    scored_price = hit["price"]
+
+    result = ScreenerService.apply_live_tick(f"NSE:{hit['symbol']}-EQ", scored_price * 1.03, 3_000_000)
+    assert result["status"] == "updated"
+    assert ScreenerService._intelligence_dict[hit["symbol"]]["price"] != scored_price
+
+    scored.clear()
+    second_hits, _ = _cycle()
+    # Unchanged inputs: the memo serves the scored payload, and the cycle puts it back in place
+    assert scored == []
+    assert hit["price"] == scored_price
+    assert ScreenerService._intelligence_dict[hit["symbol"]] is hit
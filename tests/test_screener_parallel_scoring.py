@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import market_data as market_data_module
+from app.services.fundamentals import FundamentalService
+from app.services.screener_service import ScreenerService
+
+REGIME = {"regime": "BULL MARKET"}
+
+
+def _universe(count=40, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-01-01", periods=80)
+    batch = {}
+    for i in range(count):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.002, 0.02, len(dates))))
+        df = pd.DataFrame({
+            'open': close * 0.99, 'high': close * 1.02, 'low': close * 0.98, 'close': close,
+            'volume': rng.integers(10_000, 500_000, len(dates)).astype(float),
+        }, index=dates)
+        batch[f"SYM{i:03d}.NS"] = (df, "INR", None, "test")
+    batch["SHORT.NS"] = (batch["SYM000.NS"][0].tail(20), "INR", None, "test")
+    return batch
+
+
+@pytest.fixture
+def screener_env(monkeypatch):
+    batch = _universe()
+    monkeypatch.setattr(market_data_module.MarketDataService, "get_ohlcv_batch", classmethod(lambda cls, *a, **k: batch))
+    monkeypatch.setattr(FundamentalService, "get_fundamentals",
+                        classmethod(lambda cls, s: {"roe": 22.0, "market_cap": "50000Cr"} if s != "SYM001.NS" else {"roe": 5.0, "market_cap": "50000Cr"}))
+    monkeypatch.setattr(ScreenerService, "_avoid_registry", {})
+    monkeypatch.setattr(ScreenerService, "_avoid_reasons", {})
+    monkeypatch.setattr(ScreenerService, "_score_memo", {})
+    return batch
+
+
+def _run():
+    return ScreenerService._process_universe(list(_universe()), "IN", "1D", REGIME, ["IT"])
+
+
+def test_parallel_scoring_matches_inline_scoring(screener_env, monkeypatch):
+    monkeypatch.setattr(ScreenerService, "SCORING_WORKERS", 1)
+    inline_hits = _run()
+    inline_avoid = dict(ScreenerService._avoid_reasons)
+
+    ScreenerService._avoid_registry.clear()
+    ScreenerService._avoid_reasons.clear()
+    ScreenerService._score_memo.clear()
+    monkeypatch.setattr(ScreenerService, "SCORING_WORKERS", 2)
+    monkeypatch.setattr(ScreenerService, "PARALLEL_MIN_SYMBOLS", 1)
+    try:
+        parallel_hits = _run()
+    finally:
+        ScreenerService._reset_scoring_pool()
+
+    assert parallel_hits == inline_hits
+    assert ScreenerService._avoid_reasons == inline_avoid
+    symbols = {h["symbol"] for h in inline_hits}
+    assert "SYM001" not in symbols  # failed the ROE gate
+    assert "SHORT" not in symbols  # fewer than 50 bars
+
+
+def test_scoring_errors_are_isolated_per_symbol(screener_env, monkeypatch):
+    monkeypatch.setattr(ScreenerService, "SCORING_WORKERS", 1)
+    original = ScreenerService._score_symbol
+
+    def flaky(symbol, *args):
+        if symbol == "SYM002.NS":
+            raise RuntimeError("boom")
+        return original(symbol, *args)
+
+    monkeypatch.setattr(ScreenerService, "_score_symbol", staticmethod(flaky))
+    hits = _run()
+
+    assert hits
+    assert "SYM002" not in {h["symbol"] for h in hits}
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from app.services.sector_service import SectorService
+
+
+def _frame(rng, dates):
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.005, len(dates))),
+        'close': close,
+        'volume': rng.integers(1_000, 100_000, len(dates)),
+    }, index=dates)
+
+
+def test_constituent_breadth_matches_per_symbol_rolling_windows():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2025-01-01", periods=60)
+    batch = {
+        'FULL.NS': _frame(rng, dates),
+        'SHORT.NS': _frame(rng, dates[-15:]),
+        'GAPPY.NS': _frame(rng, dates.delete([10, 30, 45])),
+    }
+    breadth = SectorService._constituent_breadth(SectorService._align_panel(batch))
+
+    for sym, df in batch.items():
+        i = breadth['position'][sym]
+        close = df['close']
+        last = close.iloc[-1]
+        assert breadth['advance'][i] == (last > df['open'].iloc[-1])
+        assert breadth['above20'][i] == (len(df) >= 20 and last > close.rolling(20).mean().iloc[-1])
+        assert breadth['above50'][i] == (len(df) >= 50 and last > close.rolling(50).mean().iloc[-1])
+        assert breadth['hi10'][i] == (len(df) >= 10 and last >= close.rolling(10).max().iloc[-1])
+        assert breadth['last_volume'][i] == df['volume'].iloc[-1]
+        assert np.isclose(breadth['avg_volume'][i], df['volume'].mean())
+
+
+def test_rotation_matrix_matches_pairwise_sector_benchmark_frames():
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2025-01-01", periods=40)
+    bank, it = SectorService.SECTORS['NIFTY_BANK'], SectorService.SECTORS['NIFTY_IT']
+    batch = {
+        SectorService.BENCHMARK: _frame(rng, dates),
+        bank: _frame(rng, dates),
+        it: _frame(rng, dates[5:]),
+    }
+    rotation = SectorService._rotation_matrix(SectorService._align_panel(batch)['close'], 1)
+
+    for sym in (bank, it):
+        combined = pd.DataFrame({'sector': batch[sym]['close'], 'benchmark': batch[SectorService.BENCHMARK]['close']})
+        combined = combined.interpolate(method='linear').dropna()
+        rs = combined['sector'].pct_change() - combined['benchmark'].pct_change()
+        expected_acc = rs.rolling(5, min_periods=1).sum().diff().fillna(0)
+
+        got_rs = rotation['rs'][sym].dropna()
+        pd.testing.assert_series_equal(got_rs, rs.dropna(), check_names=False, check_freq=False, check_index_type=False)
+        assert np.allclose(rotation['rm'][sym].loc[got_rs.index].iloc[1:], rs.diff().loc[got_rs.index].iloc[1:])
+        assert np.allclose(rotation['acc'][sym].loc[got_rs.index], expected_acc.loc[got_rs.index])
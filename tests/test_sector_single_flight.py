@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from app.services.market_status_service import MarketStatusService
+from app.services.sector_service import SectorService
+
+
+@pytest.fixture
+def sector_env(monkeypatch):
+    monkeypatch.setattr(SectorService, "_cache_by_tf", {})
+    monkeypatch.setattr(SectorService, "_inflight", {})
+    monkeypatch.setattr(MarketStatusService, "get_market_status", staticmethod(lambda: {"mode": "OPEN"}))
+
+    calls = []
+    release = threading.Event()
+
+    def fake_compute(cls, days=60, timeframe="1D", include_constituents=True):
+        calls.append((timeframe, include_constituents))
+        release.wait(5)
+        data = {"NIFTY_IT": {"rank": len(calls)}}
+        with cls._cache_lock:
+            cls._cache_by_tf[(timeframe, include_constituents)] = {"data": data, "alerts": [], "timestamp": time.time()}
+        return data, []
+
+    monkeypatch.setattr(SectorService, "_compute_rotation_data", classmethod(fake_compute))
+    return calls, release
+
+
+def test_concurrent_callers_share_one_computation(sector_env):
+    calls, release = sector_env
+    results = []
+
+    def worker():
+        results.append(SectorService.get_rotation_data(timeframe="1D", include_constituents=False))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == [("1D", False)]
+    assert len(results) == 8
+    assert all(data is results[0][0] for data, _ in results)
+
+
+def test_stale_result_is_served_while_refreshing_in_background(sector_env):
+    calls, release = sector_env
+    stale = {"NIFTY_IT": {"rank": 0}}
+    SectorService._cache_by_tf[("1D", True)] = {
+        "data": stale, "alerts": [], "timestamp": time.time() - SectorService.CACHE_TTL - 5
+    }
+
+    data, _ = SectorService.get_rotation_data(timeframe="1D", include_constituents=True)
+    again, _ = SectorService.get_rotation_data(timeframe="1D", include_constituents=True)
+
+    assert data is stale and again is stale
+    release.set()
+    for _ in range(50):
+        if not SectorService._inflight:
+            break
+        time.sleep(0.05)
+    assert calls == [("1D", True)]
+    assert SectorService.get_rotation_data(timeframe="1D")[0]["NIFTY_IT"]["rank"] == 1
+
+
+def test_lighter_request_reuses_fresh_constituent_result(sector_env):
+    calls, _ = sector_env
+    full = {"NIFTY_BANK": {"rank": 1}}
+    SectorService._cache_by_tf[("1D", True)] = {"data": full, "alerts": [], "timestamp": time.time()}
+
+    data, _ = SectorService.get_rotation_data(timeframe="1D", include_constituents=False)
+
+    assert data is full
+    assert calls == []
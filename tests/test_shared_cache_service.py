@@ -0,0 +1,110 @@
+import multiprocessing
+import time
+
+import pandas as pd
+
+from app.services.shared_cache_service import SharedCacheService
+
+
+def _use_tmp(tmp_path, monkeypatch):
+    monkeypatch.setenv('SHARED_CACHE', '1')
+    monkeypatch.setattr(SharedCacheService, 'DB_PATH', tmp_path / 'shared.db')
+    monkeypatch.setattr(SharedCacheService, 'LOCK_DIR', tmp_path / 'locks')
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv('SHARED_CACHE', raising=False)
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    assert SharedCacheService.is_enabled() is False
+    monkeypatch.setenv('WEB_CONCURRENCY', '4')
+    assert SharedCacheService.is_enabled() is True
+
+
+def test_round_trip_and_max_age(tmp_path, monkeypatch):
+    _use_tmp(tmp_path, monkeypatch)
+    df = pd.DataFrame({'close': [1.0, 2.0]}, index=pd.date_range('2025-01-01', periods=2))
+    SharedCacheService.set('ohlcv:ABC.NS_1D', {'df': df, 'currency': 'INR'})
+    SharedCacheService.set('ohlcv:OLD.NS_1D', {'df': df}, created=time.time() - 1000)
+
+    entry = SharedCacheService.get('ohlcv:ABC.NS_1D', max_age=60)
+    assert entry['currency'] == 'INR'
+    pd.testing.assert_frame_equal(entry['df'], df)
+    assert SharedCacheService.get('ohlcv:OLD.NS_1D', max_age=60) is None
+    assert set(SharedCacheService.get_many(['ohlcv:ABC.NS_1D', 'ohlcv:OLD.NS_1D'], max_age=60)) == {'ohlcv:ABC.NS_1D'}
+
+
+def _hold_lock(lock_dir, db_path, ready, release):
+    import os
+    os.environ['SHARED_CACHE'] = '1'
+    SharedCacheService.LOCK_DIR = lock_dir
+    SharedCacheService.DB_PATH = db_path
+    handle = SharedCacheService.try_lock('ohlcv:ABC.NS_1D')
+    ready.set()
+    release.wait(5)
+    SharedCacheService.unlock(handle)
+
+
+def test_try_lock_is_exclusive_across_processes(tmp_path, monkeypatch):
+    _use_tmp(tmp_path, monkeypatch)
+    ctx = multiprocessing.get_context('fork')
+    ready, release = ctx.Event(), ctx.Event()
+    holder = ctx.Process(target=_hold_lock, args=(tmp_path / 'locks', tmp_path / 'shared.db', ready, release))
+    holder.start()
+    try:
+        assert ready.wait(5)
+        assert SharedCacheService.try_lock('ohlcv:ABC.NS_1D') is None
+        with SharedCacheService.single_flight('ohlcv:ABC.NS_1D', timeout=0.1) as acquired:
+            assert acquired is False
+    finally:
+        release.set()
+        holder.join(5)
+
+    with SharedCacheService.single_flight('ohlcv:ABC.NS_1D', timeout=1) as acquired:
+        assert acquired is True
+
+
+def test_expired_entries_are_purged_from_the_write_path(tmp_path, monkeypatch):
+    _use_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(SharedCacheService, '_last_purge', 0.0)
+    SharedCacheService.set('ohlcv:OLD.NS_1D', {'x': 1}, created=time.time() - 2 * SharedCacheService.PURGE_AGE)
+    SharedCacheService.set('ohlcv:NEW.NS_1D', {'x': 2})
+    # Throttled: the first write purged before the old row existed
+    assert SharedCacheService.get('ohlcv:OLD.NS_1D', max_age=10 * SharedCacheService.PURGE_AGE) is not None
+
+    monkeypatch.setattr(SharedCacheService, '_last_purge', 0.0)
+    SharedCacheService.set('ohlcv:NEW.NS_1D', {'x': 3})
+    assert SharedCacheService.get('ohlcv:OLD.NS_1D', max_age=10 * SharedCacheService.PURGE_AGE) is None
+    assert SharedCacheService.get('ohlcv:NEW.NS_1D', max_age=60) == {'x': 3}
+
+
+def test_sector_rotation_adopts_another_workers_result(tmp_path, monkeypatch):
+    from app.services.sector_service import SectorService
+
+    _use_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(SectorService, '_cache_by_tf', {})
+    entry = {'data': {'NIFTY_IT': {'metrics': {'state': 'LEADING'}}}, 'alerts': [], 'timestamp': time.time()}
+    SharedCacheService.set('sector:1D:0', entry)
+
+    def not_called(**kwargs):
+        raise AssertionError('rotation recomputed despite a fresh shared result')
+
+    monkeypatch.setattr(SectorService, '_compute_rotation_data', staticmethod(not_called))
+    data, alerts = SectorService._compute_shared(('1D', False), days=60)
+    assert data == entry['data'] and alerts == []
+    assert SectorService._cache_by_tf[('1D', False)]['data'] == entry['data']
+
+
+def test_screener_adopts_another_workers_screen(tmp_path, monkeypatch):
+    from app.services.screener_service import ScreenerService
+
+    _use_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(ScreenerService, '_cache', {'data': None, 'timestamp': 0.0})
+    screen = {'data': [{'symbol': 'ABC'}], 'timestamp': time.time(), 'timeframe': '1D', 'sector_concentration': []}
+    SharedCacheService.set('screener:1D', screen)
+
+    def not_called(tf):
+        raise AssertionError('universe rescreened despite a fresh shared screen')
+
+    monkeypatch.setattr(ScreenerService, '_calculate_market_regime', staticmethod(not_called))
+    result = ScreenerService.get_screener_data('1D')
+    assert result['hits'] == [{'symbol': 'ABC'}] and result['source'] == 'cached'
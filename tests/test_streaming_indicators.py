@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.engine.atr import ATREngine
+from app.engine.insights import InsightEngine
+from app.engine.rsi import RSIEngine
+from app.engine.streaming import ADX, ATR, EMA, RollingMean, WilderRSI
+from app.engine.zones import ZoneEngine
+
+
+def _ohlc(n=160, seed=9):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({
+        'open': close, 'high': close + spread, 'low': close - spread * rng.uniform(0.5, 1.5, n), 'close': close,
+        'volume': rng.integers(1_000, 50_000, n).astype(float),
+    }, index=pd.bdate_range("2025-01-01", periods=n))
+
+
+def _stream(indicator, rows):
+    """Feeds rows one at a time, checking peek agrees with update, and returns the values."""
+    values = []
+    for row in rows:
+        peeked = indicator.peek(*row)
+        values.append(indicator.update(*row))
+        assert peeked == pytest.approx(values[-1], rel=1e-12, nan_ok=True)
+    return np.array(values)
+
+
+def test_rolling_mean_and_ema_match_pandas():
+    values = _ohlc()['close'].to_numpy().copy()
+    values[[30, 31, 90]] = np.nan
+    series = pd.Series(values)
+
+    rolling = _stream(RollingMean(20), [(v,) for v in values])
+    np.testing.assert_allclose(rolling, series.rolling(20).mean(), rtol=1e-12, equal_nan=True)
+
+    clean = _ohlc()['close']
+    ema = _stream(EMA(span=20), [(v,) for v in clean])
+    np.testing.assert_array_equal(ema, clean.ewm(span=20, adjust=False).mean())
+
+    seeded = RollingMean(50).seed(values[:120])
+    assert seeded.update(values[120]) == pytest.approx(series.rolling(50).mean().iloc[120], nan_ok=True)
+
+
+def test_wilder_rsi_matches_rsi_engine():
+    df = _ohlc()
+    expected = RSIEngine.calculate_rsi(df)
+    rsi = _stream(WilderRSI(14), [(c,) for c in df['close']])
+
+    np.testing.assert_array_equal(np.round(np.nan_to_num(rsi, nan=50.0), 2), expected)
+    assert np.isnan(rsi[:13]).all() and not np.isnan(rsi[13:]).any()
+
+
+def test_atr_variants_match_their_engines():
+    df = _ohlc()
+    rows = list(zip(df['high'], df['low'], df['close']))
+
+    wilder = _stream(ATR(14), rows)
+    np.testing.assert_array_equal(np.round(wilder, 2), ATREngine.calculate_atr(df))
+
+    simple = _stream(ATR(14, wilder=False), rows)
+    np.testing.assert_allclose(simple, ZoneEngine.calculate_atr(df), rtol=1e-12, equal_nan=True)
+
+    seeded = ATR(14).seed(df['high'][:100], df['low'][:100], df['close'][:100])
+    assert seeded.value == pytest.approx(wilder[99])
+
+
+def test_adx_matches_insight_engine():
+    df = _ohlc()
+    adx = ADX(14)
+    for i, row in enumerate(zip(df['high'], df['low'], df['close'])):
+        value = adx.update(*row)
+        if i + 1 >= 28:
+            assert value == pytest.approx(InsightEngine.get_adx(df.iloc[:i + 1]), rel=1e-9)
+        else:
+            assert np.isnan(value)
+
+
+def test_snapshot_and_restore_rewind_the_state():
+    df = _ohlc()
+    rows = list(zip(df['high'], df['low'], df['close']))
+    adx, rsi = ADX(14).seed(*zip(*rows[:60])), WilderRSI(14).seed(df['close'][:60])
+    adx_state, rsi_state = adx.snapshot(), rsi.snapshot()
+
+    first = [(adx.update(*row), rsi.update(row[2])) for row in rows[60:90]]
+    adx.restore(adx_state)
+    rsi.restore(rsi_state)
+    replay = [(adx.update(*row), rsi.update(row[2])) for row in rows[60:90]]
+
+    assert replay == first
+    adx.restore(adx_state)  # a snapshot stays reusable after restoring from it
+    assert adx.update(*rows[60]) == first[0][0]
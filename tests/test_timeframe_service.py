@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from app.services.timeframe_service import TimeframeService
+
+
+def _intraday_15m(days=3):
+    stamps = []
+    for day in pd.bdate_range('2025-01-06', periods=days):
+        stamps.extend(pd.date_range(day + pd.Timedelta(hours=9, minutes=15), periods=25, freq='15min'))
+    n = len(stamps)
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame(
+        {'open': close - 0.5, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.full(n, 10)},
+        index=pd.DatetimeIndex(stamps, name='timestamp'),
+    )
+
+
+def test_can_derive_pairs():
+    assert TimeframeService.can_derive('15m', '1H')
+    assert TimeframeService.can_derive('15m', '4H')
+    assert TimeframeService.can_derive('1D', '1W')
+    assert not TimeframeService.can_derive('15m', '1D')
+    assert not TimeframeService.can_derive('1H', '15m')
+    assert not TimeframeService.can_derive('1W', '1M')
+
+
+def test_hourly_bars_are_anchored_at_session_open():
+    TimeframeService.clear()
+    base = _intraday_15m()
+    hourly = TimeframeService.derive('ABC.NS', '15m', base, '1H')
+
+    first_day = hourly[hourly.index.normalize() == pd.Timestamp('2025-01-06')]
+    assert first_day.index[0] == pd.Timestamp('2025-01-06 09:15')
+    first = first_day.iloc[0]
+    assert first['open'] == base['open'].iloc[0]
+    assert first['close'] == base['close'].iloc[3]
+    assert first['high'] == base['high'].iloc[:4].max()
+    assert first['volume'] == 40
+
+
+def test_incremental_update_matches_full_resample():
+    TimeframeService.clear()
+    base = _intraday_15m(days=4)
+    TimeframeService.derive('ABC.NS', '15m', base.iloc[:-5], '2H')
+    incremental = TimeframeService.derive('ABC.NS', '15m', base, '2H')
+
+    TimeframeService.clear()
+    full = TimeframeService.derive('ABC.NS', '15m', base, '2H')
+    pd.testing.assert_frame_equal(incremental, full)
+
+
+def test_weekly_from_daily_drops_leading_partial_week():
+    TimeframeService.clear()
+    idx = pd.bdate_range('2025-01-08', periods=30)  # starts on a Wednesday
+    daily = pd.DataFrame(
+        {'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': np.arange(30, dtype=float), 'volume': 5},
+        index=idx,
+    )
+    weekly = TimeframeService.derive('ABC.NS', '1D', daily, '1W')
+
+    assert weekly.index[0] == pd.Timestamp('2025-01-13')
+    assert (weekly.index.dayofweek == 0).all()
+    assert weekly['volume'].iloc[0] == 25
+
+
+def _intraday_60m(days=5):
+    stamps = []
+    for day in pd.bdate_range('2025-01-06', periods=days):
+        stamps.extend(pd.date_range(day + pd.Timedelta(hours=9, minutes=15), periods=7, freq='60min'))
+    n = len(stamps)
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame(
+        {'open': close - 0.5, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.full(n, 10.0)},
+        index=pd.DatetimeIndex(stamps),
+    )
+
+
+def test_2h_and_4h_buckets_match_upstream_resampling():
+    from app.services.market_data import MarketDataService
+
+    base = _intraday_60m()
+    for tf in ('2H', '4H'):
+        TimeframeService.clear()
+        derived = TimeframeService.derive('ABC.NS', '1H', base, tf)
+        upstream = MarketDataService._normalize_yahoo_frame(base.copy(), tf, 200)
+        # Same midnight-anchored bucket edges; only the leading partial bucket is dropped locally
+        assert derived.index[0].hour == (10 if tf == '2H' else 12)
+        pd.testing.assert_frame_equal(derived, upstream.loc[derived.index[0]:], check_freq=False, check_names=False)
+
+
+def test_base_count_covers_derived_timeframes():
+    assert TimeframeService.base_count('1D', ['1W', '1M']) == TimeframeService.BASE_COUNT['1D']
+    assert TimeframeService.base_count('1W', ['1M']) == TimeframeService.DISPLAY_BARS
+
+    TimeframeService.clear()
+    base = _intraday_15m(days=TimeframeService.BASE_COUNT['15m'] // 25)
+    assert len(TimeframeService.derive('ABC.NS', '15m', base, '2H')) >= TimeframeService.MIN_DERIVED_BARS
+
+    idx = pd.bdate_range('2020-01-01', periods=TimeframeService.BASE_COUNT['1D'])
+    daily = pd.DataFrame({'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.0, 'volume': 5.0}, index=idx)
+    assert len(TimeframeService.derive('ABC.NS', '1D', daily, '1M')) >= TimeframeService.MIN_DERIVED_BARS
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from app.websocket.broadcaster import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, gate: asyncio.Event = None, fail: bool = False):
+        self.gate = gate
+        self.fail = fail
+        self.sent = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket gone")
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        self.closed = True
+
+
+def test_slow_client_is_coalesced_without_blocking_others():
+    async def scenario():
+        manager = ConnectionManager()
+        gate = asyncio.Event()
+        slow, fast = FakeWebSocket(gate), FakeWebSocket()
+        await manager.connect(slow, "ticks")
+        await manager.connect(fast, "ticks")
+
+        # First frame parks the slow writer; the rest pile up in its queue
+        await manager.broadcast("ticks", {"symbol": "A", "n": 0}, symbol="A")
+        await asyncio.sleep(0)
+        for n in range(1, 50):
+            await asyncio.wait_for(manager.broadcast("ticks", {"symbol": "AB"[n % 2], "n": n}, symbol="AB"[n % 2]), 0.1)
+        await asyncio.sleep(0.01)
+        assert len(fast.sent) == 50
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        # Backlog collapsed to the newest tick per symbol
+        assert [m["n"] for m in slow.sent] == [0, 49, 48]
+
+    asyncio.run(scenario())
+
+
+def test_symbol_subscriptions_filter_ticks():
+    async def scenario():
+        manager = ConnectionManager()
+        ws_all, ws_tcs = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(ws_all, "ticks")
+        client = await manager.connect(ws_tcs, "ticks", symbols=["NSE:TCS-EQ"])
+
+        assert await manager.broadcast("ticks", {"symbol": "TCS"}, symbol="TCS") == 2
+        assert await manager.broadcast("ticks", {"symbol": "INFY"}, symbol="INFY") == 1
+        await asyncio.sleep(0.01)
+        client.handle_message(json.dumps({"action": "set", "symbols": ["infy"]}))
+        assert await manager.broadcast("ticks", {"symbol": "TCS"}, symbol="TCS.NS") == 1
+        await manager.broadcast("alerts", {"symbol": "TCS"})
+        await asyncio.sleep(0.01)
+
+        assert [m["symbol"] for m in ws_all.sent] == ["TCS", "INFY", "TCS"]
+        assert [m["symbol"] for m in ws_tcs.sent] == ["TCS"]
+
+    asyncio.run(scenario())
+
+
+def test_failed_send_drops_the_client():
+    async def scenario():
+        manager = ConnectionManager()
+        broken = FakeWebSocket(fail=True)
+        await manager.connect(broken, "alerts")
+        await manager.broadcast("alerts", {"message": "x"})
+        await asyncio.sleep(0.01)
+        assert manager.active_connections["alerts"] == []
+        assert broken.closed
+
+    asyncio.run(scenario())